@@ -0,0 +1,278 @@
+"""
+Benchmarks tempo_core against a generated project, using stub packing tools.
+
+Runs on linux without a real engine, game or tool downloads. Example:
+
+    uv run python benchmarks/run_benchmarks.py --file-count 100000 --output bench.json
+    uv run python benchmarks/run_benchmarks.py --file-count 100000 --compare bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timezone
+from collections.abc import Callable
+
+from synthetic_project import SIZE_DISTRIBUTIONS, SyntheticProject, generate_synthetic_project
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def get_git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def init_tempo_core(project: SyntheticProject) -> None:
+    os.environ["TEMPO_UNREAL_ENGINE_DIRECTORY"] = os.fspath(project.engine_dir)
+    os.environ["TEMPO_REPAK_EXECUTABLE"] = os.fspath(project.stub_bin_dir / "repak")
+    os.environ["TEMPO_RETOC_EXECUTABLE"] = os.fspath(project.stub_bin_dir / "retoc")
+    os.environ.setdefault("TEMPO_FORCE_OFFLINE", "1")
+    # staged files go in the work dir, which is removed afterwards, instead of the package source tree
+    os.environ["TEMPO_TEMP_DIRECTORY"] = os.fspath(project.root_dir / "temp")
+    sys.argv.extend(
+        [
+            "--config-file",
+            os.fspath(project.settings_file),
+            "--logs-directory",
+            os.fspath(project.root_dir / "logs"),
+            "--disable-progress-bars",
+            "--disable-timing-report",
+        ],
+    )
+
+    from tempo_core import initialization
+
+    initialization.initialization()
+
+
+def get_mod_name_for_packing_type(project: SyntheticProject, packing_type: str) -> str | None:
+    for mod_name, mod_packing_type in project.mod_names_to_packing_types.items():
+        if mod_packing_type == packing_type:
+            return mod_name
+    return None
+
+
+def get_benchmarks(project: SyntheticProject, *, is_iostore: bool) -> list[tuple[str, Callable[[], object]]]:
+    from tempo_core import main_logic, packing
+    from tempo_core.data_structures import PackingType, get_enum_from_val
+    from tempo_core.programs import unreal_engine, unreal_pak
+
+    release_dir = Path(project.root_dir / "release")
+    base_files_dir = Path(release_dir / "base_files")
+    output_dir = Path(release_dir / "output")
+
+    loose_mod = get_mod_name_for_packing_type(project, "loose")
+    repak_mod = get_mod_name_for_packing_type(project, "repak")
+    unreal_pak_mod = get_mod_name_for_packing_type(project, "unreal_pak")
+
+    benchmarks: list[tuple[str, Callable[[], object]]] = [
+        (
+            "iostore_detection",
+            lambda: unreal_engine.get_is_game_iostore(project.uproject_file, project.game_dir),
+        ),
+        ("cook_command_chunking", packing.get_cook_project_commands),
+    ]
+    if loose_mod:
+        benchmarks.append(
+            ("manifest_loose", lambda: packing.get_mod_paths_for_loose_mods(loose_mod)),
+        )
+    if repak_mod:
+        benchmarks.append(
+            ("manifest_pak", lambda: packing.get_mod_file_paths_for_manually_made_pak_mods(repak_mod)),
+        )
+    if unreal_pak_mod:
+        benchmarks.append(("staging", lambda: unreal_pak.move_files_for_packing(unreal_pak_mod)))
+
+    installed_mods = []
+    for mod_name, packing_type_str in project.mod_names_to_packing_types.items():
+        # the ue4 iostore unreal_pak path drives the editor commandlet, which the stubs do not emulate
+        if is_iostore and packing_type_str == "unreal_pak":
+            continue
+        packing_type = get_enum_from_val(PackingType, packing_type_str)
+        installed_mods.append((mod_name, packing_type))
+        benchmarks.append(
+            (
+                f"install_{packing_type_str}",
+                lambda mod_name=mod_name, packing_type=packing_type: packing.install_mod(
+                    packing_type=packing_type,
+                    mod_name=mod_name,
+                    compression_type=None,
+                    use_symlinks=False,
+                ),
+            ),
+        )
+
+    if repak_mod:
+        benchmarks.append(
+            (
+                "release_zip",
+                lambda: main_logic.generate_mod_release(repak_mod, base_files_dir, output_dir),
+            ),
+        )
+
+    for mod_name, packing_type in installed_mods:
+        benchmarks.append(
+            (
+                f"uninstall_{packing_type.value}",
+                lambda mod_name=mod_name, packing_type=packing_type: packing.uninstall_mod(packing_type, mod_name),
+            ),
+        )
+    return benchmarks
+
+
+def run_benchmarks(
+    project: SyntheticProject, repeat: int, *, is_iostore: bool,
+) -> list[dict]:
+    from tempo_core import timer
+
+    benchmarks = get_benchmarks(project, is_iostore=is_iostore)
+    samples: dict[str, list[float]] = {name: [] for name, _ in benchmarks}
+    byte_counts: dict[str, int] = {name: 0 for name, _ in benchmarks}
+    for _ in range(repeat):
+        # install and uninstall depend on each other, so every repeat runs the whole sequence in order
+        for name, benchmark in benchmarks:
+            with timer.span(name, category="benchmark") as benchmark_span:
+                start = time.perf_counter()
+                benchmark()
+                samples[name].append(time.perf_counter() - start)
+            byte_counts[name] = max(byte_counts[name], get_span_tree_bytes(benchmark_span))
+
+    return [
+        {
+            "name": name,
+            "seconds": seconds,
+            "median_seconds": statistics.median(seconds),
+            "min_seconds": min(seconds),
+            "bytes_processed": byte_counts[name],
+        }
+        for name, seconds in samples.items()
+    ]
+
+
+def get_span_tree_bytes(parent_span: object) -> int:
+    from tempo_core import timer
+
+    # bytes are attributed to the innermost span, so sum everything nested inside the benchmark span
+    total = 0
+    for finished_span in timer.get_finished_spans():
+        if (
+            finished_span.thread_id == parent_span.thread_id  # ty: ignore
+            and finished_span.start_ns >= parent_span.start_ns  # ty: ignore
+            and finished_span.end_ns is not None
+            and parent_span.end_ns is not None  # ty: ignore
+            and finished_span.end_ns <= parent_span.end_ns  # ty: ignore
+        ):
+            total += finished_span.bytes_processed
+    return total
+
+
+def write_comparison(results: dict, baseline: dict) -> None:
+    baseline_results = {entry["name"]: entry for entry in baseline.get("results", [])}
+    sys.stdout.write(f"{'Benchmark':<28}{'Baseline (s)':>14}{'Current (s)':>14}{'Change':>10}\n")
+    for entry in results["results"]:
+        baseline_entry = baseline_results.get(entry["name"])
+        if not baseline_entry:
+            sys.stdout.write(f"{entry['name']:<28}{'-':>14}{entry['median_seconds']:>14.4f}{'new':>10}\n")
+            continue
+        change = (entry["median_seconds"] / baseline_entry["median_seconds"] - 1) * 100 if baseline_entry["median_seconds"] else 0.0
+        sys.stdout.write(
+            f"{entry['name']:<28}{baseline_entry['median_seconds']:>14.4f}"
+            f"{entry['median_seconds']:>14.4f}{change:>+9.1f}%\n",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file-count", type=int, default=10_000, help="cooked files to generate")
+    parser.add_argument("--mod-count", type=int, default=4)
+    parser.add_argument("--size-distribution", choices=sorted(SIZE_DISTRIBUTIONS), default="mixed")
+    parser.add_argument("--size-scale", type=float, default=1.0, help="multiplier applied to generated file sizes")
+    parser.add_argument("--paks-file-count", type=int, default=300, help="archives in the fake game Paks dir")
+    parser.add_argument("--iostore", action="store_true", help="make the fake game an iostore game")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", type=Path, default=Path(REPO_DIR / "benchmarks" / "work"))
+    parser.add_argument("--keep-work-dir", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="where to write the results json")
+    parser.add_argument("--compare", type=Path, default=None, help="results json to compare against")
+    args = parser.parse_args()
+    # tempo_core reads its own flags from sys.argv
+    sys.argv = sys.argv[:1]
+
+    if args.work_dir.exists():
+        shutil.rmtree(args.work_dir)
+    generation_start = time.perf_counter()
+    project = generate_synthetic_project(
+        args.work_dir,
+        file_count=args.file_count,
+        mod_count=args.mod_count,
+        distribution=args.size_distribution,
+        size_scale=args.size_scale,
+        paks_file_count=args.paks_file_count,
+        is_iostore=args.iostore,
+        seed=args.seed,
+    )
+    generation_seconds = time.perf_counter() - generation_start
+
+    try:
+        init_tempo_core(project)
+        benchmark_results = run_benchmarks(project, args.repeat, is_iostore=args.iostore)
+    finally:
+        if not args.keep_work_dir:
+            shutil.rmtree(args.work_dir, ignore_errors=True)
+
+    results = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": get_git_revision(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": {
+            "file_count": args.file_count,
+            "mod_count": args.mod_count,
+            "size_distribution": args.size_distribution,
+            "size_scale": args.size_scale,
+            "paks_file_count": args.paks_file_count,
+            "iostore": args.iostore,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "project": {
+            "cooked_file_count": project.cooked_file_count,
+            "cooked_byte_count": project.cooked_byte_count,
+            "generation_seconds": generation_seconds,
+        },
+        "results": benchmark_results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    else:
+        sys.stdout.write(f"{json.dumps(results, indent=2)}\n")
+
+    if args.compare:
+        write_comparison(results, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
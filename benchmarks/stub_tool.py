@@ -0,0 +1,70 @@
+"""
+Stand-in for repak, UnrealPak, retoc and the editor commandlet used by the benchmark suite.
+
+It writes small placeholder archives at the paths the real tools would,
+so packing code paths can be timed without the real binaries.
+"""
+
+import sys
+from pathlib import Path
+
+
+def count_files(directory: Path) -> int:
+    return sum(len(files) for _, _, files in directory.walk())
+
+
+def write_placeholder(output_path: Path, description: str) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(f"tempo benchmark placeholder\n{description}\n", encoding="utf-8")
+
+
+def run_repak(args: list[str]) -> None:
+    # repak pack <input_dir> <output_pak> [--compression X] [--version V]
+    input_dir = Path(args[1])
+    output_pak = Path(args[2])
+    write_placeholder(output_pak, f"repak files={count_files(input_dir)}")
+
+
+def run_unreal_pak(args: list[str]) -> None:
+    # UnrealPak <output_pak> -Create=<response_file> [-compress ...]
+    output_pak = Path(args[0])
+    response_file = next(
+        (Path(arg.split("=", 1)[1]) for arg in args if arg.startswith("-Create=")),
+        None,
+    )
+    entry_count = 0
+    if response_file and response_file.is_file():
+        with response_file.open(encoding="utf-8") as file:
+            entry_count = sum(1 for _ in file)
+    write_placeholder(output_pak, f"unreal_pak entries={entry_count}")
+
+
+def run_retoc(args: list[str]) -> None:
+    # retoc to-zen <input_dir> <output_utoc> --version V
+    input_dir = Path(args[1])
+    output_utoc = Path(args[2])
+    description = f"retoc files={count_files(input_dir)}"
+    for suffix in (".utoc", ".ucas", ".pak"):
+        write_placeholder(output_utoc.with_suffix(suffix), description)
+
+
+def run_editor_cmd(args: list[str]) -> None:
+    # cook and iostore commandlets are not emulated, the benchmark only builds their command lines
+    _ = args
+
+
+STUB_TOOLS = {
+    "repak": run_repak,
+    "unreal_pak": run_unreal_pak,
+    "retoc": run_retoc,
+    "editor_cmd": run_editor_cmd,
+}
+
+
+def main() -> None:
+    tool_name = sys.argv[1]
+    STUB_TOOLS[tool_name](sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Generates a synthetic uproject, cooked tree, fake game install and stub engine for benchmarking.
+
+Files are created sparse (truncated to size) so large trees are cheap to generate,
+while still having the sizes the staging and zipping code will read.
+"""
+
+import os
+import sys
+import json
+import random
+import stat
+from pathlib import Path
+from dataclasses import dataclass
+
+KIB = 1024
+MIB = 1024 * KIB
+
+# (weight, minimum bytes, maximum bytes) for the .uexp of each asset
+SIZE_DISTRIBUTIONS = {
+    "small": [(1.0, 1 * KIB, 16 * KIB)],
+    "mixed": [(0.80, 1 * KIB, 64 * KIB), (0.18, 64 * KIB, 2 * MIB), (0.02, 2 * MIB, 32 * MIB)],
+    "large": [(0.50, 64 * KIB, 2 * MIB), (0.50, 2 * MIB, 64 * MIB)],
+}
+
+# chance an asset also has bulk data next to it
+UBULK_CHANCE = 0.1
+
+PACKING_TYPES = ["loose", "repak", "unreal_pak", "retoc"]
+
+PROJECT_NAME = "TempoBenchmark"
+
+STUB_TOOL_SCRIPT = Path(Path(__file__).parent / "stub_tool.py")
+
+
+@dataclass
+class SyntheticProject:
+    root_dir: Path
+    settings_file: Path
+    uproject_file: Path
+    cooked_dir: Path
+    game_dir: Path
+    game_paks_dir: Path
+    engine_dir: Path
+    stub_bin_dir: Path
+    mod_names_to_packing_types: dict[str, str]
+    cooked_file_count: int
+    cooked_byte_count: int
+
+
+def pick_file_size(rng: random.Random, distribution: str, size_scale: float) -> int:
+    buckets = SIZE_DISTRIBUTIONS[distribution]
+    roll = rng.random()
+    # rounding can leave roll just past the last weight, the last bucket takes that
+    bucket = buckets[-1]
+    for candidate in buckets:
+        if roll < candidate[0]:
+            bucket = candidate
+            break
+        roll -= candidate[0]
+    _, minimum, maximum = bucket
+    return max(1, int(rng.randint(minimum, maximum) * size_scale))
+
+
+def make_sparse_file(path: Path, size: int) -> None:
+    with path.open("wb") as file:
+        file.truncate(size)
+
+
+def make_stub_executable(path: Path, tool_name: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" "{STUB_TOOL_SCRIPT}" {tool_name} "$@"\n',
+        encoding="utf-8",
+    )
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def generate_stub_engine(engine_dir: Path) -> None:
+    build_version_file = Path(engine_dir / "Engine/Build/Build.version")
+    build_version_file.parent.mkdir(parents=True, exist_ok=True)
+    build_version_file.write_text(
+        json.dumps({"MajorVersion": 4, "MinorVersion": 27, "PatchVersion": 2}),
+        encoding="utf-8",
+    )
+    binaries_dir = Path(engine_dir / "Engine/Binaries/Linux")
+    make_stub_executable(Path(binaries_dir / "UnrealPak"), "unreal_pak")
+    make_stub_executable(Path(binaries_dir / "UE4Editor-Cmd"), "editor_cmd")
+
+
+def generate_fake_game(game_dir: Path, paks_file_count: int, *, is_iostore: bool) -> Path:
+    exe_path = Path(game_dir / "Binaries" / "Linux" / f"{PROJECT_NAME}-Linux-Shipping")
+    exe_path.parent.mkdir(parents=True, exist_ok=True)
+    make_sparse_file(exe_path, 1 * MIB)
+    paks_dir = Path(game_dir / "Content" / "Paks")
+    paks_dir.mkdir(parents=True, exist_ok=True)
+    extensions = [".pak", ".utoc", ".ucas"] if is_iostore else [".pak", ".sig"]
+    for chunk_index in range(paks_file_count // len(extensions)):
+        for extension in extensions:
+            make_sparse_file(Path(paks_dir / f"pakchunk{chunk_index}-LinuxNoEditor{extension}"), 64 * KIB)
+    Path(paks_dir / "LogicMods").mkdir(exist_ok=True)
+    return exe_path
+
+
+def generate_synthetic_project(
+    root_dir: Path,
+    *,
+    file_count: int,
+    mod_count: int = 4,
+    distribution: str = "mixed",
+    size_scale: float = 1.0,
+    paks_file_count: int = 300,
+    is_iostore: bool = False,
+    seed: int = 0,
+) -> SyntheticProject:
+    """
+    Lays out a project with roughly file_count cooked files spread over mod_count mods.
+    Mods cycle through the loose, repak, unreal_pak and retoc packing types.
+    """
+    rng = random.Random(seed)
+    uproject_dir = Path(root_dir / "unreal_project")
+    uproject_file = Path(uproject_dir / f"{PROJECT_NAME}.uproject")
+    cooked_dir = Path(uproject_dir / "Saved" / "Cooked" / "LinuxNoEditor" / PROJECT_NAME)
+    game_dir = Path(root_dir / "packaged_game" / PROJECT_NAME)
+    engine_dir = Path(root_dir / "engine")
+    stub_bin_dir = Path(root_dir / "bin")
+
+    uproject_dir.mkdir(parents=True, exist_ok=True)
+    uproject_file.write_text(
+        json.dumps({"FileVersion": 3, "EngineAssociation": "4.27", "Category": "Modding"}),
+        encoding="utf-8",
+    )
+    generate_stub_engine(engine_dir)
+    make_stub_executable(Path(stub_bin_dir / "repak"), "repak")
+    make_stub_executable(Path(stub_bin_dir / "retoc"), "retoc")
+    game_exe_path = generate_fake_game(game_dir, paks_file_count, is_iostore=is_iostore)
+
+    mod_names_to_packing_types = {
+        f"BenchmarkMod{mod_index}": PACKING_TYPES[mod_index % len(PACKING_TYPES)]
+        for mod_index in range(mod_count)
+    }
+    mod_names = list(mod_names_to_packing_types)
+
+    cooked_file_count = 0
+    cooked_byte_count = 0
+    asset_index = 0
+    while cooked_file_count < file_count:
+        mod_name = mod_names[asset_index % len(mod_names)]
+        # nest assets a few levels deep so tree walks see realistic directory fan out
+        relative_dir = Path("Mods", mod_name, f"Group{asset_index % 97}", f"Set{asset_index % 13}")
+        asset_name = f"Asset{asset_index}"
+
+        source_dir = Path(uproject_dir / "Content" / relative_dir)
+        source_dir.mkdir(parents=True, exist_ok=True)
+        make_sparse_file(Path(source_dir / f"{asset_name}.uasset"), 4 * KIB)
+
+        target_dir = Path(cooked_dir / "Content" / relative_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        sizes = {
+            ".uasset": rng.randint(1 * KIB, 8 * KIB),
+            ".uexp": pick_file_size(rng, distribution, size_scale),
+        }
+        if rng.random() < UBULK_CHANCE:
+            sizes[".ubulk"] = pick_file_size(rng, distribution, size_scale)
+        for extension, size in sizes.items():
+            make_sparse_file(Path(target_dir / f"{asset_name}{extension}"), size)
+            cooked_file_count += 1
+            cooked_byte_count += size
+        asset_index += 1
+
+    mods_info = {}
+    for mod_name, packing_type in mod_names_to_packing_types.items():
+        mods_info[mod_name] = {
+            "is_enabled": True,
+            "mod_name_dir_type": "Mods",
+            "packing_type": packing_type,
+            "pak_dir_structure": "LogicMods",
+            "compression_type": "Zlib",
+        }
+
+    settings_file = Path(root_dir / f"{PROJECT_NAME.lower()}_tempo.json")
+    settings_file.write_text(
+        json.dumps(
+            {
+                "engine_info": {
+                    "unreal_project_file": os.fspath(uproject_file),
+                    "unreal_engine_major_version": 4,
+                    "unreal_engine_minor_version": 27,
+                },
+                "game_info": {
+                    "game_exe_path": os.fspath(game_exe_path),
+                    "launch_type": "exe",
+                },
+                "process_kill_events": {
+                    "processes": [],
+                    "auto_close_game": False,
+                },
+                "mods_info": mods_info,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+    return SyntheticProject(
+        root_dir=root_dir,
+        settings_file=settings_file,
+        uproject_file=uproject_file,
+        cooked_dir=cooked_dir,
+        game_dir=game_dir,
+        game_paks_dir=Path(game_dir / "Content" / "Paks"),
+        engine_dir=engine_dir,
+        stub_bin_dir=stub_bin_dir,
+        mod_names_to_packing_types=mod_names_to_packing_types,
+        cooked_file_count=cooked_file_count,
+        cooked_byte_count=cooked_byte_count,
+    )
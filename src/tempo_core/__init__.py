@@ -0,0 +1,4 @@
+def main() -> int:
+    from tempo_core import daemon
+
+    return daemon.main()
@@ -1,23 +1,23 @@
 from __future__ import annotations
 
-import os
 import subprocess
 from pathlib import Path
 from _collections_abc import Sequence
 
-from tempo_core import file_io, logger
+from tempo_core import file_io, logger, process_accounting
 from tempo_core.data_structures import ExecutionMode
 import tempo_core.settings
 
-default_working_dir = tempo_core.settings.get_temp_directory()
 
 def run_app(
     exe_path: Path,
     exec_mode: ExecutionMode = ExecutionMode.SYNC,
     args: Sequence[str | Path] | None = None,
-    working_dir: Path = default_working_dir,
+    working_dir: Path | None = None,
     use_shell: bool = True,
 ) -> None:
+    if working_dir is None:
+        working_dir = tempo_core.settings.get_temp_directory()
     working_dir.mkdir(parents=True, exist_ok=True)
 
     if not args:
@@ -36,25 +36,13 @@ def run_app(
         logger.log_message("----------------------------------------------------")
         logger.log_message(f"Command: {command} running with the {exec_mode} enum")
 
-        if working_dir and working_dir.is_dir():
-            os.chdir(working_dir)
-
-        process = subprocess.Popen(
+        process_accounting.run_accounted_process(
             command,
+            Path(exe_path).name,
             cwd=working_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
             shell=use_shell,
+            on_output_line=lambda line: logger.log_message(line.strip()),
         )
-
-        if process.stdout:
-            for line in iter(process.stdout.readline, ""):
-                logger.log_message(line.strip())
-
-            process.stdout.close()
-
-        process.wait()
         logger.log_message(f"Command: {command} finished")
 
     elif exec_mode == ExecutionMode.ASYNC:
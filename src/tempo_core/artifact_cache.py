@@ -0,0 +1,277 @@
+"""
+A persistent cache of packed mod artifacts that outlives the temp dir, so rebuilding an unchanged mod
+copies its paks out of the cache instead of staging and packing them again.
+
+Entries are addressed by a key over the packing parameters and the content of every staged input.
+Input digests are remembered by path, size and mtime, so a warm lookup only hashes files that changed.
+Each use bumps the entry's mtime, which is what least recently used eviction goes by once the cache
+is over its quota. Every operation holds a lock file, so separate runs and the daemon can share it.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from tempo_core import file_locks, hashing, logger, timer
+
+DEFAULT_QUOTA_MB = 10 * 1024
+ENTRY_METADATA_FILE_NAME = "entry.json"
+DIGEST_MEMO_FILE_NAME = "digests.json"
+
+
+@dataclass
+class ArtifactCacheEntry:
+    key: str
+    path: Path
+    size: int
+    last_used: float
+    files: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ArtifactCacheStats:
+    cache_dir: Path
+    entry_count: int
+    total_size: int
+    quota: int
+
+
+def get_artifact_cache_dir() -> Path:
+    from tempo_core import settings
+
+    return Path(settings.get_cache_directory() / "artifacts")
+
+
+def get_artifact_cache_quota() -> int:
+    """The cache size limit in bytes, from TEMPO_ARTIFACT_CACHE_QUOTA_MB when set."""
+    env_value = os.environ.get("TEMPO_ARTIFACT_CACHE_QUOTA_MB")
+    if env_value:
+        try:
+            return int(float(env_value) * 1024 * 1024)
+        except ValueError:
+            logger.log_message(f'Warning: ignoring invalid TEMPO_ARTIFACT_CACHE_QUOTA_MB "{env_value}"')
+    return DEFAULT_QUOTA_MB * 1024 * 1024
+
+
+def get_lock_path(cache_dir: Path) -> Path:
+    return Path(cache_dir / "cache.lock")
+
+
+def get_entries_dir(cache_dir: Path) -> Path:
+    return Path(cache_dir / "entries")
+
+
+def get_staging_dir(cache_dir: Path) -> Path:
+    return Path(cache_dir / "staging")
+
+
+def get_entry_dir(cache_dir: Path, key: str) -> Path:
+    return Path(get_entries_dir(cache_dir) / key[:2] / key)
+
+
+def read_digest_memo(cache_dir: Path) -> dict[str, list]:
+    try:
+        with Path(cache_dir / DIGEST_MEMO_FILE_NAME).open(encoding="utf-8") as file:
+            digest_memo = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return digest_memo if isinstance(digest_memo, dict) else {}
+
+
+def write_digest_memo(cache_dir: Path, digest_memo: dict[str, list]) -> None:
+    memo_path = Path(cache_dir / DIGEST_MEMO_FILE_NAME)
+    temp_path = memo_path.with_name(f".{memo_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with temp_path.open("w", encoding="utf-8") as file:
+        json.dump(digest_memo, file, separators=(",", ":"))
+    temp_path.replace(memo_path)
+
+
+@timer.timed("artifact_cache")
+def get_input_digests(
+    input_files: list[Path],
+    *,
+    cache_dir: Path | None = None,
+    max_workers: int = hashing.DEFAULT_MAX_WORKERS,
+) -> dict[Path, str]:
+    """
+    Content digests of the input files. Digests are remembered by path, size and mtime,
+    so only files that changed since the last call are read again.
+    """
+    cache_dir = cache_dir or get_artifact_cache_dir()
+    with file_locks.file_lock(get_lock_path(cache_dir)):
+        digest_memo = read_digest_memo(cache_dir)
+
+    digests: dict[Path, str] = {}
+    stale_files: list[tuple[Path, int, int]] = []
+    for input_file in input_files:
+        stat_result = input_file.stat()
+        memo_entry = digest_memo.get(os.fspath(input_file))
+        if memo_entry and memo_entry[0] == stat_result.st_size and memo_entry[1] == stat_result.st_mtime_ns:
+            digests[input_file] = memo_entry[2]
+        else:
+            stale_files.append((input_file, stat_result.st_size, stat_result.st_mtime_ns))
+    if not stale_files:
+        return digests
+
+    # the memo outlives this run, so it is always filled with the default algorithm
+    stale_digests = hashing.hash_files(
+        [stale_file[0] for stale_file in stale_files], hashing.DEFAULT_ALGORITHM, max_workers=max_workers,
+    )
+    with file_locks.file_lock(get_lock_path(cache_dir)):
+        # another run may have added digests of its own in the meantime
+        digest_memo = read_digest_memo(cache_dir)
+        for input_file, size, mtime_ns in stale_files:
+            digest = stale_digests[input_file]
+            digests[input_file] = digest
+            digest_memo[os.fspath(input_file)] = [size, mtime_ns, digest]
+        write_digest_memo(cache_dir, digest_memo)
+    return digests
+
+
+def get_artifact_key(
+    parameters: dict,
+    input_files: dict[str, Path],
+    *,
+    cache_dir: Path | None = None,
+) -> str:
+    """
+    Key for the artifacts built from input_files, a mapping of staged relative path to source file,
+    with the given parameters. Anything that changes the build output has to be in parameters.
+    """
+    digests = get_input_digests(list(input_files.values()), cache_dir=cache_dir)
+    key_digest = hashing.new_hasher(hashing.DEFAULT_ALGORITHM)
+    key_digest.update(json.dumps(parameters, sort_keys=True, default=str).encode("utf-8"))
+    for relative_path in sorted(input_files):
+        key_digest.update(f"\0{relative_path}\0{digests[input_files[relative_path]]}".encode())
+    return key_digest.hexdigest()
+
+
+def read_entry(entry_dir: Path) -> ArtifactCacheEntry | None:
+    metadata_path = Path(entry_dir / ENTRY_METADATA_FILE_NAME)
+    try:
+        last_used = metadata_path.stat().st_mtime
+        with metadata_path.open(encoding="utf-8") as file:
+            metadata = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return ArtifactCacheEntry(
+        key=entry_dir.name, path=entry_dir, size=metadata["size"], last_used=last_used, files=metadata["files"],
+    )
+
+
+def iter_entries(cache_dir: Path) -> list[ArtifactCacheEntry]:
+    entries = []
+    for entry_dir in get_entries_dir(cache_dir).glob("*/*"):
+        entry = read_entry(entry_dir)
+        if entry is None:
+            # an unreadable entry is as good as missing, drop it so it stops taking up space
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            continue
+        entries.append(entry)
+    return entries
+
+
+def touch_entry(entry: ArtifactCacheEntry) -> None:
+    os.utime(entry.path / ENTRY_METADATA_FILE_NAME)
+
+
+@timer.timed("artifact_cache")
+def install_artifacts(
+    key: str,
+    dest_dir: Path,
+    *,
+    cache_dir: Path | None = None,
+) -> list[Path] | None:
+    """Copies the cached artifacts for key into dest_dir and returns their paths, or returns None on a cache miss."""
+    cache_dir = cache_dir or get_artifact_cache_dir()
+    with file_locks.file_lock(get_lock_path(cache_dir)):
+        entry = read_entry(get_entry_dir(cache_dir, key))
+        if entry is None:
+            return None
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        installed_files = []
+        for file_name in entry.files:
+            cached_file = Path(entry.path / file_name)
+            dest_file = Path(dest_dir / file_name)
+            if dest_file.is_file() or dest_file.is_symlink():
+                dest_file.unlink()
+            # always copied, a packer writing over a hard link would corrupt the cache,
+            # and a symlink would dangle once eviction, in this run or another, removes the entry
+            shutil.copyfile(cached_file, dest_file)
+            timer.add_bytes_processed(cached_file.stat().st_size)
+            installed_files.append(dest_file)
+        touch_entry(entry)
+    return installed_files
+
+
+@timer.timed("artifact_cache")
+def store_artifacts(
+    key: str,
+    artifact_files: list[Path],
+    *,
+    cache_dir: Path | None = None,
+    quota: int | None = None,
+) -> None:
+    """Copies the artifacts into the cache under key, then evicts old entries until the cache fits its quota."""
+    cache_dir = cache_dir or get_artifact_cache_dir()
+    entry_dir = get_entry_dir(cache_dir, key)
+    # copy outside the lock so other runs are not held up, the rename into place is what publishes the entry
+    staging_dir = Path(get_staging_dir(cache_dir) / uuid.uuid4().hex)
+    staging_dir.mkdir(parents=True)
+    try:
+        total_size = 0
+        for artifact_file in artifact_files:
+            shutil.copyfile(artifact_file, staging_dir / artifact_file.name)
+            total_size += artifact_file.stat().st_size
+        metadata = {"size": total_size, "files": [artifact_file.name for artifact_file in artifact_files]}
+        with Path(staging_dir / ENTRY_METADATA_FILE_NAME).open("w", encoding="utf-8") as file:
+            json.dump(metadata, file)
+        with file_locks.file_lock(get_lock_path(cache_dir)):
+            if read_entry(entry_dir) is None:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                entry_dir.parent.mkdir(parents=True, exist_ok=True)
+                staging_dir.rename(entry_dir)
+            prune_unlocked(cache_dir, get_artifact_cache_quota() if quota is None else quota, keep_key=key)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def prune_unlocked(cache_dir: Path, max_bytes: int, *, keep_key: str | None = None) -> int:
+    entries = sorted(iter_entries(cache_dir), key=lambda entry: entry.last_used)
+    # the entry just stored is about to be used, it goes last even when its mtime ties with older ones
+    entries.sort(key=lambda entry: entry.key == keep_key)
+    total_size = sum(entry.size for entry in entries)
+    freed_size = 0
+    for entry in entries:
+        if total_size - freed_size <= max_bytes:
+            break
+        shutil.rmtree(entry.path, ignore_errors=True)
+        freed_size += entry.size
+    return freed_size
+
+
+def prune_cache(max_bytes: int | None = None, *, cache_dir: Path | None = None) -> int:
+    """Evicts the least recently used entries until the cache is within max_bytes, the quota when None."""
+    cache_dir = cache_dir or get_artifact_cache_dir()
+    with file_locks.file_lock(get_lock_path(cache_dir)):
+        # staging dirs only outlive their run when it was killed mid copy
+        for staging_dir in get_staging_dir(cache_dir).glob("*"):
+            if time.time() - staging_dir.stat().st_mtime > 24 * 60 * 60:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        return prune_unlocked(cache_dir, get_artifact_cache_quota() if max_bytes is None else max_bytes)
+
+
+def get_cache_stats(*, cache_dir: Path | None = None) -> ArtifactCacheStats:
+    cache_dir = cache_dir or get_artifact_cache_dir()
+    with file_locks.file_lock(get_lock_path(cache_dir)):
+        entries = iter_entries(cache_dir)
+    return ArtifactCacheStats(
+        cache_dir=cache_dir,
+        entry_count=len(entries),
+        total_size=sum(entry.size for entry in entries),
+        quota=get_artifact_cache_quota(),
+    )
@@ -0,0 +1,243 @@
+"""
+Finds directories to clean under a tree and removes them without making the caller wait.
+
+Matching directories are not descended into, so the walk never visits what it is about to remove.
+Each target is renamed to a hidden trash name next to it, which is instant on the same volume,
+and the trash is then deleted in parallel on a background thread that reports its progress.
+Purging the temp dir at startup hands its trash to a detached process instead, so a short run never
+waits on it. Trash left behind by an interrupted run is picked up by the next walk.
+"""
+
+import os
+import sys
+import uuid
+import shutil
+import threading
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+from tempo_core import logger, timer
+
+TRASH_MARKER = ".tempo_trash."
+
+# deletes wait on the disk, not the interpreter, so more threads than cores pays off
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@dataclass
+class CleanupInformation:
+    background_threads: list[threading.Thread] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+cleanup_information = CleanupInformation()
+
+
+@dataclass
+class CleanupTargets:
+    targets: list[Path] = field(default_factory=list)
+    # trash from earlier runs that never finished deleting
+    leftover_trash: list[Path] = field(default_factory=list)
+
+
+def is_trash_dir_name(dir_name: str) -> bool:
+    return dir_name.startswith(TRASH_MARKER)
+
+
+@timer.timed("cleanup")
+def find_cleanup_targets(root: Path, dir_names: set[str]) -> CleanupTargets:
+    """Walks root for directories named in dir_names, without descending into any match."""
+    found = CleanupTargets()
+    pending_dirs = [os.fspath(root)]
+    while pending_dirs:
+        directory = pending_dirs.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if is_trash_dir_name(entry.name):
+                        found.leftover_trash.append(Path(entry.path))
+                    elif entry.name in dir_names:
+                        found.targets.append(Path(entry.path))
+                    else:
+                        pending_dirs.append(entry.path)
+        except OSError:
+            continue
+    found.targets.sort()
+    found.leftover_trash.sort()
+    return found
+
+
+def get_tree_size(root: Path) -> int:
+    total_size = 0
+    pending_dirs = [os.fspath(root)]
+    while pending_dirs:
+        directory = pending_dirs.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        else:
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total_size
+
+
+def get_trees_size(roots: list[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> int:
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cleanup_size") as executor:
+        return sum(executor.map(get_tree_size, roots))
+
+
+def move_to_trash(target: Path) -> Path:
+    trash_path = Path(target.parent / f"{TRASH_MARKER}{target.name}.{uuid.uuid4().hex[:8]}")
+    target.rename(trash_path)
+    return trash_path
+
+
+def get_deletion_units(trash_paths: list[Path]) -> list[Path]:
+    """Splits each trash dir into its top level entries, so one huge dir is still deleted in parallel."""
+    units = []
+    for trash_path in trash_paths:
+        try:
+            units.extend(Path(entry.path) for entry in os.scandir(trash_path))
+        except OSError:
+            continue
+    return units
+
+
+def delete_path(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def delete_trash(trash_paths: list[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    units = get_deletion_units(trash_paths)
+    total_units = len(units)
+    # report roughly every tenth of the way, not once per entry
+    report_interval = max(1, total_units // 10)
+    with timer.span("delete_trash", category="cleanup"):
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cleanup_delete") as executor:
+            for deleted_count, _ in enumerate(executor.map(delete_path, units), start=1):
+                if deleted_count % report_interval == 0 or deleted_count == total_units:
+                    logger.log_message(f"Cleanup: deleted {deleted_count}/{total_units} entries")
+        for trash_path in trash_paths:
+            delete_path(trash_path)
+    logger.log_message(f"Cleanup: finished removing {len(trash_paths)} directories")
+
+
+def start_background_delete(trash_paths: list[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> threading.Thread:
+    # not a daemon thread, so a cli run still finishes deleting before the interpreter exits
+    thread = threading.Thread(
+        target=delete_trash, args=(trash_paths, max_workers), name="cleanup_background_delete",
+    )
+    with cleanup_information.lock:
+        cleanup_information.background_threads = [
+            background_thread for background_thread in cleanup_information.background_threads
+            if background_thread.is_alive()
+        ]
+        cleanup_information.background_threads.append(thread)
+    thread.start()
+    return thread
+
+
+def start_detached_delete(trash_paths: list[Path]) -> bool:
+    """
+    Deletes the paths in a separate process that outlives this one, so a short cli run does not wait on it.
+    Returns False when no interpreter is available to run it, like in a frozen build.
+    """
+    if getattr(sys, "frozen", False):
+        return False
+    delete_code = "import shutil, sys\nfor path in sys.argv[1:]:\n    shutil.rmtree(path, ignore_errors=True)"
+    detach_options: dict = {"start_new_session": True}
+    if os.name == "nt":
+        detach_options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    try:
+        subprocess.Popen(
+            [sys.executable, "-c", delete_code, *map(os.fspath, trash_paths)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **detach_options,
+        )
+    except OSError:
+        return False
+    return True
+
+
+def delete_in_background(trash_paths: list[Path]) -> None:
+    """Deletes the paths in a detached process when possible, otherwise on a background thread."""
+    if trash_paths and not start_detached_delete(trash_paths):
+        start_background_delete(trash_paths)
+
+
+def purge_directory(directory: Path) -> None:
+    """
+    Swaps the directory for a fresh empty one right away and deletes the old contents in the background,
+    along with anything an earlier purge of the same directory left behind.
+    """
+    trash_paths = sorted(directory.parent.glob(f"{TRASH_MARKER}{directory.name}.*"))
+    if directory.is_dir():
+        try:
+            trash_paths.append(move_to_trash(directory))
+        except OSError as error:
+            # something still holds a file open, fall back to clearing what can be cleared in place
+            logger.log_message(f'Warning: could not move "{directory}" aside, clearing it in place: {error}')
+            shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir(parents=True, exist_ok=True)
+    delete_in_background(trash_paths)
+
+
+def wait_for_background_cleanup() -> None:
+    with cleanup_information.lock:
+        background_threads = list(cleanup_information.background_threads)
+    for thread in background_threads:
+        thread.join()
+
+
+def cleanup_directories(
+    root: Path,
+    dir_names: set[str],
+    *,
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int | None:
+    """
+    Removes every directory under root named in dir_names, returning as soon as they are moved aside.
+    With dry_run nothing is touched, and the bytes that would be freed are reported and returned.
+    """
+    found = find_cleanup_targets(root, dir_names)
+    if dry_run:
+        total_size = get_trees_size([*found.targets, *found.leftover_trash], max_workers)
+        for target in found.targets:
+            logger.log_message(f"Would remove directory: {target}")
+        logger.log_message(
+            f"Cleanup dry run: {len(found.targets)} directories, {total_size / (1024 * 1024):.1f} MiB would be freed",
+        )
+        return total_size
+
+    # sizes are not walked here, statting every file first would cost as much as the delete itself
+    trash_paths = list(found.leftover_trash)
+    for target in found.targets:
+        try:
+            trash_paths.append(move_to_trash(target))
+        except OSError as error:
+            # usually a file held open by the editor, leave it rather than failing the whole cleanup
+            logger.log_message(f'Warning: could not remove directory "{target}": {error}')
+            continue
+        logger.log_message(f"Removed directory: {target}")
+    # deleted on a thread pool rather than a detached process, so the progress shows up in this run's log
+    if trash_paths:
+        start_background_delete(trash_paths, max_workers)
+    logger.log_message(f"Cleanup: {len(trash_paths)} directories are being deleted in the background")
+    return None
@@ -0,0 +1,286 @@
+"""
+Expands the collections a mod includes into the asset paths packing and cooking work with.
+
+Static collections list their assets directly. Dynamic collections hold filter lines, a small
+subset of the editor's text filter syntax, which are compiled once and matched against an index
+of the project's Content tree:
+
+    Name=Rock*          name matches the wildcard pattern
+    Path:/Game/Mods/A   package path contains the text
+    Extension!=umap     negated match
+    Rock                bare text, name contains it
+    A AND B, A OR B, NOT A, ( ... )
+"""
+
+import os
+import re
+import fnmatch
+import functools
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Callable
+
+from tempo_core import data_structures, logger, timer, unreal_collections, utilities
+
+# file include keys a mod entry can list collections under
+COLLECTION_FILE_INCLUDE_KEYS = (
+    data_structures.FileFilterType.COLLECTION_PATHS.value,
+    "unreal_collections",
+)
+
+ASSET_FILE_EXTENSIONS = ("uasset", "umap")
+
+DYNAMIC_QUERY_PREFIX = "DynamicQueryText:"
+
+FILTER_TOKEN_REGEX = re.compile(r'\(|\)|"[^"]*"|[^\s()]+')
+FILTER_TERM_REGEX = re.compile(r"^(?P<key>\w+)(?P<operator>!=|=|:)(?P<value>.+)$")
+
+
+@dataclass(frozen=True)
+class IndexedAsset:
+    package_path: str
+    name: str
+    extension: str
+
+
+@dataclass
+class AssetIndex:
+    content_dir: Path
+    assets: list[IndexedAsset]
+    package_paths: frozenset[str]
+    # every directory under Content to its mtime, a file added or removed anywhere changes one of these
+    directory_stamps: dict[str, int]
+
+    def is_current(self) -> bool:
+        for directory, mtime_ns in self.directory_stamps.items():
+            try:
+                if Path(directory).stat().st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+@dataclass
+class AssetIndexCache:
+    indexes: dict[Path, AssetIndex] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+asset_index_cache = AssetIndexCache()
+
+
+def get_package_path(content_dir: Path, file_path: str) -> str:
+    relative_path = os.path.relpath(file_path, content_dir).replace(os.sep, "/")
+    return f"/Game/{relative_path.rsplit('.', 1)[0]}"
+
+
+@timer.timed("collections")
+def build_asset_index(content_dir: Path) -> AssetIndex:
+    assets = []
+    directory_stamps = {}
+    pending_dirs = [os.fspath(content_dir)]
+    while pending_dirs:
+        directory = pending_dirs.pop()
+        try:
+            directory_stamps[directory] = Path(directory).stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                pending_dirs.append(entry.path)
+                continue
+            stem, _, extension = entry.name.rpartition(".")
+            extension = extension.lower()
+            if stem and extension in ASSET_FILE_EXTENSIONS:
+                assets.append(
+                    IndexedAsset(
+                        package_path=get_package_path(content_dir, entry.path),
+                        name=stem,
+                        extension=extension,
+                    ),
+                )
+    return AssetIndex(
+        content_dir=content_dir,
+        assets=assets,
+        package_paths=frozenset(asset.package_path for asset in assets),
+        directory_stamps=directory_stamps,
+    )
+
+
+def get_asset_index(content_dir: Path) -> AssetIndex:
+    """Returns the cached index for the Content dir, rebuilt only when a file was added or removed."""
+    with asset_index_cache.lock:
+        asset_index = asset_index_cache.indexes.get(content_dir)
+    if asset_index and asset_index.is_current():
+        return asset_index
+    asset_index = build_asset_index(content_dir)
+    with asset_index_cache.lock:
+        asset_index_cache.indexes[content_dir] = asset_index
+    return asset_index
+
+
+def invalidate_asset_index() -> None:
+    with asset_index_cache.lock:
+        asset_index_cache.indexes.clear()
+
+
+AssetPredicate = Callable[[IndexedAsset], bool]
+
+
+def get_asset_field(asset: IndexedAsset, key: str) -> str | None:
+    if key == "name":
+        return asset.name
+    if key == "path":
+        return asset.package_path
+    if key == "extension":
+        return asset.extension
+    return None
+
+
+def compile_filter_term(term: str) -> AssetPredicate:
+    match = FILTER_TERM_REGEX.match(term)
+    if not match:
+        text = term.strip('"').lower()
+        return lambda asset: text in asset.name.lower()
+    key = match["key"].lower()
+    operator = match["operator"]
+    value = match["value"].strip('"').lower()
+    if key not in ("name", "path", "extension"):
+        logger.log_message(f'Warning: unsupported collection filter key "{match["key"]}", it will not match anything')
+        return lambda _asset: False
+    if operator == ":":
+        return lambda asset: value in (get_asset_field(asset, key) or "").lower()
+    # wildcards are compiled to one regex up front instead of calling fnmatch per asset
+    pattern = re.compile(fnmatch.translate(value), re.IGNORECASE)
+    if operator == "=":
+        return lambda asset: bool(pattern.match(get_asset_field(asset, key) or ""))
+    return lambda asset: not pattern.match(get_asset_field(asset, key) or "")
+
+
+def parse_filter_expression(tokens: list[str], position: int) -> tuple[AssetPredicate, int]:
+    """Parses OR separated groups of implicitly ANDed terms, returning the predicate and next position."""
+    or_predicates: list[AssetPredicate] = []
+    and_predicates: list[AssetPredicate] = []
+    while position < len(tokens):
+        token = tokens[position]
+        upper_token = token.upper()
+        if token == ")":
+            break
+        if upper_token == "AND":
+            position += 1
+            continue
+        if upper_token == "OR":
+            or_predicates.append(combine_all(and_predicates))
+            and_predicates = []
+            position += 1
+            continue
+        negate = False
+        if upper_token == "NOT":
+            negate = True
+            position += 1
+            token = tokens[position] if position < len(tokens) else ""
+        if token == "(":
+            predicate, position = parse_filter_expression(tokens, position + 1)
+            position += 1
+        else:
+            predicate = compile_filter_term(token)
+            position += 1
+        if negate:
+            predicate = negate_predicate(predicate)
+        and_predicates.append(predicate)
+    or_predicates.append(combine_all(and_predicates))
+    if len(or_predicates) == 1:
+        return or_predicates[0], position
+    return (lambda asset: any(predicate(asset) for predicate in or_predicates)), position
+
+
+def combine_all(predicates: list[AssetPredicate]) -> AssetPredicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda asset: all(predicate(asset) for predicate in predicates)
+
+
+def negate_predicate(predicate: AssetPredicate) -> AssetPredicate:
+    return lambda asset: not predicate(asset)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_asset_filter(filter_text: str) -> AssetPredicate:
+    """Compiles a dynamic collection filter line once, the same text is shared across collections and runs."""
+    tokens = FILTER_TOKEN_REGEX.findall(filter_text)
+    if not tokens:
+        return lambda _asset: False
+    predicate, _ = parse_filter_expression(tokens, 0)
+    return predicate
+
+
+def get_collection_filter_lines(collection_path: Path) -> list[str]:
+    filter_lines = []
+    for line in unreal_collections.get_all_non_key_lines_from_collection_path(collection_path):
+        filter_line = line.removeprefix(DYNAMIC_QUERY_PREFIX).strip()
+        if filter_line:
+            filter_lines.append(filter_line)
+    return filter_lines
+
+
+def resolve_collection_package_paths(collection_path: Path, asset_index: AssetIndex) -> list[str]:
+    """Returns the /Game package paths a static or dynamic collection refers to."""
+    collection = unreal_collections.get_unreal_collection_from_unreal_collection_path(collection_path)
+    if collection.content_type == unreal_collections.UnrealContentLineType.DYNAMIC:
+        predicates = [compile_asset_filter(filter_line) for filter_line in get_collection_filter_lines(collection_path)]
+        return [
+            asset.package_path for asset in asset_index.assets
+            if any(predicate(asset) for predicate in predicates)
+        ]
+    package_paths = []
+    for content_line in collection.content_lines:
+        package_path = (
+            content_line.normalized_path if isinstance(content_line, unreal_collections.UnrealAssetPath)
+            else unreal_collections.UnrealAssetPath(path=content_line).normalized_path
+        )
+        if package_path in asset_index.package_paths:
+            package_paths.append(package_path)
+        else:
+            logger.log_message(f'Warning: collection "{collection_path.name}" lists a missing asset "{package_path}"')
+    return package_paths
+
+
+def get_mod_collection_paths(mod_name: str) -> list[Path]:
+    file_includes = utilities.get_mod_info_from_mod_name(mod_name).get("file_includes", {})
+    uproject_dir = utilities.get_uproject_dir_or_raise()
+    collection_paths = []
+    for key in COLLECTION_FILE_INCLUDE_KEYS:
+        for collection_path in file_includes.get(key, []):
+            collection_path = Path(collection_path)
+            if not collection_path.is_absolute():
+                collection_path = Path(uproject_dir / collection_path)
+            collection_paths.append(collection_path)
+    return collection_paths
+
+
+def get_mod_collection_asset_paths(mod_name: str) -> list[str]:
+    """
+    The mod's collection assets in the same Content/... form as file_includes asset_paths,
+    so they can be fed to anything that already handles asset_paths.
+    """
+    collection_paths = get_mod_collection_paths(mod_name)
+    if not collection_paths:
+        return []
+    asset_index = get_asset_index(Path(utilities.get_uproject_dir_or_raise() / "Content"))
+    asset_paths: dict[str, None] = {}
+    for collection_path in collection_paths:
+        for package_path in resolve_collection_package_paths(collection_path, asset_index):
+            asset_paths[f"Content{package_path.removeprefix('/Game')}"] = None
+    return list(asset_paths)
+
+
+def get_mod_asset_paths(mod_name: str) -> list[str]:
+    """The mod's file_includes asset_paths followed by the assets its collections resolve to."""
+    file_includes = utilities.get_mod_info_from_mod_name(mod_name).get("file_includes", {})
+    asset_paths = dict.fromkeys(file_includes.get("asset_paths", []))
+    asset_paths.update(dict.fromkeys(get_mod_collection_asset_paths(mod_name)))
+    return list(asset_paths)
+
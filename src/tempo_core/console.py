@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 import sys
 import typing
+import functools
 
-from rich.console import Console
+if typing.TYPE_CHECKING:
+    from rich.console import Console
 
 
 ColorSystem = typing.Literal["auto", "standard", "256", "truecolor", "windows"]
@@ -22,6 +26,17 @@ def get_use_auto_console_highlight() -> bool:
     return True
 
 
-console = Console(
-    color_system=get_color_system_type(), highlight=get_use_auto_console_highlight(),
-)
+@functools.cache
+def get_console() -> Console:
+    # rich is only imported once something is actually printed
+    from rich.console import Console
+
+    return Console(
+        color_system=get_color_system_type(), highlight=get_use_auto_console_highlight(),
+    )
+
+
+def __getattr__(name: str) -> object:
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,405 @@
+"""
+A long lived process that keeps a warm project context and serves commands to thin clients.
+
+The daemon listens on a unix socket (a named pipe on windows). Each request carries a command name
+from get_daemon_commands and its keyword arguments, log lines are streamed back while it runs, and the
+last message is the exit code. Requests run one at a time, as the commands share module level state.
+"""
+
+import os
+import sys
+import inspect
+import getpass
+import argparse
+import secrets
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Callable
+from multiprocessing.connection import Client, Connection, Listener
+
+from tempo_core import logger, settings
+
+# seconds between checks of the watched project files
+FILE_WATCH_INTERVAL = 1.0
+
+DAEMON_AUTHKEY_BYTES = 32
+
+
+@dataclass
+class DaemonInformation:
+    listener: Listener | None
+    run_daemon: bool
+    # path to the (mtime_ns, size) it had when the warm context was built
+    watched_files: dict[Path, tuple[int, int] | None] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+daemon_information = DaemonInformation(listener=None, run_daemon=False)
+
+
+def get_daemon_commands() -> dict[str, Callable[..., None]]:
+    from tempo_core import main_logic
+
+    return {
+        "build": main_logic.build,
+        "cook": main_logic.cook,
+        "package": main_logic.package,
+        "generate_mods": main_logic.generate_mods,
+        "generate_mods_all": main_logic.generate_mods_all,
+        "test_mods": main_logic.test_mods,
+        "test_mods_all": main_logic.test_mods_all,
+        "full_run": main_logic.full_run,
+        "full_run_all": main_logic.full_run_all,
+        "generate_mod_releases": main_logic.generate_mod_releases,
+        "generate_mod_releases_all": main_logic.generate_mod_releases_all,
+        "cleanup_cooked": main_logic.cleanup_cooked,
+        "cleanup_build": main_logic.cleanup_build,
+        "cache_stats": main_logic.cache_stats,
+        "cache_prune": main_logic.cache_prune,
+        "resave_packages_and_fix_up_redirectors": main_logic.resave_packages_and_fix_up_redirectors,
+        "run_game": main_logic.run_game,
+        "close_game": main_logic.close_game,
+        "run_engine": main_logic.run_engine,
+        "close_engine": main_logic.close_engine,
+    }
+
+
+def get_daemon_runtime_dir() -> Path:
+    runtime_dir = Path(tempfile.gettempdir(), f"tempo_daemon_{getpass.getuser()}")
+    runtime_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return runtime_dir
+
+
+def get_daemon_address() -> str:
+    if sys.platform == "win32":
+        return rf"\\.\pipe\tempo_daemon_{getpass.getuser()}"
+    return os.fspath(get_daemon_runtime_dir() / "daemon.sock")
+
+
+def get_daemon_family() -> str:
+    return "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+def get_daemon_authkey_path() -> Path:
+    return Path(get_daemon_runtime_dir() / "daemon.key")
+
+
+def create_daemon_authkey() -> bytes:
+    authkey = secrets.token_bytes(DAEMON_AUTHKEY_BYTES)
+    authkey_path = get_daemon_authkey_path()
+    authkey_path.unlink(missing_ok=True)
+    file_descriptor = os.open(authkey_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(file_descriptor, "wb") as authkey_file:
+        authkey_file.write(authkey)
+    return authkey
+
+
+def read_daemon_authkey() -> bytes | None:
+    try:
+        return get_daemon_authkey_path().read_bytes()
+    except OSError:
+        return None
+
+
+def get_file_stamp(file_path: Path) -> tuple[int, int] | None:
+    try:
+        stat_result = file_path.stat()
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def get_watched_file_paths() -> list[Path]:
+    watched_file_paths = []
+    if settings.settings_information.init_settings_done:
+        watched_file_paths.append(Path(settings.settings_information.config_file.path))
+    uproject_file = settings.get_uproject_file()
+    if uproject_file:
+        watched_file_paths.append(uproject_file)
+        # the project's own inis, a file added later is picked up on the next reload
+        watched_file_paths.extend(sorted(uproject_file.parent.joinpath("Config").glob("*.ini")))
+    return watched_file_paths
+
+
+def snapshot_watched_files() -> None:
+    daemon_information.watched_files = {
+        file_path: get_file_stamp(file_path) for file_path in get_watched_file_paths()
+    }
+
+
+def reload_settings(config_file: Path) -> None:
+    logger.log_message(f"Daemon: reloading settings from {config_file}")
+    settings.init_settings(config_file)
+    snapshot_watched_files()
+
+
+def invalidate_warm_context() -> None:
+    """Drops what the daemon kept warm between requests, so the next request rebuilds it from the new files."""
+    from tempo_core import collection_resolver, file_io, process_management, session, unreal_collections, unreal_inis
+
+    process_management.invalidate_process_snapshot()
+    # tool paths and the tools cache depend on the cache directory and tool versions in the config
+    current_session = session.get_current_session()
+    current_session.drop_state("tool_executable_paths")
+    current_session.drop_state("tools_cache")
+    collection_resolver.invalidate_asset_index()
+    unreal_collections.collection_store.invalidate()
+    with unreal_collections.collection_graph_cache.lock:
+        unreal_collections.collection_graph_cache.graphs.clear()
+    unreal_inis.ini_document_cache.invalidate()
+    file_io.config_line_cache.invalidate()
+
+
+def check_watched_files() -> None:
+    changed_file_paths = [
+        file_path for file_path, stamp in daemon_information.watched_files.items()
+        if get_file_stamp(file_path) != stamp
+    ]
+    if not changed_file_paths:
+        return
+    # this runs on the reactor thread, which a running request may be waiting on for its game and engine
+    # monitors, so it never blocks on the request, the stamps stay stale and the next tick tries again
+    if not daemon_information.lock.acquire(blocking=False):
+        return
+    try:
+        logger.log_message(f"Daemon: project files changed: {', '.join(map(str, changed_file_paths))}")
+        config_file = Path(settings.settings_information.config_file.path)
+        if config_file in changed_file_paths:
+            reload_settings(config_file)
+        else:
+            snapshot_watched_files()
+        invalidate_warm_context()
+    finally:
+        daemon_information.lock.release()
+
+
+def ensure_settings_for_request(config_file: Path | None) -> None:
+    if config_file is None:
+        return
+    if (
+        settings.settings_information.init_settings_done
+        and Path(settings.settings_information.config_file.path).resolve() == config_file.resolve()
+    ):
+        return
+    reload_settings(config_file)
+    invalidate_warm_context()
+
+
+def run_daemon_request(connection: Connection, request: dict) -> int:
+    command = get_daemon_commands().get(request.get("command", ""))
+    if command is None:
+        connection.send(("log", f"Error: unknown daemon command {request.get('command')!r}"))
+        return 2
+
+    send_lock = threading.Lock()
+
+    def send_log_line(message: str) -> None:
+        # monitor threads log too, and a client that went away should not fail the command
+        with send_lock:
+            try:
+                connection.send(("log", message))
+            except (OSError, EOFError):
+                pass
+
+    logger.add_log_listener(send_log_line)
+    original_cwd = Path.cwd()
+    # commands add to mod_names as they run, so each request starts from the loaded config
+    original_mod_names = set(settings.settings_information.mod_names)
+    try:
+        ensure_settings_for_request(request.get("config_file"))
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        command(**request.get("kwargs", {}))
+    except Exception as error:  # noqa: BLE001
+        # a failed command must not take the warm daemon down with it
+        send_log_line(f"Error: {error}\n{traceback.format_exc()}")
+        return 1
+    finally:
+        logger.remove_log_listener(send_log_line)
+        settings.settings_information.mod_names.clear()
+        settings.settings_information.mod_names.update(original_mod_names)
+        os.chdir(original_cwd)
+    return 0
+
+
+def handle_daemon_connection(connection: Connection) -> None:
+    with connection:
+        request = connection.recv()
+        if request.get("command") == "stop":
+            daemon_information.run_daemon = False
+            connection.send(("exit", 0))
+            return
+        if request.get("command") == "ping":
+            connection.send(("exit", 0))
+            return
+        with daemon_information.lock:
+            exit_code = run_daemon_request(connection, request)
+        connection.send(("exit", exit_code))
+
+
+def serve_daemon() -> None:
+    """
+    Builds the warm context once and serves requests until a stop request arrives.
+    Settings come from --config-file like any other run.
+    """
+    from tempo_core import initialization, manager
+    from tempo_core.threads import monitor_reactor
+
+    initialization.initialization()
+    if settings.settings_information.init_settings_done:
+        # resolve tool paths up front instead of on the first request
+        for prefetch_thread in manager.prefetch_tools_for_enabled_mods():
+            prefetch_thread.join()
+    snapshot_watched_files()
+    monitor_reactor.add_periodic_job("daemon_file_watch", FILE_WATCH_INTERVAL, check_watched_files)
+
+    address = get_daemon_address()
+    if get_daemon_family() == "AF_UNIX":
+        Path(address).unlink(missing_ok=True)
+    daemon_information.listener = Listener(address, family=get_daemon_family(), authkey=create_daemon_authkey())
+    daemon_information.run_daemon = True
+    logger.log_message(f"Daemon: listening on {address}")
+    try:
+        while daemon_information.run_daemon:
+            try:
+                connection = daemon_information.listener.accept()
+            except OSError as error:
+                # failed authentication or a client that went away, keep serving
+                logger.log_message(f"Daemon: rejected connection: {error}")
+                continue
+            try:
+                handle_daemon_connection(connection)
+            except (EOFError, OSError) as error:
+                logger.log_message(f"Daemon: client disconnected: {error}")
+    finally:
+        monitor_reactor.remove_periodic_job("daemon_file_watch")
+        daemon_information.listener.close()
+        daemon_information.listener = None
+        get_daemon_authkey_path().unlink(missing_ok=True)
+        logger.log_message("Daemon: stopped")
+
+
+def connect_to_daemon() -> Connection | None:
+    authkey = read_daemon_authkey()
+    if authkey is None:
+        return None
+    try:
+        return Client(get_daemon_address(), family=get_daemon_family(), authkey=authkey)
+    except (OSError, EOFError):
+        return None
+
+
+def is_daemon_running() -> bool:
+    return send_daemon_request({"command": "ping"}) == 0
+
+
+def stop_daemon() -> bool:
+    return send_daemon_request({"command": "stop"}) is not None
+
+
+def send_daemon_request(
+    request: dict,
+    on_log_line: Callable[[str], None] | None = None,
+) -> int | None:
+    """Sends one request and streams its log lines, returns None when no daemon is reachable."""
+    connection = connect_to_daemon()
+    if connection is None:
+        return None
+    with connection:
+        connection.send(request)
+        while True:
+            try:
+                message_type, payload = connection.recv()
+            except EOFError:
+                return 1
+            if message_type == "exit":
+                return payload
+            if on_log_line:
+                on_log_line(payload)
+
+
+def write_log_line(line: str) -> None:
+    sys.stdout.write(f"{line}\n")
+    sys.stdout.flush()
+
+
+def forward_to_daemon(command: str, kwargs: dict, config_file: Path | None = None) -> int | None:
+    """
+    Runs a command in the daemon if one is listening, with this process's working directory.
+    Returns the command's exit code, or None so the caller can run it in process instead.
+    """
+    return send_daemon_request(
+        {
+            "command": command,
+            "kwargs": kwargs,
+            "config_file": config_file.absolute() if config_file else None,
+            "cwd": os.fspath(Path.cwd()),
+        },
+        on_log_line=write_log_line,
+    )
+
+
+def get_command_kwargs(command_name: str, args: argparse.Namespace) -> dict:
+    # only pass the options the command's main_logic function actually takes
+    parameters = inspect.signature(get_daemon_commands()[command_name]).parameters
+    available_kwargs = {
+        "input_mod_names": args.mod_names,
+        "mod_names": args.mod_names,
+        "toggle_engine": args.toggle_engine,
+        "use_symlinks": args.use_symlinks,
+        "base_files_directory": args.base_files_directory,
+        "output_directory": args.output_directory,
+    }
+    return {name: value for name, value in available_kwargs.items() if name in parameters}
+
+
+def get_daemon_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tempo-core")
+    parser.add_argument("command", help=f"daemon start/stop/status, or one of: {', '.join(get_daemon_commands())}")
+    parser.add_argument("action", nargs="?", choices=["start", "stop", "status"])
+    parser.add_argument("--config-file", type=Path, default=None)
+    parser.add_argument("--mod-names", nargs="*", default=[])
+    parser.add_argument("--toggle-engine", action="store_true")
+    parser.add_argument("--use-symlinks", action="store_true")
+    parser.add_argument("--base-files-directory", type=Path, default=None)
+    parser.add_argument("--output-directory", type=Path, default=None)
+    parser.add_argument("--no-daemon", action="store_true", help="run in this process even if a daemon is running")
+    return parser
+
+
+def main() -> int:
+    """
+    Entry point for the tempo-core script.
+    Commands are forwarded to a running daemon, and run in process otherwise.
+    """
+    # flags initialization reads itself, like --logs-directory, are left in sys.argv
+    args, _ = get_daemon_argument_parser().parse_known_args()
+
+    if args.command == "daemon":
+        if args.action == "stop":
+            return 0 if stop_daemon() else 1
+        if args.action == "status":
+            is_running = is_daemon_running()
+            write_log_line(f"Daemon: {'running' if is_running else 'not running'}")
+            return 0 if is_running else 1
+        serve_daemon()
+        return 0
+
+    if args.command not in get_daemon_commands():
+        write_log_line(f"Error: unknown command {args.command!r}")
+        return 2
+
+    kwargs = get_command_kwargs(args.command, args)
+    if not args.no_daemon:
+        exit_code = forward_to_daemon(args.command, kwargs, args.config_file)
+        if exit_code is not None:
+            return exit_code
+
+    from tempo_core import initialization
+
+    initialization.initialization()
+    get_daemon_commands()[args.command](**kwargs)
+    return 0
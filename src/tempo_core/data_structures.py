@@ -232,10 +232,10 @@ class SigMethodType(Enum):
 E = TypeVar("E", bound=Enum)
 
 def get_enum_from_val[E: Enum](enum_cls: Type[E], value: object) -> E:
-    for entry in enum_cls:
-        if entry.value == value:
-            return entry
-    raise ValueError(f"{value} is not a valid value for {enum_cls.__name__}")
+    try:
+        return enum_cls(value)
+    except ValueError:
+        raise ValueError(f"{value} is not a valid value for {enum_cls.__name__}") from None
 
 
 def get_enum_strings_from_enum(enum_cls: Type[Enum]) -> list[str]:
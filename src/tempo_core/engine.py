@@ -32,15 +32,12 @@ def close_game_engine() -> None:
         unreal_engine.get_win_dir_type(settings.get_unreal_engine_dir()) # ty: ignore
         == PackagingDirType.WINDOWS_NO_EDITOR
     ):
-        game_engine_processes = process_management.get_processes_by_substring(
-            "UE4Editor",
-        )
+        editor_process_substring = "UE4Editor"
     else:
-        game_engine_processes = process_management.get_processes_by_substring(
-            "UnrealEditor",
-        )
-    for process_info in game_engine_processes:
-        process_management.kill_process(process_info["name"])
+        editor_process_substring = "UnrealEditor"
+    process_management.kill_process_batch(
+        process_management.get_process_snapshot().get_processes_by_substring(editor_process_substring),
+    )
     post_engine_closed_message()
 
 
@@ -1,17 +1,17 @@
-from questionary import path
 import glob
-import hashlib
 import os
 import shutil
 import sys
+import tempfile
+import threading
+import contextlib
 import webbrowser
 import zipfile
 from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Callable, Generator
 
-import requests
-from requests.exceptions import HTTPError, RequestException
-
-from tempo_core import logger, online_check
+from tempo_core import hashing, logger, online_check, timer
 
 SCRIPT_DIR = (
     Path(sys.executable).parent
@@ -27,8 +27,12 @@ def unzip_zip(zip_path: Path, output_location: Path) -> None:
 
 
 def download_file(url: str, download_path: Path) -> None:
-    if not online_check.is_online:
+    if not online_check.get_is_online():
         raise RuntimeError('You are not able to download files when not connected to the web.')
+
+    import requests
+    from requests.exceptions import HTTPError, RequestException
+
     try:
         response = requests.get(url, stream=True, timeout=10)
         response.raise_for_status()
@@ -67,7 +71,7 @@ def open_file_in_default(file_path: Path) -> None:
 
 
 def open_website(input_url: str) -> None:
-    if not online_check.is_online:
+    if not online_check.get_is_online():
         raise RuntimeError('You are not able to open websites in your browser when not connected to the web.')
     webbrowser.open(input_url)
 
@@ -111,18 +115,36 @@ def verify_files_exists(file_paths: list[Path]) -> None:
             raise FileNotFoundError(file_not_found_error)
 
 
-def get_file_hash(file_path: Path) -> str:
-    md5 = hashlib.sha256()
-    with file_path.open("rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            md5.update(chunk)
-    return md5.hexdigest()
+def get_file_hash(file_path: Path, algorithm: str | None = None) -> str:
+    """Hashes with the fast algorithm unless one is given, only compare the result within one run."""
+    return hashing.hash_file(file_path, algorithm or hashing.get_fast_algorithm())
 
 
 def get_do_files_have_same_hash(file_path_one: Path, file_path_two: Path) -> bool:
-    if file_path_one.exists() and file_path_two.exists():
-        return get_file_hash(file_path_one) == get_file_hash(file_path_two)
-    return False
+    try:
+        # files of different sizes cannot match, so most changed files are never read
+        if file_path_one.stat().st_size != file_path_two.stat().st_size:
+            return False
+    except OSError:
+        return False
+    digests = hashing.hash_files([file_path_one, file_path_two], hashing.get_fast_algorithm())
+    return digests[file_path_one] == digests[file_path_two]
+
+
+def get_unchanged_file_pairs(file_pairs: dict[Path, Path]) -> set[Path]:
+    """
+    The source files in file_pairs, a source to destination mapping, whose destination already has the same contents.
+    Pairs of equal size are hashed together in one parallel batch.
+    """
+    same_size_pairs = {}
+    for src_file, dest_file in file_pairs.items():
+        try:
+            if src_file.stat().st_size == dest_file.stat().st_size:
+                same_size_pairs[src_file] = dest_file
+        except OSError:
+            continue
+    digests = hashing.hash_files([*same_size_pairs, *same_size_pairs.values()], hashing.get_fast_algorithm())
+    return {src_file for src_file, dest_file in same_size_pairs.items() if digests[src_file] == digests[dest_file]}
 
 
 def get_files_in_tree(tree_path: Path) -> list[Path]:
@@ -164,58 +186,160 @@ def filter_by_extension(files: list[Path], extension: str) -> list[Path]:
     return [f for f in files if f.suffix.lower() == ext]
 
 
+def get_umask() -> int:
+    # the umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# read once at import, before any threads are making files, the mode a plain open() gives a new file
+NEW_FILE_MODE = 0o666 & ~get_umask()
+
+
+def write_file_atomically(file_path: Path, contents: str, *, newline: str | None = None) -> bool:
+    """
+    Replaces the file with a temp file renamed over it, so readers never see a partial write.
+    Returns False without writing when the file already has these contents.
+    """
+    try:
+        with file_path.open(encoding="utf-8", newline=newline) as file:
+            if file.read() == contents:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        newline=newline,
+        dir=file_path.parent,
+        prefix=f".{file_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as temp_file:
+        temp_file.write(contents)
+    try:
+        # temp files are made private, the file keeps its own mode, or gets a new file's usual one
+        try:
+            shutil.copymode(file_path, temp_file.name)
+        except FileNotFoundError:
+            Path(temp_file.name).chmod(NEW_FILE_MODE)
+        Path(temp_file.name).replace(file_path)
+    except OSError:
+        Path(temp_file.name).unlink(missing_ok=True)
+        raise
+    # the mtime alone can miss a rewrite within the same timestamp tick
+    config_line_cache.invalidate(file_path)
+    return True
+
+
+@dataclass
+class ConfigLineCache:
+    """Lines of config files by path, reread only when the mtime or size changes."""
+
+    entries: dict[Path, tuple[int, int, tuple[str, ...]]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, config_path: Path) -> tuple[str, ...]:
+        stat_result = config_path.stat()
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self.lock:
+            entry = self.entries.get(config_path)
+        if entry and entry[:2] == stamp:
+            return entry[2]
+        with config_path.open(encoding="utf-8") as file:
+            lines = tuple(file.readlines())
+        with self.lock:
+            self.entries[config_path] = (*stamp, lines)
+        return lines
+
+    def invalidate(self, config_path: Path | None = None) -> None:
+        with self.lock:
+            if config_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(config_path, None)
+
+
+config_line_cache = ConfigLineCache()
+
+# config lines set inside batch_config_edits on this thread, by path, written once when the batch ends
+config_edit_batch = threading.local()
+
+
+@contextlib.contextmanager
+def batch_config_edits() -> Generator[None, None, None]:
+    """
+    Keeps every config line edit in the block in memory and writes each file once at the end.
+    Nested batches join the outermost one. When the block raises the edits are dropped, none are written.
+    """
+    if getattr(config_edit_batch, "pending", None) is not None:
+        yield
+        return
+    config_edit_batch.pending = {}
+    try:
+        yield
+        pending_configs = config_edit_batch.pending
+    finally:
+        config_edit_batch.pending = None
+    for config_path, lines in pending_configs.items():
+        write_file_atomically(config_path, "".join(lines))
+
+
 def get_all_lines_in_config(config_path: Path) -> list[str]:
-    with config_path.open(encoding="utf-8") as file:
-        return file.readlines()
+    pending_configs = getattr(config_edit_batch, "pending", None)
+    if pending_configs is not None and config_path in pending_configs:
+        return list(pending_configs[config_path])
+    return list(config_line_cache.get(config_path))
 
 
 def set_all_lines_in_config(config_path: Path, lines: list[str]) -> None:
-    with config_path.open("w", encoding="utf-8") as file:
-        file.writelines(lines)
+    pending_configs = getattr(config_edit_batch, "pending", None)
+    if pending_configs is not None:
+        pending_configs[config_path] = list(lines)
+        return
+    write_file_atomically(config_path, "".join(lines))
 
 
 def add_line_to_config(config_path: Path, line: str) -> None:
-    if not does_config_have_line(config_path, line):
-        with config_path.open("a", encoding="utf-8") as file:
-            file.write(line + "\n")
+    lines = get_all_lines_in_config(config_path)
+    if line + "\n" in lines:
+        return
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    lines.append(line + "\n")
+    set_all_lines_in_config(config_path, lines)
 
 
 def remove_line_from_config(config_path: Path, line: str) -> None:
-    lines = get_all_lines_in_config(config_path)
-    with config_path.open("w", encoding="utf-8") as file:
-        file.writelines(
-            config_line for config_line in lines if config_line.rstrip("\n") != line
-        )
+    remove_lines_from_config_that_match(config_path, lambda config_line: config_line.rstrip("\n") == line)
 
 
 def does_config_have_line(config_path: Path, line: str) -> bool:
     return line + "\n" in get_all_lines_in_config(config_path)
 
 
+def remove_lines_from_config_that_match(config_path: Path, predicate: Callable[[str], bool]) -> None:
+    """Drops every line the predicate matches, writing only when something was removed."""
+    lines = get_all_lines_in_config(config_path)
+    new_lines = [line for line in lines if not predicate(line)]
+    if len(new_lines) != len(lines):
+        set_all_lines_in_config(config_path, new_lines)
+
+
 def remove_lines_from_config_that_start_with_substring(
     config_path: Path, substring: str,
 ) -> None:
-    new_lines = []
-    for line in get_all_lines_in_config(config_path):
-        if not line.startswith(substring):
-            new_lines.append(line)
-    set_all_lines_in_config(config_path, new_lines)
+    remove_lines_from_config_that_match(config_path, lambda line: line.startswith(substring))
 
 
 def remove_lines_from_config_that_end_with_substring(config_path: Path, substring: str) -> None:
-    new_lines = []
-    for line in get_all_lines_in_config(config_path):
-        if not line.endswith(substring):
-            new_lines.append(line)
-    set_all_lines_in_config(config_path, new_lines)
+    remove_lines_from_config_that_match(config_path, lambda line: line.rstrip("\n").endswith(substring))
 
 
 def remove_lines_from_config_that_contain_substring(config_path: Path, substring: str) -> None:
-    new_lines = []
-    for line in get_all_lines_in_config(config_path):
-        if line not in (substring):
-            new_lines.append(line)
-    set_all_lines_in_config(config_path, new_lines)
+    remove_lines_from_config_that_match(config_path, lambda line: substring in line)
 
 
 def get_platform_wrapper_extension() -> str:
@@ -244,6 +368,7 @@ def zip_directory_tree(input_dir: Path, output_dir: Path, zip_name: str = "archi
             arcname = os.path.relpath(file_path, input_dir)
             zipf.write(file_path, arcname)
 
+    timer.add_bytes_processed(zip_path.stat().st_size)
     logger.log_message(f"Directory tree zipped successfully: {zip_path}")
 
 
@@ -0,0 +1,139 @@
+"""
+Cross process locks backed by a lock file, so separate tempo runs and the daemon do not step on
+shared state on disk like the artifact cache, the tools cache or a game's Paks dir.
+"""
+
+import os
+import time
+import hashlib
+import threading
+import contextlib
+from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Generator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class HeldFileLock:
+    # os level locks do not order threads of one process reliably on every platform, so each path also gets a
+    # thread lock, reentrant so a nested lock on the same path does not wait on itself
+    thread_lock: threading.RLock = field(default_factory=threading.RLock)
+    depth: int = 0
+    file_descriptor: int | None = None
+
+
+held_file_locks: dict[Path, HeldFileLock] = {}
+held_file_locks_lock = threading.Lock()
+
+
+def get_held_file_lock(lock_path: Path) -> HeldFileLock:
+    with held_file_locks_lock:
+        return held_file_locks.setdefault(lock_path, HeldFileLock())
+
+
+def get_directory_lock_path(lock_dir: Path, directory: Path) -> Path:
+    """A lock file in lock_dir standing for directory, for directories that should not get a lock file of their own."""
+    normalized_path = os.path.normcase(Path(directory).resolve())
+    path_digest = hashlib.blake2b(normalized_path.encode("utf-8"), digest_size=8).hexdigest()
+    return Path(lock_dir / f"{Path(directory).name}_{path_digest}.lock")
+
+
+def try_lock_file(file_descriptor: int) -> bool:
+    try:
+        if os.name == "nt":
+            msvcrt.locking(file_descriptor, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def unlock_file(file_descriptor: int) -> None:
+    if os.name == "nt":
+        os.lseek(file_descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(file_descriptor, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(file_descriptor, fcntl.LOCK_UN)
+
+
+def acquire_file_lock(lock_path: Path, *, timeout: float | None = None) -> int | None:
+    """
+    Locks lock_path and returns the open descriptor holding the lock, waiting up to timeout seconds,
+    forever when None. Returns None when the lock could not be taken in time.
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        file_descriptor = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        while not try_lock_file(file_descriptor):
+            if deadline is not None and time.monotonic() >= deadline:
+                os.close(file_descriptor)
+                return None
+            time.sleep(LOCK_POLL_INTERVAL)
+        # whoever held the lock before may have deleted the file, a lock on the old file guards nothing
+        try:
+            if lock_path.stat().st_ino == os.fstat(file_descriptor).st_ino:
+                return file_descriptor
+        except FileNotFoundError:
+            pass
+        unlock_file(file_descriptor)
+        os.close(file_descriptor)
+
+
+def release_file_lock(file_descriptor: int) -> None:
+    try:
+        unlock_file(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def release_and_delete_file_lock(lock_path: Path, file_descriptor: int) -> None:
+    """Releases a lock taken with acquire_file_lock and deletes its file, for locks that are done with for good."""
+    if os.name == "nt":
+        # windows cannot delete a file that is still open, so it is closed first,
+        # and left for a later cleanup when another run has opened it in the meantime
+        release_file_lock(file_descriptor)
+        with contextlib.suppress(OSError):
+            lock_path.unlink(missing_ok=True)
+        return
+    try:
+        # deleted while still held, so a run racing for the same lock sees the file change and locks anew
+        lock_path.unlink(missing_ok=True)
+    finally:
+        release_file_lock(file_descriptor)
+
+
+@contextlib.contextmanager
+def file_lock(lock_path: Path, timeout: float | None = None) -> Generator[None, None, None]:
+    """
+    Holds an exclusive lock on lock_path for the block, waiting up to timeout seconds, forever when None.
+    Nesting on the same path in one thread is allowed. Raises TimeoutError when the lock could not be taken in time.
+    """
+    lock_path = lock_path.resolve()
+    lock_timeout_error = f'Timed out waiting for the lock "{lock_path}"'
+    held_file_lock = get_held_file_lock(lock_path)
+    if not held_file_lock.thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+        raise TimeoutError(lock_timeout_error)
+    try:
+        if held_file_lock.depth == 0:
+            held_file_lock.file_descriptor = acquire_file_lock(lock_path, timeout=timeout)
+            if held_file_lock.file_descriptor is None:
+                raise TimeoutError(lock_timeout_error)
+        held_file_lock.depth += 1
+        try:
+            yield
+        finally:
+            held_file_lock.depth -= 1
+            if held_file_lock.depth == 0 and held_file_lock.file_descriptor is not None:
+                release_file_lock(held_file_lock.file_descriptor)
+                held_file_lock.file_descriptor = None
+    finally:
+        held_file_lock.thread_lock.release()
@@ -0,0 +1,277 @@
+"""
+Snapshots of a directory tree, like a game install, and restoring the tree to one.
+
+A snapshot records every file's relative path, size, mtime and optionally a content fingerprint,
+stored as a binary manifest.
+Restoring compares the snapshot with a fresh scan, deletes added files in parallel, and puts back
+modified or removed files from a content addressed backup taken along with the snapshot.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from tempo_core import hashing, logger, manifest, timer
+
+# directory scans and deletes wait on the disk, not the interpreter, so more threads than cores pays off
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class SnapshotEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    fingerprint: str | None = None
+
+
+@dataclass
+class GameSnapshot:
+    root: Path
+    # relative posix path to entry, a size of -1 means it came from a plain path list and only presence is known
+    entries: dict[str, SnapshotEntry] = field(default_factory=dict)
+
+
+@dataclass
+class SnapshotDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+
+def scan_directory(directory: str) -> tuple[list[tuple[str, int, int]], list[str]]:
+    files = []
+    sub_directories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_directories.append(entry.path)
+                    else:
+                        stat_result = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, stat_result.st_size, stat_result.st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, sub_directories
+
+
+@timer.timed("snapshot")
+def scan_tree(root: Path, max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, SnapshotEntry]:
+    """Stats every file under root, scanning directories in parallel, keyed by relative posix path."""
+    root_str = os.fspath(root)
+    prefix_length = len(root_str.rstrip(os.sep)) + 1
+    entries: dict[str, SnapshotEntry] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot_scan") as executor:
+        pending: set[Future] = {executor.submit(scan_directory, root_str)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, sub_directories = future.result()
+                for file_path, size, mtime_ns in files:
+                    relative_path = file_path[prefix_length:]
+                    if os.sep != "/":
+                        relative_path = relative_path.replace(os.sep, "/")
+                    entries[relative_path] = SnapshotEntry(size, mtime_ns)
+                pending.update(executor.submit(scan_directory, directory) for directory in sub_directories)
+    return entries
+
+
+def get_file_fingerprint(file_path: Path) -> str:
+    # the backup store is addressed by these, so they always use the default algorithm
+    return hashing.hash_file(file_path, hashing.DEFAULT_ALGORITHM)
+
+
+def get_backup_object_path(backup_dir: Path, fingerprint: str) -> Path:
+    return Path(backup_dir / fingerprint[:2] / fingerprint)
+
+
+def backup_file(file_path: Path, backup_dir: Path, fingerprint: str) -> None:
+    """Copies the file into the backup store once, identical files share one object."""
+    object_path = get_backup_object_path(backup_dir, fingerprint)
+    if object_path.is_file():
+        return
+    object_path.parent.mkdir(parents=True, exist_ok=True)
+    # unique per call, identical files backed up at the same time each copy to their own temp file
+    temp_path = object_path.with_name(f".{fingerprint}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        shutil.copyfile(file_path, temp_path)
+        temp_path.replace(object_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+@timer.timed("snapshot")
+def create_snapshot(
+    root: Path,
+    *,
+    backup_dir: Path | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> GameSnapshot:
+    """
+    Scans root into a snapshot. With a backup_dir every file is fingerprinted and copied into it,
+    which is what lets restore_snapshot put back modified and removed files later.
+    """
+    entries = scan_tree(root, max_workers)
+    if backup_dir is None:
+        return GameSnapshot(root=root, entries=entries)
+
+    def fingerprint_and_backup(relative_path: str) -> tuple[str, str]:
+        file_path = Path(root / relative_path)
+        fingerprint = get_file_fingerprint(file_path)
+        backup_file(file_path, backup_dir, fingerprint)
+        return relative_path, fingerprint
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot_backup") as executor:
+        for relative_path, fingerprint in executor.map(fingerprint_and_backup, entries):
+            entries[relative_path] = entries[relative_path]._replace(fingerprint=fingerprint)
+    return GameSnapshot(root=root, entries=entries)
+
+
+def write_snapshot(snapshot: GameSnapshot, snapshot_path: Path) -> None:
+    """Writes a binary manifest, or the manifest's json form when the path ends in .json."""
+    entries = [
+        manifest.ManifestEntry(
+            relative_path, entry.size, entry.mtime_ns, bytes.fromhex(entry.fingerprint) if entry.fingerprint else None,
+        )
+        for relative_path, entry in snapshot.entries.items()
+    ]
+    metadata = {"root": str(snapshot.root), "created_at": time.time()}
+    if snapshot_path.suffix.lower() != ".json":
+        manifest.write_manifest(snapshot_path, entries, metadata)
+        return
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_name(f".{snapshot_path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as file:
+        json.dump(manifest.get_manifest_json(entries, metadata), file, separators=(",", ":"))
+    temp_path.replace(snapshot_path)
+
+
+def get_snapshot_entries_from_manifest_entries(
+    manifest_entries: Iterable[manifest.ManifestEntry],
+) -> dict[str, SnapshotEntry]:
+    return {
+        entry.path: SnapshotEntry(entry.size, entry.mtime_ns, entry.digest.hex() if entry.digest else None)
+        for entry in manifest_entries
+    }
+
+
+def read_snapshot(snapshot_path: Path, root: Path) -> GameSnapshot:
+    """Reads a binary or json manifest, or the plain list of absolute paths older versions wrote."""
+    if manifest.is_manifest_file(snapshot_path):
+        snapshot_manifest = manifest.read_manifest(snapshot_path)
+        return GameSnapshot(root=root, entries=get_snapshot_entries_from_manifest_entries(snapshot_manifest.iter_entries()))
+    with snapshot_path.open(encoding="utf-8") as file:
+        snapshot_json = json.load(file)
+    if isinstance(snapshot_json, list):
+        root_prefix = f"{Path(root).as_posix().rstrip('/')}/"
+        entries = {}
+        for file_path in snapshot_json:
+            posix_path = Path(file_path).as_posix()
+            if posix_path.startswith(root_prefix):
+                entries[posix_path[len(root_prefix):]] = SnapshotEntry(-1, -1)
+        return GameSnapshot(root=root, entries=entries)
+    manifest_entries, _ = manifest.manifest_entries_from_json(snapshot_json)
+    return GameSnapshot(root=root, entries=get_snapshot_entries_from_manifest_entries(manifest_entries))
+
+
+def diff_snapshot(snapshot: GameSnapshot, current_entries: dict[str, SnapshotEntry]) -> SnapshotDiff:
+    snapshot_entries = snapshot.entries
+    diff = SnapshotDiff(
+        added=sorted(current_entries.keys() - snapshot_entries.keys()),
+        removed=sorted(snapshot_entries.keys() - current_entries.keys()),
+    )
+    for relative_path in current_entries.keys() & snapshot_entries.keys():
+        old_entry = snapshot_entries[relative_path]
+        if old_entry.size < 0:
+            continue
+        new_entry = current_entries[relative_path]
+        if old_entry.size != new_entry.size or old_entry.mtime_ns != new_entry.mtime_ns:
+            diff.modified.append(relative_path)
+    diff.modified.sort()
+    return diff
+
+
+def delete_files(file_paths: list[Path], max_workers: int = DEFAULT_MAX_WORKERS) -> int:
+    def delete_file(file_path: Path) -> bool:
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot_delete") as executor:
+        return sum(executor.map(delete_file, file_paths))
+
+
+def remove_empty_added_directories(root: Path, snapshot: GameSnapshot, added: list[str]) -> None:
+    """Removes directories left empty by deleting added files, deepest first, unless the snapshot had them."""
+    kept_directories = {str(Path(relative_path).parent) for relative_path in snapshot.entries}
+    candidate_directories = set()
+    for relative_path in added:
+        parent = Path(relative_path).parent
+        while str(parent) not in kept_directories and parent != Path():
+            candidate_directories.add(parent)
+            parent = parent.parent
+    for directory in sorted(candidate_directories, key=lambda path: len(path.parts), reverse=True):
+        try:
+            Path(root / directory).rmdir()
+        except OSError:
+            continue
+
+
+def restore_file(root: Path, relative_path: str, entry: SnapshotEntry, backup_dir: Path | None) -> bool:
+    if entry.fingerprint is None or backup_dir is None:
+        return False
+    object_path = get_backup_object_path(backup_dir, entry.fingerprint)
+    if not object_path.is_file():
+        return False
+    file_path = Path(root / relative_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(f".{file_path.name}.restore.tmp")
+    shutil.copyfile(object_path, temp_path)
+    temp_path.replace(file_path)
+    # matching the snapshot mtime keeps the next restore from treating the file as modified again
+    os.utime(file_path, ns=(entry.mtime_ns, entry.mtime_ns))
+    return True
+
+
+@timer.timed("snapshot")
+def restore_snapshot(
+    root: Path,
+    snapshot_path: Path,
+    *,
+    backup_dir: Path | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> SnapshotDiff:
+    """
+    Returns root to the state in the snapshot: added files are deleted, and modified or removed
+    files are restored from backup_dir when the snapshot was taken with one.
+    """
+    snapshot = read_snapshot(snapshot_path, root)
+    diff = diff_snapshot(snapshot, scan_tree(root, max_workers))
+
+    deleted_count = delete_files([Path(root / relative_path) for relative_path in diff.added], max_workers)
+    remove_empty_added_directories(root, snapshot, diff.added)
+    logger.log_message(f"Snapshot: deleted {deleted_count} added files")
+
+    to_restore = [*diff.modified, *diff.removed]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="snapshot_restore") as executor:
+        restored = list(
+            executor.map(
+                lambda relative_path: restore_file(root, relative_path, snapshot.entries[relative_path], backup_dir),
+                to_restore,
+            ),
+        )
+    not_restored = [relative_path for relative_path, was_restored in zip(to_restore, restored, strict=True) if not was_restored]
+    logger.log_message(f"Snapshot: restored {len(to_restore) - len(not_restored)} modified or removed files")
+    for relative_path in not_restored:
+        logger.log_message(f'Warning: Snapshot: no backup to restore "{relative_path}" from')
+    return diff
@@ -0,0 +1,108 @@
+"""
+File hashing shared by staging, snapshots, backups and the artifact cache.
+
+Files are read with a large reused buffer, or mapped when they are big enough for that to pay off,
+and batches are hashed on a thread pool, which runs in parallel because hashlib releases the GIL
+while it hashes large buffers.
+
+blake2b is the default and what anything persisted uses, so digests stay comparable between machines.
+get_fast_algorithm() is for comparisons within one run, it is xxh3 when the optional xxhash package is installed.
+"""
+
+import os
+import mmap
+import hashlib
+import functools
+from pathlib import Path
+from typing import Protocol
+from collections.abc import Buffer, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from tempo_core import timer
+
+DEFAULT_ALGORITHM = "blake2b"
+# 160 bits is plenty for change detection and keeps stored digests short
+BLAKE2B_DIGEST_SIZE = 20
+
+READ_BUFFER_SIZE = 1024 * 1024
+# below this a buffered read is as fast as setting up a mapping
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# hashing waits on the disk as much as the interpreter, so more threads than cores pays off
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@functools.cache
+def get_fast_algorithm() -> str:
+    """xxh3 when the optional xxhash package is installed, blake2b otherwise. Only for comparisons within one run."""
+    try:
+        import xxhash  # noqa: F401  # ty: ignore
+    except ImportError:
+        return DEFAULT_ALGORITHM
+    return "xxh3_128"
+
+
+class Hasher(Protocol):
+    """What hashlib and xxhash hashers have in common, all the hashing here needs."""
+
+    def update(self, data: Buffer, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+def new_hasher(algorithm: str = DEFAULT_ALGORITHM) -> Hasher:
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=BLAKE2B_DIGEST_SIZE)
+    if algorithm in {"xxh3_64", "xxh3_128"}:
+        import xxhash  # ty: ignore
+
+        return getattr(xxhash, algorithm)()
+    if algorithm in hashlib.algorithms_available:
+        return hashlib.new(algorithm)
+    unknown_algorithm_error = f'Unknown hash algorithm "{algorithm}"'
+    raise ValueError(unknown_algorithm_error)
+
+
+def hash_bytes(data: bytes, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    hasher = new_hasher(algorithm)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def read_file_digest(file_path: Path, algorithm: str) -> tuple[str, int]:
+    hasher = new_hasher(algorithm)
+    with file_path.open("rb") as file:
+        file_size = os.fstat(file.fileno()).st_size
+        if file_size >= MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                hasher.update(mapped_file)
+        else:
+            buffer = bytearray(min(READ_BUFFER_SIZE, max(file_size, 1)))
+            buffer_view = memoryview(buffer)
+            while read_size := file.readinto(buffer):
+                hasher.update(buffer_view[:read_size])
+    return hasher.hexdigest(), file_size
+
+
+def hash_file(file_path: Path, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    digest, file_size = read_file_digest(file_path, algorithm)
+    timer.add_bytes_processed(file_size)
+    return digest
+
+
+@timer.timed("hashing")
+def hash_files(
+    file_paths: Iterable[Path],
+    algorithm: str = DEFAULT_ALGORITHM,
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> dict[Path, str]:
+    """Hashes the files in parallel and returns their digests by path, raising the first error hit."""
+    file_paths = list(dict.fromkeys(file_paths))
+    if not file_paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths)), thread_name_prefix="hashing") as executor:
+        results = list(executor.map(lambda file_path: read_file_digest(file_path, algorithm), file_paths))
+    # bytes are counted here, the worker threads have no span of their own to count them against
+    timer.add_bytes_processed(sum(file_size for _, file_size in results))
+    return {file_path: digest for file_path, (digest, _) in zip(file_paths, results, strict=True)}
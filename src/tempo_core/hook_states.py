@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable
+import functools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
 from tempo_core import (
     app_runner,
     logger,
     process_management,
+    session,
     settings,
     timer,
     window_management,
@@ -24,97 +27,187 @@ class HookStateInfo:
     hook_state: HookStateType
 
 
-hook_state_info = HookStateInfo(HookStateType.PRE_INIT)
+def new_hook_state_info() -> HookStateInfo:
+    return HookStateInfo(HookStateType.PRE_INIT)
 
 
-def exec_events_checks(hook_state_type: HookStateType) -> None:
-    exec_events = settings.get_exec_events()
-    for exec_event in exec_events:
-        value = exec_event["hook_state"]
-        exe_state = get_enum_from_val(HookStateType, value)
-        if exe_state == hook_state_type:
-            exe_path = exec_event["alt_exe_path"]
-            exe_args = exec_event["variable_args"]
-            exe_exec_mode = get_enum_from_val(
-                ExecutionMode, exec_event["execution_mode"],
-            )
-            if exe_exec_mode:
-                app_runner.run_app(exe_path, exe_exec_mode, exe_args)
-            else:
-                exe_exec_error = "exe_exec_mode returned none"
-                raise RuntimeError(exe_exec_error)
+if TYPE_CHECKING:
+    hook_state_info: HookStateInfo
+    hook_dispatch_table: HookDispatchTable
 
 
-def is_hook_state_used(state: HookStateType) -> bool:
-    if isinstance(settings.settings_information.settings, dict):
-        if "process_kill_events" in settings.settings_information.settings:
-            process_kill_events = settings.settings_information.settings.get(
-                "process_kill_events", {},
-            )
-            if "processes" in process_kill_events:
-                for process in process_kill_events["processes"]:
-                    if process.get("hook_state") == state.value:
-                        return True
+def __getattr__(name: str) -> object:
+    # keeps hook_states.hook_state_info and hook_dispatch_table working, they are the current session's
+    if name in {"hook_state_info", "hook_dispatch_table"}:
+        return getattr(session.get_current_session(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass
+class ProcessKillEvent:
+    process_name: str
+    use_substring_check: bool
+
+
+@dataclass
+class WindowEvent:
+    window_name: str
+    use_substring_check: bool
+    window_action: WindowAction
+    position: tuple[int, int] | None
+    resolution: tuple[int, int] | None
 
-        if "window_management_events" in settings.settings_information.settings:
-            for window in settings.get_window_management_events():
-                if window.get("hook_state") == state.value:
-                    return True
 
-        if "exec_events" in settings.settings_information.settings:
-            for method in settings.get_exec_events():
-                if method.get("hook_state") == state.value:
-                    return True
+@dataclass
+class ExecEvent:
+    exe_path: Path
+    args: list[str]
+    execution_mode: ExecutionMode
+
 
-    return False
+@dataclass
+class HookStateEvents:
+    process_kill_events: list[ProcessKillEvent] = field(default_factory=list)
+    window_events: list[WindowEvent] = field(default_factory=list)
+    exec_events: list[ExecEvent] = field(default_factory=list)
+
+
+@dataclass
+class HookDispatchTable:
+    events: dict[HookStateType, HookStateEvents]
+    # the settings dict the table was compiled from, a different object means the settings were reloaded
+    source_settings: object
+
+
+def new_hook_dispatch_table() -> HookDispatchTable:
+    return HookDispatchTable(events={}, source_settings=None)
+
+
+def compile_window_event(window_settings: dict) -> WindowEvent:
+    window_action = get_enum_from_val(WindowAction, window_settings["window_behaviour"])
+    position = None
+    resolution = None
+    if window_action == WindowAction.MOVE:
+        position = (window_settings["position"]["x"], window_settings["position"]["y"])
+        resolution = (window_settings["resolution"]["width"], window_settings["resolution"]["height"])
+    return WindowEvent(
+        window_name=window_settings["window_name"],
+        use_substring_check=window_settings["use_substring_check"],
+        window_action=window_action,
+        position=position,
+        resolution=resolution,
+    )
+
+
+def compile_hook_events(raw_settings: dict) -> dict[HookStateType, HookStateEvents]:
+    """
+    Groups every process kill, window and exec event from the settings by hook state.
+    Enum strings are parsed here, so a bad value fails when settings load instead of mid run.
+    """
+    events: dict[HookStateType, HookStateEvents] = {}
+
+    def get_events(hook_state_value: str) -> HookStateEvents:
+        return events.setdefault(get_enum_from_val(HookStateType, hook_state_value), HookStateEvents())
+
+    for process in raw_settings.get("process_kill_events", {}).get("processes", []):
+        get_events(process["hook_state"]).process_kill_events.append(
+            ProcessKillEvent(
+                process_name=process["process_name"],
+                use_substring_check=process.get("use_substring_check", False),
+            ),
+        )
+
+    for window_settings in raw_settings.get("window_management_events", []):
+        get_events(window_settings["hook_state"]).window_events.append(
+            compile_window_event(window_settings),
+        )
+
+    for exec_event in raw_settings.get("exec_events", []):
+        get_events(exec_event["hook_state"]).exec_events.append(
+            ExecEvent(
+                exe_path=Path(exec_event["alt_exe_path"]),
+                args=exec_event["variable_args"],
+                execution_mode=get_enum_from_val(ExecutionMode, exec_event["execution_mode"]),
+            ),
+        )
+
+    return events
+
+
+def compile_hook_dispatch_table() -> HookDispatchTable:
+    raw_settings = settings.settings_information.settings
+    events = compile_hook_events(raw_settings) if isinstance(raw_settings, dict) else {}
+    # swapped in whole, so a reader on another thread never sees a half compiled table
+    hook_dispatch_table = HookDispatchTable(events=events, source_settings=raw_settings)
+    session.get_current_session().set_state("hook_dispatch_table", hook_dispatch_table)
+    return hook_dispatch_table
+
+
+def get_hook_state_events(hook_state: HookStateType) -> HookStateEvents | None:
+    hook_dispatch_table = session.get_current_session().hook_dispatch_table
+    if hook_dispatch_table.source_settings is not settings.settings_information.settings:
+        hook_dispatch_table = compile_hook_dispatch_table()
+    return hook_dispatch_table.events.get(hook_state)
+
+
+def exec_events_checks(hook_state_type: HookStateType) -> None:
+    hook_state_events = get_hook_state_events(hook_state_type)
+    if not hook_state_events:
+        return
+    for exec_event in hook_state_events.exec_events:
+        app_runner.run_app(exec_event.exe_path, exec_event.execution_mode, exec_event.args)
+
+
+def is_hook_state_used(state: HookStateType) -> bool:
+    return get_hook_state_events(state) is not None
 
 
 def window_checks(current_state: HookStateType) -> None:
-    window_settings_list = settings.get_window_management_events()
-    for window_settings in window_settings_list:
-        settings_state = get_enum_from_val(HookStateType, window_settings["hook_state"])
-        if settings_state == current_state:
-            title = window_settings["window_name"]
-            windows_to_change = window_management.get_windows_by_title(
-                title, use_substring_check=window_settings["use_substring_check"],
-            )
-            for window_to_change in windows_to_change: # ty: ignore
-                way_to_change_window = get_enum_from_val(
-                    WindowAction, window_settings["window_behaviour"],
+    hook_state_events = get_hook_state_events(current_state)
+    if not hook_state_events:
+        return
+    for window_event in hook_state_events.window_events:
+        windows_to_change = window_management.get_windows_by_title(
+            window_event.window_name, use_substring_check=window_event.use_substring_check,
+        )
+        for window_to_change in windows_to_change: # ty: ignore
+            if window_event.window_action == WindowAction.MAX:
+                window_management.maximize_window(window_to_change)
+            elif window_event.window_action == WindowAction.MIN:
+                window_management.minimize_window(window_to_change)
+            elif window_event.window_action == WindowAction.CLOSE:
+                window_management.close_window(window_to_change)
+            elif window_event.window_action == WindowAction.MOVE:
+                window_management.move_window(
+                    window_to_change,
+                    *window_event.position, # ty: ignore
+                    *window_event.resolution, # ty: ignore
+                )
+            else:
+                logger.log_message(
+                    "Monitor: invalid window behavior specified in settings",
                 )
-                if way_to_change_window == WindowAction.MAX:
-                    window_management.maximize_window(window_to_change)
-                elif way_to_change_window == WindowAction.MIN:
-                    window_management.minimize_window(window_to_change)
-                elif way_to_change_window == WindowAction.CLOSE:
-                    window_management.close_window(window_to_change)
-                elif way_to_change_window == WindowAction.MOVE:
-                    window_management.move_window(
-                        window_to_change,
-                        window_settings["position"]["x"],
-                        window_settings["position"]["y"],
-                        window_settings["resolution"]["width"],
-                        window_settings["resolution"]["height"],
-                    )
-                else:
-                    logger.log_message(
-                        "Monitor: invalid window behavior specified in settings",
-                    )
 
 
 def hook_state_checks(hook_state: HookStateType) -> None:
+    hook_state_events = get_hook_state_events(hook_state)
+    # unused states, including the frequently ticked constant state, return before logging anything
+    if not hook_state_events:
+        return
     if hook_state != HookStateType.CONSTANT:
         logger.log_message(f"Hook State Check: {hook_state} is running")
-    if is_hook_state_used(hook_state):
-        process_management.kill_processes(hook_state)
+    if hook_state_events.process_kill_events:
+        process_management.kill_process_events(hook_state_events.process_kill_events)
+    if hook_state_events.window_events:
         window_checks(hook_state)
+    if hook_state_events.exec_events:
         exec_events_checks(hook_state)
     if hook_state != HookStateType.CONSTANT:
         logger.log_message(f"Hook State Check: {hook_state} finished")
 
 
 def set_hook_state(new_state: HookStateType) -> None:
-    hook_state_info.hook_state = new_state
+    session.get_current_session().hook_state_info.hook_state = new_state
     logger.log_message(f"Hook State: changed to {new_state}")
     # calling this on preinit causes problems so will avoid for now
     if new_state != HookStateType.PRE_INIT:
@@ -137,11 +230,15 @@ def hook_state_decorator(
     end_hook_state_type: HookStateType | None = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        span_name = getattr(function, "__name__", repr(function))
+
+        @functools.wraps(function)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            set_hook_state(start_hook_state_type)
-            result = function(*args, **kwargs)
-            if end_hook_state_type is not None:
-                set_hook_state(end_hook_state_type)
+            with timer.span(span_name, category="hook_state"):
+                set_hook_state(start_hook_state_type)
+                result = function(*args, **kwargs)
+                if end_hook_state_type is not None:
+                    set_hook_state(end_hook_state_type)
             return result
 
         return wrapper
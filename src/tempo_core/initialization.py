@@ -1,5 +1,5 @@
 import sys
-import shutil
+import atexit
 from pathlib import Path
 
 from tempo_core import (
@@ -7,9 +7,12 @@ from tempo_core import (
     file_io,
     logger,
     main_logic,
+    manager,
     settings,
+    timer,
     wrapper,
     packing,
+    workspace,
 )
 from tempo_core.programs import unreal_engine
 from tempo_core import online_check, env
@@ -131,12 +134,8 @@ def game_exe_check() -> None:
 
 
 def clear_temp_dir() -> None:
-    temp_dir = settings.get_temp_directory()
-    if temp_dir.is_dir():
-        try:
-            shutil.rmtree(temp_dir)
-        except OSError as e:
-            logger.log_message(f'Warning: Failed to remove temp directory {temp_dir}: {e}')
+    # finished runs' workspaces are swapped out and deleted in the background instead of blocking startup
+    workspace.clear_workspace()
 
 
 has_inited_already = False
@@ -166,11 +165,19 @@ def initialization(reinit_if_applicable: bool = False) -> None:
 
     customization.enable_vt100()
 
-    if not online_check.has_checked_online_status:
-        online_check.init_is_online()
+    if not has_inited_already and "--disable-timing-report" not in sys.argv:
+        atexit.register(timer.write_run_timing_report)
 
     check_generate_wrapper()
     check_settings()
+
+    # started once settings have loaded, the cached result lives in the cache dir the config can override
+    if not online_check.has_checked_online_status:
+        online_check.init_is_online()
+
+    if settings.settings_information.init_settings_done:
+        # tool installs overlap with the init checks below instead of stalling the first pack
+        manager.prefetch_tools_for_enabled_mods()
     packing.populate_queue_information()
 
     main_logic.init_thread_system()
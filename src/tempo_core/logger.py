@@ -2,11 +2,12 @@ import os
 import sys
 import textwrap
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections.abc import Callable
 from datetime import datetime
 from shutil import get_terminal_size
 
-from tempo_core.console import console
+from tempo_core.console import get_console
 from tempo_core.log_info import LOG_INFO
 
 
@@ -27,6 +28,9 @@ class LogInformation:
     log_base_dir: Path
     log_prefix: str
     has_configured_logging: bool
+    # every run writes its own log file, so concurrent runs sharing a log dir never touch each other's
+    run_stamp: str = field(default_factory=lambda: f"{datetime.now().strftime('%m_%d_%Y_%H%M_%S')}_{os.getpid()}")
+    log_listeners: list[Callable[[str], None]] = field(default_factory=list)
 
 
 log_information = LogInformation(
@@ -40,6 +44,10 @@ def set_log_base_dir(base_dir: Path) -> None:
     log_information.log_base_dir = base_dir
 
 
+def get_log_file_path() -> Path:
+    return Path(log_information.log_base_dir / f"{log_information.log_prefix}_{log_information.run_stamp}.log")
+
+
 def configure_logging(
     log_name_prefix: str = get_default_log_name_prefix(),
 ) -> None:
@@ -49,35 +57,23 @@ def configure_logging(
     if not log_dir.is_dir():
         log_dir.mkdir(parents=True, exist_ok=True)
 
-    rename_latest_log(log_dir)
     log_information.has_configured_logging = True
 
 
-def rename_latest_log(log_dir: Path) -> None:
-    latest_log_path = Path(log_dir / f"{log_information.log_prefix}_latest.log")
-    if latest_log_path.is_file():
-        try:
-            timestamp = datetime.now().strftime("%m_%d_%Y_%H%M_%S")
-            new_name = f"{log_information.log_prefix}_{timestamp}.log"
-            new_log_path = Path(log_dir / new_name)
-
-            # Ensure the new log file name is unique
-            counter = 1
-            while new_log_path.is_file():
-                new_name = f"{log_information.log_prefix}_{timestamp}_({counter}).log"
-                new_log_path = Path(log_dir / new_name)
-                counter += 1
+def add_log_listener(listener: Callable[[str], None]) -> None:
+    log_information.log_listeners.append(listener)
 
-            latest_log_path.rename(new_log_path)
 
-        except PermissionError as e:
-            log_message(f"Error renaming log file: {e}")
-            return
+def remove_log_listener(listener: Callable[[str], None]) -> None:
+    if listener in log_information.log_listeners:
+        log_information.log_listeners.remove(listener)
 
 
 def log_message(message: str | Path) -> None:
     if isinstance(message, Path):
         message = str(message)
+    for listener in log_information.log_listeners:
+        listener(message)
     if log_information.has_configured_logging:
         color_options = LOG_INFO.get("theme_colors", {})
         default_background_color = LOG_INFO.get("background_color", (40, 42, 54))
@@ -91,7 +87,7 @@ def log_message(message: str | Path) -> None:
 
         for original_line in lines:
             if not original_line.strip():
-                console.print(
+                get_console().print(
                     "".ljust(terminal_width),
                     style=f"{default_text_color} on {default_background_color}",
                     markup=False,
@@ -106,14 +102,14 @@ def log_message(message: str | Path) -> None:
                 for keyword, color in color_options.items(): # ty: ignore
                     if keyword in original_line:
                         rgb_color = f"rgb({color[0]},{color[1]},{color[2]})"
-                        console.print(
+                        get_console().print(
                             padded_line,
                             style=f"{rgb_color} on {default_background_color}",
                             markup=False,
                         )
                         break
                 else:
-                    console.print(
+                    get_console().print(
                         padded_line,
                         style=f"{default_text_color} on {default_background_color}",
                         markup=False,
@@ -121,7 +117,7 @@ def log_message(message: str | Path) -> None:
 
 
         log_dir = Path(log_information.log_base_dir)
-        log_path = Path(log_dir / f"{log_information.log_prefix}_latest.log")
+        log_path = get_log_file_path()
 
         if not log_dir.is_dir():
             if not get_is_log_file_use_disabled():
@@ -135,7 +131,7 @@ def log_message(message: str | Path) -> None:
             except OSError as e:
                 error_color = LOG_INFO.get("error_color", (255, 0, 0))
                 error_color = f"rgb({error_color[0]},{error_color[1]},{error_color[2]})" # ty: ignore
-                console.print(
+                get_console().print(
                     f"Failed to create log file: {e}",
                     style=f"{error_color} on {default_background_color}",
                     markup=False,
@@ -149,7 +145,7 @@ def log_message(message: str | Path) -> None:
         except OSError as e:
             error_color = LOG_INFO.get("error_color", (255, 0, 0))
             error_color = f"rgb({error_color[0]},{error_color[1]},{error_color[2]})" # ty: ignore
-            console.print(
+            get_console().print(
                 f"Failed to write to log file: {e}",
                 style=f"{error_color} on {default_background_color}",
                 markup=False,
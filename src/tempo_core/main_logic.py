@@ -9,23 +9,29 @@ from typing import TypeAlias
 
 from tempo_core import (
     app_runner,
+    artifact_cache,
+    cleanup,
+    collection_resolver,
     data_structures,
     engine,
     file_io,
     game_runner,
+    game_snapshot,
     hook_states,
     logger,
     packing,
     process_management,
     settings,
+    timer,
     utilities,
     online_check,
     manager,
+    process_accounting,
+    watch,
 )
 from tempo_core.programs import unreal_engine
 from tempo_core.threads import constant, game_monitor
 
-from tempo_binary_tools import spaghetti, stove, uasset_gui, umodel, fmodel, kismet_analyzer
 
 
 @hook_states.hook_state_decorator(
@@ -121,25 +127,19 @@ def full_run_all(
 
 
 def install_spaghetti(run_after_install: bool) -> None:
-    tool_info = spaghetti.SpaghettiToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("spaghetti")
     if run_after_install:
         app_runner.run_app(tool_path)
 
 
 def install_stove(run_after_install: bool) -> None:
-    tool_info = stove.StoveToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("stove")
     if run_after_install:
         app_runner.run_app(tool_path)
 
 
 def install_kismet_analyzer(run_after_install: bool) -> None:
-    tool_info = kismet_analyzer.KismetAnalyzerToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("kismet_analyzer")
     if run_after_install:
         subprocess.Popen(
             f'start cmd /k "{tool_path}"" -h',
@@ -149,18 +149,49 @@ def install_kismet_analyzer(run_after_install: bool) -> None:
 
 
 def install_uasset_gui(run_after_install: bool) -> None:
-    tool_info = uasset_gui.UassetGuiToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("uasset_gui")
     if run_after_install:
         app_runner.run_app(tool_path)
 
 
 def open_latest_log() -> None:
-    file_to_open = Path(f"{logger.log_information.log_base_dir}/{logger.log_information.log_prefix}_latest.log")
+    file_to_open = logger.get_log_file_path()
     file_io.open_file_in_default(file_to_open)
 
 
+def generate_process_history_report(
+    slowdown_threshold_percent: float = 25.0,
+    baseline_run_count: int = 10,
+) -> list[process_accounting.ProcessTrend]:
+    trends = []
+    for tool_name in process_accounting.get_process_history_tool_names():
+        trend = process_accounting.get_process_trend(
+            tool_name,
+            baseline_run_count=baseline_run_count,
+            slowdown_threshold_percent=slowdown_threshold_percent,
+        )
+        if not trend:
+            continue
+        trends.append(trend)
+        latest = trend.latest
+        logger.log_message(
+            f"Process History: {tool_name}: {trend.run_count} recent runs, latest {latest.wall_seconds:.2f}s wall, "
+            f"{latest.user_cpu_seconds + latest.system_cpu_seconds:.2f}s cpu, "
+            f"{latest.peak_rss_bytes / (1024 * 1024):.1f} MiB peak rss",
+        )
+        if trend.baseline_wall_seconds is not None and trend.slowdown_percent is not None:
+            logger.log_message(
+                f"Process History: {tool_name}: baseline {trend.baseline_wall_seconds:.2f}s, "
+                f"change {trend.slowdown_percent:+.1f}%",
+            )
+        if trend.is_regression:
+            logger.log_message(
+                f"Warning: {tool_name} latest run was more than {slowdown_threshold_percent}% slower than the "
+                f"median of the previous {baseline_run_count} successful runs",
+            )
+    return trends
+
+
 def run_game(*, toggle_engine: bool) -> None:
     if toggle_engine:
         engine.toggle_engine_off()
@@ -186,17 +217,13 @@ def close_engine() -> None:
 
 
 def install_umodel(run_after_install: bool) -> None:
-    tool_info = umodel.UmodelToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("umodel")
     if run_after_install:
         app_runner.run_app(tool_path)
 
 
 def install_fmodel(run_after_install: bool) -> None:
-    tool_info = fmodel.FmodelToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("fmodel")
     if run_after_install:
         app_runner.run_app(tool_path)
 
@@ -520,7 +547,7 @@ def cleanup_full() -> None:
     logger.log_message(f'Cleaned up temp dir at: "{temp_dir}"')
 
 
-def cleanup_cooked() -> None:
+def cleanup_cooked(*, dry_run: bool = False) -> None:
     repo_path = settings.get_cleanup_repo_path()
     if not repo_path:
         raise FileNotFoundError('was unable to find the repo path for cleanup')
@@ -529,17 +556,27 @@ def cleanup_cooked() -> None:
         f'Starting cleanup of Unreal Engine build directories in: "{repo_path}"',
     )
 
-    build_dirs = ["Cooked"]
+    build_dirs = {"Cooked"}
 
-    for root, dirs, _ in repo_path.walk():
-        for dir_name in dirs:
-            if dir_name in build_dirs:
-                full_path = Path(root / dir_name)
-                shutil.rmtree(full_path)
-                logger.log_message(f"Removed directory: {full_path}")
+    cleanup.cleanup_directories(repo_path, build_dirs, dry_run=dry_run)
 
 
-def cleanup_build() -> None:
+def cache_stats() -> None:
+    stats = artifact_cache.get_cache_stats()
+    logger.log_message(f'Artifact cache at: "{stats.cache_dir}"')
+    logger.log_message(
+        f"Artifact cache: {stats.entry_count} entries, "
+        f"{stats.total_size / (1024 * 1024):.1f} MiB of a {stats.quota / (1024 * 1024):.0f} MiB quota",
+    )
+
+
+def cache_prune(*, max_size_mb: float | None = None) -> None:
+    max_bytes = None if max_size_mb is None else int(max_size_mb * 1024 * 1024)
+    freed_size = artifact_cache.prune_cache(max_bytes)
+    logger.log_message(f"Artifact cache: pruned {freed_size / (1024 * 1024):.1f} MiB")
+
+
+def cleanup_build(*, dry_run: bool = False) -> None:
     repo_path = settings.get_cleanup_repo_path()
     if not repo_path:
         raise FileNotFoundError('was unable to find the repo path for cleanup')
@@ -548,45 +585,51 @@ def cleanup_build() -> None:
         f'Starting cleanup of Unreal Engine build directories in: "{repo_path}"',
     )
 
-    build_dirs = [
+    build_dirs = {
         "Intermediate",
         "DerivedDataCache",
         "Build",
         "Binaries",
-    ]
+    }
 
-    for root, dirs, _ in repo_path.walk():
-        for dir_name in dirs:
-            if dir_name in build_dirs:
-                full_path = Path(root / dir_name)
-                shutil.rmtree(full_path)
-                logger.log_message(f"Removed directory: {full_path}")
+    cleanup.cleanup_directories(repo_path, build_dirs, dry_run=dry_run)
 
 
-def cleanup_game(output_json: Path | None = None) -> None:
+def get_game_file_list_json_path(output_json: Path | None, *, for_reading: bool = False) -> Path:
     if output_json:
-        file_list_json = output_json
-    else:
-        config_file_dir = settings.settings_information.config_file_dir.path
-        if not config_file_dir:
-            raise NotADirectoryError('could not obtain your settings json directory')
-        file_list_json = Path(config_file_dir / "game_file_list.json")
+        return output_json
+    config_file_dir = settings.settings_information.config_file_dir.path
+    if not config_file_dir:
+        raise NotADirectoryError('could not obtain your settings json directory')
+    file_list_path = Path(config_file_dir / "game_file_list.manifest")
+    legacy_file_list_path = Path(config_file_dir / "game_file_list.json")
+    # lists made before the binary manifest are still used until a new one is generated
+    if for_reading and not file_list_path.is_file() and legacy_file_list_path.is_file():
+        return legacy_file_list_path
+    return file_list_path
+
+
+def get_game_backup_directory() -> Path:
+    return Path(settings.get_cache_directory() / "game_backup")
+
+
+def cleanup_game(output_json: Path | None = None) -> None:
+    file_list_json = get_game_file_list_json_path(output_json, for_reading=True)
     custom_game_dir = utilities.get_game_dir_or_raise()
     game_directory = custom_game_dir.parent
-    delete_unlisted_files(game_directory, file_list_json)
+    delete_unlisted_files(game_directory, file_list_json, backup_dir=get_game_backup_directory())
 
 
-def generate_game_file_list_json(output_json: Path | None = None) -> None:
-    if output_json:
-        file_list_json = output_json
-    else:
-        config_file_dir = settings.settings_information.config_file_dir.path
-        if not config_file_dir:
-            raise NotADirectoryError('was unable to obtain the settings json directory')
-        file_list_json = Path(config_file_dir / "game_file_list.json")
+def generate_game_file_list_json(output_json: Path | None = None, *, backup_originals: bool = False) -> None:
+    """With backup_originals, files are also backed up so cleanup_game can undo modifications, not just additions."""
+    file_list_json = get_game_file_list_json_path(output_json)
     custom_game_dir = utilities.get_game_dir_or_raise()
     game_directory = custom_game_dir.parent
-    generate_file_paths_json(game_directory, file_list_json)
+    generate_file_paths_json(
+        game_directory,
+        file_list_json,
+        backup_dir=get_game_backup_directory() if backup_originals else None,
+    )
 
 
 def cleanup_from_file_list(file_list_path: Path, directory: Path) -> None:
@@ -609,6 +652,18 @@ def generate_mods_all(*, use_symlinks: bool) -> None:
     packing.generate_mods(use_symlinks=use_symlinks)
 
 
+def watch_mods(*, input_mod_names: list[str], use_symlinks: bool) -> None:
+    settings.settings_information.mod_names.update(input_mod_names)
+    atleast_one_enabled_mod_check()
+    watch.watch_mods(use_symlinks=use_symlinks)
+
+
+def watch_mods_all(*, use_symlinks: bool) -> None:
+    settings.settings_information.mod_names.update(settings.get_mods_info_dict_from_json().keys())
+    atleast_one_enabled_mod_check()
+    watch.watch_mods(use_symlinks=use_symlinks)
+
+
 # doesn't account for when there are ucas/utoc to copy over
 def make_unreal_pak_mod_release(
     singular_mod_info: dict, base_files_directory: Path, output_directory: Path, mod_name: str,
@@ -693,8 +748,7 @@ def get_mod_files_asset_paths_for_loose_mods(
     cooked_uproject_dir = unreal_engine.get_cooked_uproject_dir(
         uproject_file, unreal_engine_dir,
     )
-    mod_info = packing.get_mod_pak_entry(mod_name)
-    for asset in mod_info.get("file_includes", {}).get("asset_paths", []):
+    for asset in collection_resolver.get_mod_asset_paths(mod_name):
         base_path = f"{cooked_uproject_dir}/{asset}"
         for extension in file_io.get_file_extensions(base_path):
             src_file = Path(f"{base_path}.{extension}")
@@ -832,6 +886,7 @@ def make_retoc_mod_release(
     )
 
 
+@timer.timed("release")
 def generate_mod_release(
     mod_name: str, base_files_directory: Path, output_directory: Path,
 ) -> None:
@@ -1164,34 +1219,18 @@ def remove_uplugins(uplugin_paths: list) -> None:
             shutil.rmtree(uplugin_dir)
 
 
-def generate_file_paths_json(dir_path: Path, output_json: Path) -> None:
-    all_file_paths = []
-
-    for root, _, files in dir_path.walk():
-        for file in files:
-            full_path = Path(root / file)
-            all_file_paths.append(full_path)
-
-    json_string = json.dumps(all_file_paths)
-    output_json.parent.mkdir(parents=True, exist_ok=True)
-    with output_json.open("w", encoding="utf-8") as json_file:
-        json_file.write(json_string)
-
-    logger.log_message(f"JSON file with all file paths created at: {output_json}")
+def generate_file_paths_json(dir_path: Path, output_json: Path, *, backup_dir: Path | None = None) -> None:
+    snapshot = game_snapshot.create_snapshot(dir_path, backup_dir=backup_dir)
+    game_snapshot.write_snapshot(snapshot, output_json)
+    logger.log_message(f"Snapshot of {len(snapshot.entries)} files created at: {output_json}")
 
 
-def delete_unlisted_files(dir_path: Path, json_file: Path) -> None:
-    with json_file.open() as file:
-        allowed_files = set(json.load(file))
-
-    for root, _, files in dir_path.walk():
-        for file in files:
-            full_path = Path(root / file)
-            if full_path not in allowed_files:
-                full_path.unlink()
-                logger.log_message(f"Deleted: {full_path}")
-
-    logger.log_message("Cleanup complete. All unlisted files have been removed.")
+def delete_unlisted_files(dir_path: Path, json_file: Path, *, backup_dir: Path | None = None) -> None:
+    diff = game_snapshot.restore_snapshot(dir_path, json_file, backup_dir=backup_dir)
+    logger.log_message(
+        f"Cleanup complete. {len(diff.added)} added, {len(diff.modified)} modified "
+        f"and {len(diff.removed)} removed files were handled.",
+    )
 
 
 def save_json_to_file(json_string: str, file_path: Path) -> None:
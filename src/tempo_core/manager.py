@@ -1,11 +1,217 @@
-from tempo_binary_tool_manager import manager
+from __future__ import annotations
 
-from tempo_core import logger, settings
+import os
+import json
+import threading
+import importlib
+from pathlib import Path
+from dataclasses import dataclass
+from importlib import metadata
+from typing import TYPE_CHECKING
 
+from tempo_core import file_io, file_locks, logger, session, settings, timer
+from tempo_core.data_structures import PackingType
 
-tools_cache = manager.ToolsCache(
-    main_tool_author='Tempo-Organization',
-    main_tool_name='tempo',
-    logging_function=logger.log_message,
-    cache_path=settings.settings_information.settings.get("cache", {}).get("cache_dir", None),
+if TYPE_CHECKING:
+    from tempo_binary_tool_manager.manager import ToolsCache
+
+
+def new_tools_cache() -> ToolsCache:
+    from tempo_binary_tool_manager import manager
+
+    return manager.ToolsCache(
+        main_tool_author='Tempo-Organization',
+        main_tool_name='tempo',
+        logging_function=logger.log_message,
+        cache_path=settings.settings_information.settings.get("cache", {}).get("cache_dir", None),
+    )
+
+
+def get_tools_cache() -> ToolsCache:
+    # built on first use in each session, after its settings have loaded, so the cache_dir override is honoured
+    return session.get_current_session().tools_cache
+
+
+if TYPE_CHECKING:
+    tools_cache: ToolsCache
+
+
+def __getattr__(name: str) -> object:
+    # keeps manager.tools_cache working for existing callers
+    if name == "tools_cache":
+        return get_tools_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_tool_executable_override(tool_name: str) -> Path | None:
+    # TEMPO_<TOOL>_EXECUTABLE points at a local build or stub instead of the cached release
+    override = os.environ.get(f"TEMPO_{tool_name.upper()}_EXECUTABLE")
+    if override:
+        return Path(override)
+    return None
+
+
+# tool name to the tempo_binary_tools module and ToolInfo class that installs it
+TOOL_INFO_CLASSES = {
+    "repak": ("repak", "RepakToolInfo"),
+    "retoc": ("retoc", "RetocToolInfo"),
+    "patternsleuth": ("patternsleuth", "PatternsleuthToolInfo"),
+    "spaghetti": ("spaghetti", "SpaghettiToolInfo"),
+    "stove": ("stove", "StoveToolInfo"),
+    "kismet_analyzer": ("kismet_analyzer", "KismetAnalyzerToolInfo"),
+    "uasset_gui": ("uasset_gui", "UassetGuiToolInfo"),
+    "umodel": ("umodel", "UmodelToolInfo"),
+    "fmodel": ("fmodel", "FmodelToolInfo"),
+}
+
+# tools each packing type runs, unreal_pak and engine use the engine's own binaries
+PACKING_TYPE_TOOL_NAMES = {
+    PackingType.REPAK: ["repak"],
+    PackingType.RETOC: ["retoc"],
+}
+
+
+@dataclass
+class ToolRegistryInformation:
+    tool_locks: dict[str, threading.Lock]
+    lock: threading.Lock
+
+
+tool_registry_information = ToolRegistryInformation(
+    tool_locks={},
+    lock=threading.Lock(),
 )
+
+
+def get_tool_registry_path() -> Path:
+    return Path(settings.get_cache_directory() / "tool_registry.json")
+
+
+def get_tool_package_version() -> str:
+    try:
+        return metadata.version("tempo-binary-tools")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def get_tool_version_stamp(executable_path: Path) -> str | None:
+    """
+    Identifies an installed executable by the tools package version and the file's size and mtime,
+    so an upgrade or reinstall invalidates the persisted path.
+    """
+    try:
+        stat_result = executable_path.stat()
+    except OSError:
+        return None
+    return f"{get_tool_package_version()}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+
+
+def read_tool_registry() -> dict[str, dict[str, str]]:
+    try:
+        return json.loads(get_tool_registry_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_tool_registry_entry(tool_name: str, executable_path: Path) -> None:
+    version_stamp = get_tool_version_stamp(executable_path)
+    if not version_stamp:
+        return
+    # other runs write their own entries to the same registry, so the read and the write happen under one lock
+    with tool_registry_information.lock, file_locks.file_lock(Path(settings.get_locks_directory() / "tool_registry.lock")):
+        registry = read_tool_registry()
+        registry[tool_name] = {"executable_path": str(executable_path), "version_stamp": version_stamp}
+        try:
+            file_io.write_file_atomically(get_tool_registry_path(), json.dumps(registry, indent=2))
+        except OSError as error:
+            logger.log_message(f"Warning: could not write tool registry: {error}")
+
+
+def get_persisted_tool_executable(tool_name: str) -> Path | None:
+    entry = read_tool_registry().get(tool_name)
+    if not entry:
+        return None
+    executable_path = Path(entry["executable_path"])
+    if get_tool_version_stamp(executable_path) != entry.get("version_stamp"):
+        return None
+    return executable_path
+
+
+def install_tool(tool_name: str) -> Path:
+    module_name, class_name = TOOL_INFO_CLASSES[tool_name]
+    tool_module = importlib.import_module(f"tempo_binary_tools.{module_name}")
+    tool_info = getattr(tool_module, class_name)(cache=get_tools_cache())
+    with timer.span(f"install_{tool_name}", category="tools"):
+        tool_info.ensure_tool_installed()
+    return Path(tool_info.get_executable_path())
+
+
+def get_tool_lock(tool_name: str) -> threading.Lock:
+    with tool_registry_information.lock:
+        return tool_registry_information.tool_locks.setdefault(tool_name, threading.Lock())
+
+
+def get_tool_executable(tool_name: str) -> Path:
+    """
+    Resolves a tool's executable once per session.
+    Checks the env override, then the persisted registry, and only then installs through its ToolInfo.
+    """
+    override = get_tool_executable_override(tool_name)
+    if override:
+        return override
+    tool_executable_paths = session.get_current_session().tool_executable_paths
+    executable_path = tool_executable_paths.get(tool_name)
+    if executable_path:
+        return executable_path
+    # a prefetch thread may be resolving the same tool, wait for it rather than installing twice
+    with get_tool_lock(tool_name):
+        executable_path = tool_executable_paths.get(tool_name)
+        if executable_path:
+            return executable_path
+        executable_path = get_persisted_tool_executable(tool_name)
+        if not executable_path:
+            # another run may be installing the same tool into the shared cache, wait and reuse its install
+            with file_locks.file_lock(Path(settings.get_locks_directory() / f"tool_{tool_name}.lock")):
+                executable_path = get_persisted_tool_executable(tool_name)
+                if not executable_path:
+                    executable_path = install_tool(tool_name)
+                    write_tool_registry_entry(tool_name, executable_path)
+        tool_executable_paths[tool_name] = executable_path
+    return executable_path
+
+
+def prefetch_tool(tool_name: str) -> None:
+    try:
+        get_tool_executable(tool_name)
+    except Exception as error:  # noqa: BLE001
+        # the real call site resolves again and reports the failure where it matters
+        logger.log_message(f"Warning: prefetching {tool_name} failed: {error}")
+
+
+def prefetch_tools(tool_names: list[str]) -> list[threading.Thread]:
+    threads = []
+    for tool_name in dict.fromkeys(tool_names):
+        if tool_name in session.get_current_session().tool_executable_paths or get_tool_executable_override(tool_name):
+            continue
+        thread = threading.Thread(
+            target=session.bind_to_current_session(prefetch_tool), args=(tool_name,), name=f"prefetch_{tool_name}", daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def get_tool_names_for_enabled_mods() -> list[str]:
+    mods_info = settings.get_mods_info_dict_from_json()
+    tool_names = []
+    for mod_name in settings.get_enabled_mod_names():
+        packing_type_str = mods_info[mod_name].get("packing_type")
+        for packing_type, packing_type_tool_names in PACKING_TYPE_TOOL_NAMES.items():
+            if packing_type.value == packing_type_str:
+                tool_names.extend(packing_type_tool_names)
+    return tool_names
+
+
+def prefetch_tools_for_enabled_mods() -> list[threading.Thread]:
+    """Starts resolving, in parallel, the tools the enabled mods' packing types will run."""
+    return prefetch_tools(get_tool_names_for_enabled_mods())
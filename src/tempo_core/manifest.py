@@ -0,0 +1,321 @@
+"""
+A compact binary manifest of files: sorted paths with their size, mtime and an optional digest.
+
+Layout, all integers little endian:
+
+    header      magic, version, entry count, digest size, restart interval, section count
+    index       (offset, length) of every section
+    metadata    utf-8 json
+    prefixes    uint16 per entry, bytes shared with the previous path
+    suffixes    uint16 per entry, length of the rest of the path
+    restarts    uint64 per restart, offset into the path bytes where that entry starts
+    path bytes  the non shared part of every path, back to back
+    sizes       int64 per entry
+    mtimes      int64 per entry
+    digests     digest size bytes per entry, all zero when missing
+
+Paths are front coded: each one only stores what differs from the path before it, and every
+restart interval entries a path is stored whole, so a lookup only decodes one block.
+The numeric columns load straight into arrays, and paths are decoded as they are iterated.
+"""
+
+import sys
+import json
+import struct
+import bisect
+from array import array
+from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+MANIFEST_MAGIC = b"TMNF"
+MANIFEST_VERSION = 1
+JSON_MANIFEST_FORMAT = "tempo-manifest"
+
+DEFAULT_RESTART_INTERVAL = 64
+
+HEADER_STRUCT = struct.Struct("<4sHIHHH")
+SECTION_STRUCT = struct.Struct("<QQ")
+SECTION_NAMES = ("metadata", "prefixes", "suffixes", "restarts", "path_bytes", "sizes", "mtimes", "digests")
+
+
+class ManifestEntry(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    digest: bytes | None = None
+
+
+@dataclass
+class ManifestDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+
+
+def get_little_endian_array(typecode: str, data: bytes | memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def to_little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def get_shared_prefix_length(first: bytes, second: bytes) -> int:
+    limit = min(len(first), len(second), 0xFFFF)
+    # xor the two prefixes as big integers, the highest differing byte is the first mismatch
+    difference = int.from_bytes(first[:limit], "big") ^ int.from_bytes(second[:limit], "big")
+    return limit - (difference.bit_length() + 7) // 8
+
+
+def encode_manifest(
+    entries: Iterable[ManifestEntry],
+    metadata: dict | None = None,
+    *,
+    digest_size: int = 0,
+    restart_interval: int = DEFAULT_RESTART_INTERVAL,
+) -> bytes:
+    sorted_entries = sorted(entries, key=lambda entry: entry.path)
+    if not digest_size:
+        digest_size = max((len(entry.digest) for entry in sorted_entries if entry.digest), default=0)
+    prefixes = array("H")
+    suffixes = array("H")
+    restarts = array("Q")
+    sizes = array("q")
+    mtimes = array("q")
+    path_bytes = bytearray()
+    digests = bytearray()
+    empty_digest = bytes(digest_size)
+    previous_path = b""
+    for index, entry in enumerate(sorted_entries):
+        encoded_path = entry.path.encode("utf-8")
+        if index % restart_interval == 0:
+            restarts.append(len(path_bytes))
+            shared_length = 0
+        else:
+            shared_length = get_shared_prefix_length(previous_path, encoded_path)
+        suffix = encoded_path[shared_length:]
+        if len(suffix) > 0xFFFF:
+            path_too_long_error = f'Manifest paths must be under 64KiB, got "{entry.path[:80]}..."'
+            raise ValueError(path_too_long_error)
+        prefixes.append(shared_length)
+        suffixes.append(len(suffix))
+        path_bytes += suffix
+        sizes.append(entry.size)
+        mtimes.append(entry.mtime_ns)
+        if digest_size:
+            digests += (entry.digest or empty_digest).ljust(digest_size, b"\0")
+        previous_path = encoded_path
+
+    sections = [
+        json.dumps(metadata or {}, separators=(",", ":")).encode("utf-8"),
+        to_little_endian_bytes(prefixes),
+        to_little_endian_bytes(suffixes),
+        to_little_endian_bytes(restarts),
+        bytes(path_bytes),
+        to_little_endian_bytes(sizes),
+        to_little_endian_bytes(mtimes),
+        bytes(digests),
+    ]
+    offset = HEADER_STRUCT.size + SECTION_STRUCT.size * len(sections)
+    index_bytes = bytearray()
+    for section in sections:
+        index_bytes += SECTION_STRUCT.pack(offset, len(section))
+        offset += len(section)
+    header = HEADER_STRUCT.pack(
+        MANIFEST_MAGIC, MANIFEST_VERSION, len(sorted_entries), digest_size, restart_interval, len(sections),
+    )
+    return b"".join([header, bytes(index_bytes), *sections])
+
+
+def write_manifest(
+    manifest_path: Path,
+    entries: Iterable[ManifestEntry],
+    metadata: dict | None = None,
+    *,
+    digest_size: int = 0,
+) -> None:
+    contents = encode_manifest(entries, metadata, digest_size=digest_size)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    temp_path.write_bytes(contents)
+    temp_path.replace(manifest_path)
+
+
+class Manifest:
+    """A decoded manifest, numeric columns are loaded up front and paths are decoded on demand."""
+
+    def __init__(self, data: bytes | memoryview) -> None:
+        view = memoryview(data)
+        magic, version, count, digest_size, restart_interval, section_count = HEADER_STRUCT.unpack_from(view, 0)
+        if magic != MANIFEST_MAGIC:
+            raise ValueError("Not a tempo manifest")
+        if version != MANIFEST_VERSION:
+            unsupported_version_error = f"Unsupported manifest version {version}"
+            raise ValueError(unsupported_version_error)
+        sections = {}
+        for section_index, name in enumerate(SECTION_NAMES[:section_count]):
+            offset, length = SECTION_STRUCT.unpack_from(view, HEADER_STRUCT.size + SECTION_STRUCT.size * section_index)
+            sections[name] = view[offset:offset + length]
+        self.count = count
+        self.digest_size = digest_size
+        self.restart_interval = restart_interval
+        self.metadata: dict = json.loads(bytes(sections["metadata"]) or b"{}")
+        self.prefixes = get_little_endian_array("H", sections["prefixes"])
+        self.suffixes = get_little_endian_array("H", sections["suffixes"])
+        self.restarts = get_little_endian_array("Q", sections["restarts"])
+        self.sizes = get_little_endian_array("q", sections["sizes"])
+        self.mtimes = get_little_endian_array("q", sections["mtimes"])
+        self.path_bytes = bytes(sections["path_bytes"])
+        self.digests = bytes(sections["digests"])
+        self.restart_paths: list[str] | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_digest(self, index: int) -> bytes | None:
+        if not self.digest_size:
+            return None
+        digest = self.digests[index * self.digest_size:(index + 1) * self.digest_size]
+        return digest if digest.strip(b"\0") else None
+
+    def iter_encoded_paths(self, start_index: int = 0) -> Iterator[bytes]:
+        """Yields utf-8 paths from start_index, which must be a restart point."""
+        path_bytes = self.path_bytes
+        prefixes = self.prefixes
+        suffixes = self.suffixes
+        offset = self.restarts[start_index // self.restart_interval] if self.count else 0
+        path = b""
+        for index in range(start_index, self.count):
+            suffix_length = suffixes[index]
+            path = path[:prefixes[index]] + path_bytes[offset:offset + suffix_length]
+            offset += suffix_length
+            yield path
+
+    def iter_paths(self) -> Iterator[str]:
+        for path in self.iter_encoded_paths():
+            yield path.decode("utf-8")
+
+    def iter_entries(self) -> Iterator[ManifestEntry]:
+        sizes = self.sizes
+        mtimes = self.mtimes
+        for index, path in enumerate(self.iter_encoded_paths()):
+            yield ManifestEntry(path.decode("utf-8"), sizes[index], mtimes[index], self.get_digest(index))
+
+    def get_restart_paths(self) -> list[str]:
+        if self.restart_paths is None:
+            path_bytes = self.path_bytes
+            self.restart_paths = [
+                path_bytes[offset:offset + self.suffixes[restart_index * self.restart_interval]].decode("utf-8")
+                for restart_index, offset in enumerate(self.restarts)
+            ]
+        return self.restart_paths
+
+    def find(self, path: str) -> ManifestEntry | None:
+        """Looks a path up by binary searching the restart points and decoding a single block."""
+        restart_index = bisect.bisect_right(self.get_restart_paths(), path) - 1
+        if restart_index < 0:
+            return None
+        start_index = restart_index * self.restart_interval
+        encoded_path = path.encode("utf-8")
+        block_paths = self.iter_encoded_paths(start_index)
+        for index in range(start_index, min(start_index + self.restart_interval, self.count)):
+            candidate = next(block_paths)
+            if candidate == encoded_path:
+                return ManifestEntry(path, self.sizes[index], self.mtimes[index], self.get_digest(index))
+            if candidate > encoded_path:
+                break
+        return None
+
+    def to_dict(self) -> dict[str, ManifestEntry]:
+        return {entry.path: entry for entry in self.iter_entries()}
+
+
+def read_manifest(manifest_path: Path) -> Manifest:
+    with manifest_path.open("rb") as file:
+        return Manifest(file.read())
+
+
+def is_manifest_file(file_path: Path) -> bool:
+    try:
+        with file_path.open("rb") as file:
+            return file.read(len(MANIFEST_MAGIC)) == MANIFEST_MAGIC
+    except OSError:
+        return False
+
+
+def diff_manifest_entries(
+    old_entries: Iterable[ManifestEntry], new_entries: Iterable[ManifestEntry],
+) -> ManifestDiff:
+    """Diffs two path sorted entry streams in one merge pass, without building either side in memory."""
+    diff = ManifestDiff()
+    old_iterator = iter(old_entries)
+    new_iterator = iter(new_entries)
+    old_entry = next(old_iterator, None)
+    new_entry = next(new_iterator, None)
+    while old_entry is not None or new_entry is not None:
+        if old_entry is not None and (new_entry is None or old_entry.path < new_entry.path):
+            diff.removed.append(old_entry.path)
+            old_entry = next(old_iterator, None)
+        elif new_entry is not None and (old_entry is None or new_entry.path < old_entry.path):
+            diff.added.append(new_entry.path)
+            new_entry = next(new_iterator, None)
+        elif old_entry is not None and new_entry is not None:
+            # the same path on both sides, the branches above took every case where one side ran out
+            if old_entry.digest and new_entry.digest:
+                is_modified = old_entry.digest != new_entry.digest
+            else:
+                is_modified = (old_entry.size, old_entry.mtime_ns) != (new_entry.size, new_entry.mtime_ns)
+            if is_modified:
+                diff.modified.append(new_entry.path)
+            old_entry = next(old_iterator, None)
+            new_entry = next(new_iterator, None)
+    return diff
+
+
+def diff_manifests(old_manifest: Manifest, new_manifest: Manifest) -> ManifestDiff:
+    return diff_manifest_entries(old_manifest.iter_entries(), new_manifest.iter_entries())
+
+
+def get_manifest_json(entries: Iterable[ManifestEntry], metadata: dict | None = None) -> dict:
+    return {
+        "format": JSON_MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "metadata": metadata or {},
+        "entries": [
+            [entry.path, entry.size, entry.mtime_ns, entry.digest.hex() if entry.digest else None]
+            for entry in sorted(entries, key=lambda entry: entry.path)
+        ],
+    }
+
+
+def manifest_to_json(manifest: Manifest) -> dict:
+    return get_manifest_json(manifest.iter_entries(), manifest.metadata)
+
+
+def manifest_entries_from_json(manifest_json: dict) -> tuple[list[ManifestEntry], dict]:
+    entries = [
+        ManifestEntry(path, size, mtime_ns, bytes.fromhex(digest) if digest else None)
+        for path, size, mtime_ns, digest in manifest_json["entries"]
+    ]
+    return entries, manifest_json.get("metadata", {})
+
+
+def export_manifest_json(manifest_path: Path, json_path: Path) -> None:
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with json_path.open("w", encoding="utf-8") as file:
+        json.dump(manifest_to_json(read_manifest(manifest_path)), file, separators=(",", ":"))
+
+
+def import_manifest_json(json_path: Path, manifest_path: Path) -> None:
+    with json_path.open(encoding="utf-8") as file:
+        entries, metadata = manifest_entries_from_json(json.load(file))
+    write_manifest(manifest_path, entries, metadata)
@@ -1,47 +1,164 @@
 import os
+import json
+import time
 import socket
+import threading
+from pathlib import Path
+from dataclasses import dataclass
 
-from tempo_core import logger, env
+from tempo_core import logger, env, session
 
-is_online = False
-has_checked_online_status = False
+DEFAULT_ONLINE_CHECK_HOST = "8.8.8.8"
+DEFAULT_ONLINE_CHECK_PORT = 53
+
+# how long a probe result on disk is trusted, so back to back runs do not each pay for a connect
+DEFAULT_ONLINE_STATUS_CACHE_TTL_SECONDS = 300.0
+
+
+@dataclass
+class OnlineCheckInformation:
+    is_online: bool | None
+    has_checked_online_status: bool
+    check_thread: threading.Thread | None
+    lock: threading.Lock
+
+
+online_check_information = OnlineCheckInformation(
+    is_online=None,
+    has_checked_online_status=False,
+    check_thread=None,
+    lock=threading.Lock(),
+)
+
+
+def __getattr__(name: str) -> object:
+    # is_online and has_checked_online_status used to be plain module globals, keep them readable as such
+    if name == "is_online":
+        return get_is_online()
+    if name == "has_checked_online_status":
+        return online_check_information.has_checked_online_status
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_online_check_probe_target() -> tuple[str, int]:
+    """The host and port connected to, overridable with TEMPO_ONLINE_CHECK_HOST and TEMPO_ONLINE_CHECK_PORT."""
+    host = os.getenv("TEMPO_ONLINE_CHECK_HOST") or DEFAULT_ONLINE_CHECK_HOST
+    port_str = os.getenv("TEMPO_ONLINE_CHECK_PORT")
+    port = int(port_str) if port_str else DEFAULT_ONLINE_CHECK_PORT
+    return host, port
+
+
+def get_online_status_cache_ttl() -> float:
+    """Seconds a cached result stays valid, TEMPO_ONLINE_CHECK_CACHE_TTL=0 disables the disk cache."""
+    ttl_str = os.getenv("TEMPO_ONLINE_CHECK_CACHE_TTL")
+    return float(ttl_str) if ttl_str else DEFAULT_ONLINE_STATUS_CACHE_TTL_SECONDS
+
+
+def get_online_status_cache_path() -> Path:
+    from tempo_core import settings
+
+    return Path(settings.get_cache_directory() / "online_status.json")
+
+
+def get_cached_online_status(host: str, port: int, ttl: float) -> bool | None:
+    try:
+        cached = json.loads(get_online_status_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("probe_target") != f"{host}:{port}":
+        return None
+    if time.time() - cached.get("checked_at", 0) > ttl:
+        return None
+    return bool(cached.get("is_online"))
+
+
+def set_cached_online_status(host: str, port: int, *, is_online: bool) -> None:
+    cache_path = get_online_status_cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"probe_target": f"{host}:{port}", "checked_at": time.time(), "is_online": is_online}),
+            encoding="utf-8",
+        )
+    except OSError as error:
+        logger.log_message(f"Warning: could not cache web connectivity status: {error}")
+
+
+def probe_is_online(host: str, port: int, timeout: float) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except (socket.timeout, OSError):
+        return False
 
 
 def log_online_status() -> None:
-    global has_checked_online_status
-    if is_online:
+    if online_check_information.is_online:
         logger.log_message('Web Connectivity Status: Online')
     else:
         logger.log_message('Web Connectivity Status: Offline')
-    has_checked_online_status = True
+    online_check_information.has_checked_online_status = True
+
+
+def get_forced_online_status() -> bool | None:
+    if env.env_true(os.getenv("TEMPO_FORCE_ONLINE")):
+        return True
+    if env.env_true(os.getenv("TEMPO_FORCE_OFFLINE")):
+        return False
+    return None
+
+
+def check_is_online(timeout: float) -> None:
+    host, port = get_online_check_probe_target()
+    ttl = get_online_status_cache_ttl()
+    is_online = None
+    if ttl > 0:
+        is_online = get_cached_online_status(host, port, ttl)
+    if is_online is None:
+        is_online = probe_is_online(host, port, timeout)
+        if ttl > 0:
+            set_cached_online_status(host, port, is_online=is_online)
+    online_check_information.is_online = is_online
+    log_online_status()
 
 
 def init_is_online(timeout: float = 1) -> None:
     """
-    Determine online status with the following priority:
+    Starts determining online status in the background, with the following priority:
     1. TEMPO_FORCE_ONLINE=true  -> always online
     2. TEMPO_FORCE_OFFLINE=true -> always offline
-    3. Otherwise, attempt socket connection
+    3. A cached result on disk younger than the ttl
+    4. Otherwise, attempt socket connection
+    Use get_is_online to wait for the result.
     """
-    global is_online
-
-    force_online = env.env_true(os.getenv("TEMPO_FORCE_ONLINE"))
-    force_offline = env.env_true(os.getenv("TEMPO_FORCE_OFFLINE"))
-
-    if force_online:
-        is_online = True
+    forced_online_status = get_forced_online_status()
+    if forced_online_status is not None:
+        online_check_information.is_online = forced_online_status
         log_online_status()
         return
 
-    if force_offline:
-        is_online = False
-        log_online_status()
-        return
+    with online_check_information.lock:
+        if online_check_information.check_thread is not None:
+            return
+        online_check_information.check_thread = threading.Thread(
+            target=session.bind_to_current_session(check_is_online), args=(timeout,), name="online_check", daemon=True,
+        )
+        online_check_information.check_thread.start()
 
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=timeout)
-        is_online = True
-    except (socket.timeout, OSError):
-        is_online = False
 
-    log_online_status()
+def get_is_online() -> bool:
+    """Returns the online status, waiting on the background check if it is still running."""
+    if online_check_information.is_online is None:
+        init_is_online()
+        check_thread = online_check_information.check_thread
+        if check_thread is not None:
+            check_thread.join()
+    return bool(online_check_information.is_online)
+
+
+def reset_online_status() -> None:
+    """Forgets the in memory result, so the next get_is_online checks again."""
+    with online_check_information.lock:
+        online_check_information.is_online = None
+        online_check_information.has_checked_online_status = False
+        online_check_information.check_thread = None
@@ -1,17 +1,23 @@
 import os
 import shutil
+import contextlib
 from pathlib import Path, PurePath
 from dataclasses import dataclass
-
-from rich.progress import Progress
+from typing import TYPE_CHECKING
 
 from tempo_core import (
     app_runner,
+    artifact_cache,
+    collection_resolver,
     data_structures,
     file_io,
+    file_locks,
     hook_states,
     logger,
+    manager,
+    session,
     settings,
+    timer,
     utilities,
 )
 from tempo_core.data_structures import (
@@ -29,14 +35,24 @@ class QueueInformation:
     uninstall_queue_types: set[PackingType]
 
 
-queue_information = QueueInformation(install_queue_types=set(), uninstall_queue_types=set())
+def new_queue_information() -> QueueInformation:
+    return QueueInformation(install_queue_types=set(), uninstall_queue_types=set())
 
 
-command_queue = []
+if TYPE_CHECKING:
+    queue_information: QueueInformation
+    command_queue: list
 
 
-def populate_queue_information() -> None:
+def __getattr__(name: str) -> object:
+    # keeps packing.queue_information and packing.command_queue working, they are the current session's
+    if name in {"queue_information", "command_queue"}:
+        return getattr(session.get_current_session(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
+def populate_queue_information() -> None:
+    queue_information = session.get_current_session().queue_information
     mod_info_dict = settings.get_mods_info_dict_from_json()
 
     for mod_name in settings.get_enabled_mod_names():
@@ -103,7 +119,6 @@ def get_engine_pak_command() -> list[str]:
     return command
 
 
-# add support for collections later like this file_includes - unreal_collections
 # make sure the right iterate command is being used based on correct versions later
 def get_cook_project_commands() -> list[list[str]]:
     uproject_path = settings.get_uproject_file_or_raise()
@@ -138,9 +153,8 @@ def get_cook_project_commands() -> list[list[str]]:
 
     for key in mods_info.keys():
         if mods_info[key].get('is_enabled', True) and mods_info[key]['packing_type'] != 'engine':
-            asset_paths.extend(
-                mods_info[key].get("file_includes", {}).get("asset_paths", []),
-            )
+            # collection includes resolve to asset paths, so they cook like hand listed ones
+            asset_paths.extend(collection_resolver.get_mod_asset_paths(key))
             tree_paths.extend(
                 mods_info[key].get("file_includes", {}).get("tree_paths", []),
             )
@@ -163,7 +177,7 @@ def get_cook_project_commands() -> list[list[str]]:
     final_file_list = []
 
     for path in asset_paths:
-        final_file_list.append(path.replace("Content", "/Game", 1).as_posix())
+        final_file_list.append(str(path).replace("Content", "/Game", 1))
 
     for path in tree_paths:
         full_path = f'{uproject_dir}/{path}'
@@ -203,6 +217,7 @@ def get_cook_project_commands() -> list[list[str]]:
     return commands_to_return
 
 
+@timer.timed("build")
 def build_uproject() -> None:
     from tempo_core import main_logic
     logger.log_message("Project Building Starting")
@@ -211,6 +226,7 @@ def build_uproject() -> None:
     
 
 
+@timer.timed("cook")
 def cook_uproject() -> None:
     cook_commands = get_cook_project_commands()
     for command in cook_commands:
@@ -218,6 +234,7 @@ def cook_uproject() -> None:
         run_proj_command(command, False)
 
 
+@timer.timed("pack")
 def package_uproject_non_iostore() -> None:
     run_proj_command(get_engine_pak_command())
 
@@ -310,7 +327,7 @@ def generate_mods(*, use_symlinks: bool) -> None:
     mods_uninstall()
     mods_install(use_symlinks=use_symlinks)
 
-    for command in command_queue:
+    for command in session.get_current_session().command_queue:
         app_runner.run_app(command)
 
 
@@ -351,11 +368,20 @@ def uninstall_pak_mod(mod_name: str) -> None:
             sig_path.unlink()
 
 
+def get_game_paks_lock() -> contextlib.AbstractContextManager[None]:
+    """Held while a mod is installed into or removed from the game, so concurrent runs take turns on its Paks dir."""
+    return file_locks.file_lock(
+        file_locks.get_directory_lock_path(settings.get_locks_directory(), utilities.get_game_paks_dir()),
+    )
+
+
+@timer.timed("uninstall")
 def uninstall_mod(packing_type: PackingType, mod_name: str) -> None:
-    if packing_type == PackingType.LOOSE:
-        uninstall_loose_mod(mod_name)
-    elif packing_type in list(PackingType):
-        uninstall_pak_mod(mod_name)
+    with get_game_paks_lock():
+        if packing_type == PackingType.LOOSE:
+            uninstall_loose_mod(mod_name)
+        elif packing_type in list(PackingType):
+            uninstall_pak_mod(mod_name)
 
 
 def install_mod_sig(mod_name: str, *, use_symlinks: bool) -> None:
@@ -427,6 +453,7 @@ def install_loose_mod(mod_name: str, *, use_symlinks: bool) -> None:
                 src_file.symlink_to(dest_file)
             else:
                 shutil.copyfile(src_file, dest_file)
+            timer.add_bytes_processed(src_file.stat().st_size)
 
 
 def install_engine_mod(mod_name: str, *, use_symlinks: bool) -> None:
@@ -464,12 +491,12 @@ def install_engine_mod(mod_name: str, *, use_symlinks: bool) -> None:
                 shutil.copyfile(src_file, dest_file)
 
 
+@timer.timed("pack")
 def make_pak_repak(*, mod_name: str, use_symlinks: bool) -> None:
     game_paks_dir = utilities.get_game_paks_dir()
     pak_dir_structure = utilities.get_pak_dir_structure(mod_name)
     pak_dir = Path(f"{game_paks_dir}/{pak_dir_structure}")
     pak_dir.mkdir(exist_ok=True)
-    os.chdir(pak_dir)
 
     src_symlinked_dir = Path(f"{settings.get_temp_directory()}/{mod_name}")
 
@@ -491,6 +518,8 @@ def make_pak_repak(*, mod_name: str, use_symlinks: bool) -> None:
         dest_pak_location.unlink()
 
     repak.run_repak_pack_command(src_symlinked_dir, intermediate_pak_file)
+    if intermediate_pak_file.is_file():
+        timer.add_bytes_processed(intermediate_pak_file.stat().st_size)
 
     install_mod_sig(mod_name, use_symlinks=use_symlinks)
     if use_symlinks:
@@ -513,8 +542,11 @@ def install_repak_mod(mod_name: str, *, use_symlinks: bool) -> None:
                 dest_dir.mkdir(parents=True)
             if src_file.is_file():
                 shutil.copy2(src_file, dest_file)
+                timer.add_bytes_processed(src_file.stat().st_size)
 
     if should_use_progress_bars:
+        from rich.progress import Progress
+
         with Progress() as progress:
             task = progress.add_task(
                 f"[green]Copying files for {mod_name} mod...", total=len(mod_files_dict),
@@ -527,6 +559,7 @@ def install_repak_mod(mod_name: str, *, use_symlinks: bool) -> None:
                     dest_dir.mkdir(parents=True)
                 if src_file.is_file():
                     shutil.copy2(src_file, dest_file)
+                    timer.add_bytes_processed(src_file.stat().st_size)
                 progress.update(task, advance=1)
     else:
         copy_files()
@@ -534,6 +567,80 @@ def install_repak_mod(mod_name: str, *, use_symlinks: bool) -> None:
     make_pak_repak(mod_name=mod_name, use_symlinks=use_symlinks)
 
 
+# packing types whose output is fully determined by the staged mod files and the packing settings
+ARTIFACT_CACHE_PACKING_TYPES = {PackingType.REPAK, PackingType.RETOC, PackingType.UNREAL_PAK}
+
+ARTIFACT_CACHE_ENVIRONMENT_VARIABLES = ("TEMPO_REPAK_COMPRESSION_TYPE", "TEMPO_REPAK_PACK_VERSION")
+
+
+def get_file_stamp(file_path: Path) -> list:
+    stat_result = file_path.stat()
+    return [os.fspath(file_path), stat_result.st_size, stat_result.st_mtime_ns]
+
+
+def get_mod_artifact_key(
+    mod_name: str, packing_type: PackingType, compression_type: CompressionType | None,
+) -> str | None:
+    """
+    The artifact cache key for the mod as it would be packed right now,
+    or None when its output depends on more than its own staged files.
+    """
+    parameters: dict = {
+        "packing_type": packing_type.value,
+        "compression_type": CompressionType(compression_type).value if compression_type else None,
+        "mod_entry": get_mod_pak_entry(mod_name),
+        "repak_info": settings.settings_information.settings.get("repak_info", {}),
+        "environment": {name: os.environ.get(name) for name in ARTIFACT_CACHE_ENVIRONMENT_VARIABLES},
+    }
+    if packing_type == PackingType.REPAK:
+        parameters["tool"] = get_file_stamp(manager.get_tool_executable("repak"))
+    else:
+        unreal_engine_dir = settings.get_unreal_engine_dir_or_raise()
+        unreal_version = settings.get_unreal_engine_version(unreal_engine_dir)
+        parameters["unreal_engine_dir"] = os.fspath(unreal_engine_dir)
+        parameters["unreal_version"] = unreal_version.get_retoc_unreal_version_str() if unreal_version else None
+        if packing_type == PackingType.RETOC:
+            parameters["tool"] = get_file_stamp(manager.get_tool_executable("retoc"))
+        else:
+            # iostore paks also take in the project wide cook metadata, which the staged files do not cover
+            if unreal_engine.get_is_game_iostore(settings.get_uproject_file_or_raise(), utilities.get_game_dir_or_raise()):
+                return None
+            parameters["tool"] = get_file_stamp(unreal_engine.get_unreal_pak_exe_path(unreal_engine_dir))
+
+    temp_dir = settings.get_temp_directory()
+    mod_files = utilities.filter_file_paths(get_mod_file_paths_for_manually_made_pak_mods(mod_name))
+    input_files = {
+        Path(os.path.relpath(dest_file, temp_dir)).as_posix(): src_file
+        for src_file, dest_file in mod_files.items()
+        if src_file.is_file()
+    }
+    return artifact_cache.get_artifact_key(parameters, input_files)
+
+
+def get_mod_artifact_files(mod_name: str) -> list[Path]:
+    intermediate_dir = Path(settings.get_temp_directory() / utilities.get_pak_dir_structure(mod_name))
+    return [
+        Path(intermediate_dir / f"{mod_name}.{extension}")
+        for extension in data_structures.unreal_iostore_no_sigs_archive_extensions
+        if Path(intermediate_dir / f"{mod_name}.{extension}").is_file()
+    ]
+
+
+def install_cached_mod(mod_name: str, artifact_key: str, *, use_symlinks: bool) -> bool:
+    """Installs the mod straight from the artifact cache, returns False on a miss."""
+    final_dest_dir = Path(utilities.get_game_paks_dir() / utilities.get_pak_dir_structure(mod_name))
+    for extension in data_structures.unreal_iostore_no_sigs_archive_extensions:
+        dest_file = Path(final_dest_dir / f"{mod_name}.{extension}")
+        if dest_file.is_file() or dest_file.is_symlink():
+            dest_file.unlink()
+    if artifact_cache.install_artifacts(artifact_key, final_dest_dir) is None:
+        return False
+    install_mod_sig(mod_name, use_symlinks=use_symlinks)
+    logger.log_message(f'Installed the "{mod_name}" mod from the artifact cache, its files are unchanged')
+    return True
+
+
+@timer.timed("install")
 def install_mod(
     *,
     packing_type: PackingType,
@@ -541,33 +648,42 @@ def install_mod(
     compression_type: CompressionType | None,
     use_symlinks: bool,
 ) -> None:
-    if packing_type == PackingType.LOOSE:
-        install_loose_mod(mod_name, use_symlinks=use_symlinks)
-    elif packing_type == PackingType.ENGINE:
-        install_engine_mod(mod_name, use_symlinks=use_symlinks)
-    elif packing_type == PackingType.REPAK:
-        install_repak_mod(mod_name, use_symlinks=use_symlinks)
-    elif packing_type == PackingType.UNREAL_PAK:
-        unreal_pak.install_unreal_pak_mod(
-            mod_name, compression_type, use_symlinks=use_symlinks,
-        )
-    elif packing_type == PackingType.RETOC:
-        retoc.install_retoc_mod(mod_name=mod_name, use_symlinks=use_symlinks)
-    else:
-        logger.log_message(
-            f'Error: You have provided an invalid packing_type for your "{mod_name}" mod entry in your settings json',
-        )
-        logger.log_message(
-            f'Error: You provided "{utilities.get_mods_info_dict_from_mod_name(mod_name).get("packing_type", "none")}".',
-        )
-        logger.log_message("Error: Valid packing type options are:")
-        for entry in PackingType:
-            logger.log_message(f'Error: "{entry.value}"')
-        invalid_packing_type_error = (
-            "Invalid packing type, or no packing type, provided for mod entry"
-        )
-        raise RuntimeError(invalid_packing_type_error)
+    with get_game_paks_lock():
+        artifact_key = None
+        if packing_type in ARTIFACT_CACHE_PACKING_TYPES:
+            artifact_key = get_mod_artifact_key(mod_name, packing_type, compression_type)
+            if artifact_key and install_cached_mod(mod_name, artifact_key, use_symlinks=use_symlinks):
+                return
+
+        if packing_type == PackingType.LOOSE:
+            install_loose_mod(mod_name, use_symlinks=use_symlinks)
+        elif packing_type == PackingType.ENGINE:
+            install_engine_mod(mod_name, use_symlinks=use_symlinks)
+        elif packing_type == PackingType.REPAK:
+            install_repak_mod(mod_name, use_symlinks=use_symlinks)
+        elif packing_type == PackingType.UNREAL_PAK:
+            unreal_pak.install_unreal_pak_mod(
+                mod_name, compression_type, use_symlinks=use_symlinks,
+            )
+        elif packing_type == PackingType.RETOC:
+            retoc.install_retoc_mod(mod_name=mod_name, use_symlinks=use_symlinks)
+        else:
+            logger.log_message(
+                f'Error: You have provided an invalid packing_type for your "{mod_name}" mod entry in your settings json',
+            )
+            logger.log_message(
+                f'Error: You provided "{utilities.get_mods_info_dict_from_mod_name(mod_name).get("packing_type", "none")}".',
+            )
+            logger.log_message("Error: Valid packing type options are:")
+            for entry in PackingType:
+                logger.log_message(f'Error: "{entry.value}"')
+            invalid_packing_type_error = (
+                "Invalid packing type, or no packing type, provided for mod entry"
+            )
+            raise RuntimeError(invalid_packing_type_error)
 
+        if artifact_key:
+            artifact_cache.store_artifacts(artifact_key, get_mod_artifact_files(mod_name))
 
 
 def contains_source_dir(root: Path) -> bool:
@@ -575,6 +691,7 @@ def contains_source_dir(root: Path) -> bool:
     return any(p.name == "Source" for p in root.rglob("*") if p.is_dir())
 
 
+@timer.timed("pack")
 def package_project_iostore() -> None:
     if unreal_engine.is_game_ue4(settings.get_unreal_engine_dir()):
         package_project_iostore_ue4()
@@ -712,7 +829,7 @@ def build_cook() -> None:
     uproject_file = settings.get_uproject_file_or_raise()
     game_dir = utilities.get_game_dir_or_raise()
     is_game_iostore = unreal_engine.get_is_game_iostore(uproject_file, game_dir)
-    needs_engine_command_run = PackingType.ENGINE in queue_information.install_queue_types
+    needs_engine_command_run = PackingType.ENGINE in session.get_current_session().queue_information.install_queue_types
     does_iostore_needs_all_three_files = does_iostore_game_need_utoc_ucas()
 
     if needs_engine_command_run and does_iostore_needs_all_three_files and is_game_iostore:
@@ -744,8 +861,7 @@ def get_mod_files_asset_paths_for_loose_mods(mod_name: str) -> dict[Path, Path]:
         uproject_file, unreal_engine_dir,
     )
     game_dir = utilities.get_game_dir_or_raise()
-    mod_info = get_mod_pak_entry(mod_name)
-    for asset in mod_info.get("file_includes", {}).get("asset_paths", []):
+    for asset in collection_resolver.get_mod_asset_paths(mod_name):
         base_path = f"{cooked_uproject_dir}/{asset}"
         for extension in file_io.get_file_extensions(base_path):
             src_file = Path(f"{base_path}{extension}")
@@ -829,8 +945,7 @@ def get_mod_file_paths_for_manually_made_pak_mods_asset_paths(mod_name: str) ->
     cooked_uproject_dir = unreal_engine.get_cooked_uproject_dir(
         uproject_file, unreal_engine_dir,
     )
-    mod_info = get_mod_pak_entry(mod_name)
-    for asset in mod_info.get("file_includes", {}).get("asset_paths", []):
+    for asset in collection_resolver.get_mod_asset_paths(mod_name):
         base_path = f"{cooked_uproject_dir}/{asset}"
         for extension in file_io.get_file_extensions(base_path):
             src_path = Path(f"{base_path}{extension}")
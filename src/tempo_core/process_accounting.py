@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass, astuple, fields
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+from tempo_core import logger, settings, timer
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+@dataclass
+class ProcessRecord:
+    tool_name: str
+    command: str
+    started_at: float
+    wall_seconds: float
+    user_cpu_seconds: float
+    system_cpu_seconds: float
+    peak_rss_bytes: int
+    read_bytes: int
+    write_bytes: int
+    return_code: int | None
+
+
+@dataclass
+class ProcessTrend:
+    tool_name: str
+    run_count: int
+    latest: ProcessRecord
+    baseline_wall_seconds: float | None
+    slowdown_percent: float | None
+    is_regression: bool
+
+
+PROCESS_HISTORY_TABLE_COLUMNS = ", ".join(field.name for field in fields(ProcessRecord))
+
+PSUTIL_SAMPLE_INTERVAL_SECONDS = 0.1
+
+# ru_maxrss is reported in kilobytes on linux and bytes on macos
+RU_MAXRSS_MULTIPLIER = 1 if sys.platform == "darwin" else 1024
+
+# ru_inblock/ru_oublock count 512 byte blocks
+RUSAGE_BLOCK_SIZE = 512
+
+
+def get_process_history_db_path() -> Path:
+    return Path(settings.get_cache_directory() / "process_history.sqlite3")
+
+
+def get_process_history_connection() -> sqlite3.Connection:
+    import sqlite3
+
+    db_path = get_process_history_db_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS process_history ("
+        "tool_name TEXT NOT NULL, "
+        "command TEXT NOT NULL, "
+        "started_at REAL NOT NULL, "
+        "wall_seconds REAL NOT NULL, "
+        "user_cpu_seconds REAL NOT NULL, "
+        "system_cpu_seconds REAL NOT NULL, "
+        "peak_rss_bytes INTEGER NOT NULL, "
+        "read_bytes INTEGER NOT NULL, "
+        "write_bytes INTEGER NOT NULL, "
+        "return_code INTEGER)",
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS process_history_tool_name "
+        "ON process_history (tool_name, started_at)",
+    )
+    return connection
+
+
+def add_process_record_to_history(record: ProcessRecord) -> None:
+    import sqlite3
+
+    placeholders = ", ".join("?" for _ in fields(ProcessRecord))
+    try:
+        with get_process_history_connection() as connection:
+            connection.execute(
+                f"INSERT INTO process_history ({PROCESS_HISTORY_TABLE_COLUMNS}) VALUES ({placeholders})",
+                astuple(record),
+            )
+    except sqlite3.Error as error:
+        logger.log_message(f"Warning: could not record process history: {error}")
+
+
+def get_process_history(tool_name: str | None = None, limit: int | None = None) -> list[ProcessRecord]:
+    query = f"SELECT {PROCESS_HISTORY_TABLE_COLUMNS} FROM process_history"
+    parameters: list[str | int] = []
+    if tool_name:
+        query = f"{query} WHERE tool_name = ?"
+        parameters.append(tool_name)
+    query = f"{query} ORDER BY started_at DESC"
+    if limit:
+        query = f"{query} LIMIT ?"
+        parameters.append(limit)
+    with get_process_history_connection() as connection:
+        rows = connection.execute(query, parameters).fetchall()
+    return [ProcessRecord(*row) for row in reversed(rows)]
+
+
+def get_process_history_tool_names() -> list[str]:
+    with get_process_history_connection() as connection:
+        rows = connection.execute(
+            "SELECT DISTINCT tool_name FROM process_history ORDER BY tool_name",
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_process_trend(
+    tool_name: str,
+    baseline_run_count: int = 10,
+    slowdown_threshold_percent: float = 25.0,
+) -> ProcessTrend | None:
+    records = get_process_history(tool_name, limit=baseline_run_count + 1)
+    if not records:
+        return None
+    latest = records[-1]
+    baseline_records = [record for record in records[:-1] if record.return_code == 0]
+    baseline_wall_seconds = None
+    slowdown_percent = None
+    is_regression = False
+    if baseline_records:
+        baseline_wall_seconds = statistics.median(record.wall_seconds for record in baseline_records)
+        if baseline_wall_seconds > 0:
+            slowdown_percent = (latest.wall_seconds / baseline_wall_seconds - 1) * 100
+            is_regression = slowdown_percent > slowdown_threshold_percent
+    return ProcessTrend(
+        tool_name=tool_name,
+        run_count=len(records),
+        latest=latest,
+        baseline_wall_seconds=baseline_wall_seconds,
+        slowdown_percent=slowdown_percent,
+        is_regression=is_regression,
+    )
+
+
+class PsutilSampler:
+    """
+    Polls a process tree with psutil, used where wait4 is unavailable.
+    Cpu and io counters are kept per pid so children that exit between samples still count.
+    """
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.cpu_times: dict[int, tuple[float, float]] = {}
+        self.io_bytes: dict[int, tuple[int, int]] = {}
+        self.peak_rss_bytes = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"process_sampler_{pid}", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.thread.join()
+
+    def sample(self) -> None:
+        import psutil
+
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            return
+        total_rss = 0
+        for process in processes:
+            try:
+                with process.oneshot():
+                    cpu_times = process.cpu_times()
+                    self.cpu_times[process.pid] = (cpu_times.user, cpu_times.system)
+                    total_rss += process.memory_info().rss
+                    io_counters = process.io_counters()
+                    self.io_bytes[process.pid] = (io_counters.read_bytes, io_counters.write_bytes)
+            except (psutil.Error, AttributeError):
+                continue
+        self.peak_rss_bytes = max(self.peak_rss_bytes, total_rss)
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(PSUTIL_SAMPLE_INTERVAL_SECONDS)
+
+    def get_usage(self) -> tuple[float, float, int, int, int]:
+        user_cpu_seconds = sum(user for user, _ in self.cpu_times.values())
+        system_cpu_seconds = sum(system for _, system in self.cpu_times.values())
+        read_bytes = sum(read for read, _ in self.io_bytes.values())
+        write_bytes = sum(write for _, write in self.io_bytes.values())
+        return user_cpu_seconds, system_cpu_seconds, self.peak_rss_bytes, read_bytes, write_bytes
+
+
+def can_use_wait4() -> bool:
+    return hasattr(os, "wait4")
+
+
+def get_command_str(command: str | Sequence[str | Path]) -> str:
+    if isinstance(command, str):
+        return command
+    return " ".join(str(part) for part in command)
+
+
+def wait_for_accounted_process(
+    process: subprocess.Popen,
+    tool_name: str,
+    command: str | Sequence[str | Path],
+    started_at: float,
+    start_perf_counter: float,
+    sampler: PsutilSampler | None,
+) -> ProcessRecord:
+    """
+    Reaps the process and returns its resource usage.
+    On posix wait4 reports the whole tree the child waited on, including peak rss.
+    """
+    if sampler is None and can_use_wait4():
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        wall_seconds = time.perf_counter() - start_perf_counter
+        usage = (
+            rusage.ru_utime,
+            rusage.ru_stime,
+            rusage.ru_maxrss * RU_MAXRSS_MULTIPLIER,
+            rusage.ru_inblock * RUSAGE_BLOCK_SIZE,
+            rusage.ru_oublock * RUSAGE_BLOCK_SIZE,
+        )
+    else:
+        process.wait()
+        wall_seconds = time.perf_counter() - start_perf_counter
+        if sampler:
+            sampler.stop()
+            usage = sampler.get_usage()
+        else:
+            usage = (0.0, 0.0, 0, 0, 0)
+    user_cpu_seconds, system_cpu_seconds, peak_rss_bytes, read_bytes, write_bytes = usage
+    record = ProcessRecord(
+        tool_name=tool_name,
+        command=get_command_str(command),
+        started_at=started_at,
+        wall_seconds=wall_seconds,
+        user_cpu_seconds=user_cpu_seconds,
+        system_cpu_seconds=system_cpu_seconds,
+        peak_rss_bytes=peak_rss_bytes,
+        read_bytes=read_bytes,
+        write_bytes=write_bytes,
+        return_code=process.returncode,
+    )
+    add_process_record_to_history(record)
+    logger.log_message(
+        f"Process: {tool_name} took {wall_seconds:.2f}s wall, "
+        f"{user_cpu_seconds:.2f}s user, {system_cpu_seconds:.2f}s sys, "
+        f"{peak_rss_bytes / (1024 * 1024):.1f} MiB peak rss, "
+        f"{read_bytes} bytes read, {write_bytes} bytes written",
+    )
+    return record
+
+
+def read_stream_lines(stream: object, on_line: Callable[[str], None]) -> None:
+    for line in iter(stream.readline, ""):  # ty: ignore
+        on_line(line)
+    stream.close()  # ty: ignore
+
+
+def run_accounted_process(
+    command: str | Sequence[str | Path],
+    tool_name: str,
+    *,
+    cwd: Path | None = None,
+    shell: bool = False,
+    capture_output: bool = False,
+    on_output_line: Callable[[str], None] | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """
+    Runs a command to completion, recording its resource usage in the process history.
+    Output is either captured and returned, or passed line by line to on_output_line with stderr merged into stdout.
+    """
+    pipe_output = capture_output or on_output_line is not None
+    stdout_lines: list[str] = []
+    stderr_lines: list[str] = []
+    with timer.span(tool_name, category="process"):
+        started_at = time.time()
+        start_perf_counter = time.perf_counter()
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            shell=shell,
+            text=True,
+            stdout=subprocess.PIPE if pipe_output else None,
+            stderr=(subprocess.PIPE if capture_output else subprocess.STDOUT) if pipe_output else None,
+        )
+        sampler = None
+        if not can_use_wait4():
+            sampler = PsutilSampler(process.pid)
+            sampler.start()
+
+        reader_threads = []
+        if process.stdout:
+            stdout_handler = on_output_line if on_output_line and not capture_output else stdout_lines.append
+            reader_threads.append(
+                threading.Thread(target=read_stream_lines, args=(process.stdout, stdout_handler), daemon=True),
+            )
+        if process.stderr:
+            reader_threads.append(
+                threading.Thread(target=read_stream_lines, args=(process.stderr, stderr_lines.append), daemon=True),
+            )
+        for reader_thread in reader_threads:
+            reader_thread.start()
+        for reader_thread in reader_threads:
+            reader_thread.join()
+
+        wait_for_accounted_process(process, tool_name, command, started_at, start_perf_counter, sampler)
+
+    return subprocess.CompletedProcess(
+        args=command,
+        returncode=process.returncode,
+        stdout="".join(stdout_lines) if capture_output else None,
+        stderr="".join(stderr_lines) if capture_output else None,
+    )
@@ -1,45 +1,138 @@
-import os
-import shutil
-from pathlib import Path
-import subprocess
+from __future__ import annotations
 
-import psutil
+import time
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
-from tempo_core import settings
+from tempo_core import logger, settings
 from tempo_core.data_structures import HookStateType
 from tempo_core.programs import unreal_engine
 
+if TYPE_CHECKING:
+    import psutil
+
+    from tempo_core.hook_states import ProcessKillEvent
+
 
 def get_process_name(exe_path: Path) -> str:
     return exe_path.name
 
 
+# how long one pass over the process table is reused, hook states fired back to back share a snapshot
+PROCESS_SNAPSHOT_TTL = 0.5
+
+# single deadline for every process killed in one batch
+KILL_WAIT_TIMEOUT = 5.0
+
+
+@dataclass
+class ProcessSnapshot:
+    taken_at: float
+    processes_by_name: dict[str, list[psutil.Process]]
+    substring_matches: dict[str, list[psutil.Process]] = field(default_factory=dict)
+    # names as reported, by pid, the keys above are lowercased
+    process_names: dict[int, str] = field(default_factory=dict)
+
+    def get_processes_by_name(self, process_name: str) -> list[psutil.Process]:
+        return self.processes_by_name.get(process_name.lower(), [])
+
+    def get_processes_by_substring(self, substring: str) -> list[psutil.Process]:
+        substring = substring.lower()
+        matches = self.substring_matches.get(substring)
+        if matches is None:
+            matches = [
+                process
+                for name, processes in self.processes_by_name.items()
+                if substring in name
+                for process in processes
+            ]
+            self.substring_matches[substring] = matches
+        return matches
+
+
+@dataclass
+class ProcessSnapshotInformation:
+    snapshot: ProcessSnapshot | None
+    lock: threading.Lock
+
+
+process_snapshot_information = ProcessSnapshotInformation(snapshot=None, lock=threading.Lock())
+
+
+def take_process_snapshot() -> ProcessSnapshot:
+    import psutil
+
+    processes_by_name: dict[str, list[psutil.Process]] = {}
+    process_names: dict[int, str] = {}
+    for process in psutil.process_iter(["name"]):
+        process_name = process.info["name"]
+        if process_name:
+            processes_by_name.setdefault(process_name.lower(), []).append(process)
+            process_names[process.pid] = process_name
+    return ProcessSnapshot(
+        taken_at=time.monotonic(), processes_by_name=processes_by_name, process_names=process_names,
+    )
+
+
+def get_process_snapshot(max_age: float = PROCESS_SNAPSHOT_TTL) -> ProcessSnapshot:
+    with process_snapshot_information.lock:
+        snapshot = process_snapshot_information.snapshot
+        if snapshot is None or time.monotonic() - snapshot.taken_at > max_age:
+            snapshot = take_process_snapshot()
+            process_snapshot_information.snapshot = snapshot
+        return snapshot
+
+
+def invalidate_process_snapshot() -> None:
+    with process_snapshot_information.lock:
+        process_snapshot_information.snapshot = None
+
+
 def is_process_running(process_name: str) -> bool:
-    for proc in psutil.process_iter():
+    return bool(get_process_snapshot().get_processes_by_substring(process_name))
+
+
+def kill_process_batch(
+    processes: list[psutil.Process],
+    timeout: float = KILL_WAIT_TIMEOUT,
+    *,
+    force: bool = True,
+) -> list[psutil.Process]:
+    """
+    Signals every process, then waits for all of them against one shared timeout.
+    Returns the processes still alive afterwards.
+    """
+    import psutil
+
+    unique_processes = list({process.pid: process for process in processes}.values())
+    if not unique_processes:
+        return []
+    for process in unique_processes:
         try:
-            if process_name.lower() in proc.name().lower():
-                return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            if force:
+                process.kill()
+            else:
+                process.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
             pass
-    return False
+    _, alive = psutil.wait_procs(unique_processes, timeout=timeout)
+    invalidate_process_snapshot()
+    for process in alive:
+        logger.log_message(f"Warning: process {process.pid} did not exit within {timeout} seconds")
+    return alive
 
 
 def kill_process(process_name: str) -> None:
-    taskkill_path = shutil.which("taskkill")
-
-    if taskkill_path:
-        subprocess.run([taskkill_path, "/F", "/IM", process_name], check=False)
-    else:
-        taskkill_exe_not_found_error = "taskkill.exe not found."
-        raise FileNotFoundError(taskkill_exe_not_found_error)
+    kill_process_batch(get_process_snapshot().get_processes_by_name(process_name))
 
 
 def get_processes_by_substring(substring: str) -> list:
-    all_processes = psutil.process_iter(["pid", "name"])
+    snapshot = get_process_snapshot()
     return [
-        proc.info
-        for proc in all_processes
-        if substring.lower() in proc.info["name"].lower()
+        {"pid": process.pid, "name": snapshot.process_names[process.pid]}
+        for process in snapshot.get_processes_by_substring(substring)
     ]
 
 
@@ -48,19 +141,23 @@ def get_process_kill_events() -> list:
     return value_to_return
 
 
+def kill_process_events(process_kill_events: list[ProcessKillEvent]) -> None:
+    snapshot = get_process_snapshot()
+    processes_to_kill = []
+    for process_kill_event in process_kill_events:
+        if process_kill_event.use_substring_check:
+            processes_to_kill.extend(snapshot.get_processes_by_substring(process_kill_event.process_name))
+        else:
+            processes_to_kill.extend(snapshot.get_processes_by_name(process_kill_event.process_name))
+    kill_process_batch(processes_to_kill)
+
+
 def kill_processes(state: HookStateType) -> None:
-    current_state = state.value if isinstance(state, HookStateType) else state
-    for process_info in get_process_kill_events():
-        target_state = process_info.get("hook_state")
-        if target_state == current_state:
-            if process_info["use_substring_check"]:
-                proc_name_substring = process_info["process_name"]
-                for proc_info in get_processes_by_substring(proc_name_substring):
-                    proc_name = proc_info["name"]
-                    kill_process(proc_name)
-            else:
-                proc_name = process_info["process_name"]
-                kill_process(proc_name)
+    from tempo_core import hook_states
+
+    hook_state_events = hook_states.get_hook_state_events(state)
+    if hook_state_events:
+        kill_process_events(hook_state_events.process_kill_events)
 
 
 def get_game_process_name() -> str:
@@ -68,19 +165,8 @@ def get_game_process_name() -> str:
 
 
 def close_programs(exe_names: list[str]) -> None:
-    results = {}
-
+    snapshot = get_process_snapshot()
+    processes_to_close = []
     for exe_name in exe_names:
-        found = False
-        for proc in psutil.process_iter(["pid", "name"]):
-            try:
-                if proc.info["name"] and proc.info["name"].lower() == exe_name.lower():
-                    proc.terminate()
-                    proc.wait(timeout=5)
-                    found = True
-                    results[exe_name] = "Closed"
-                    break
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                pass
-        if not found:
-            results[exe_name] = "Not Found"
+        processes_to_close.extend(snapshot.get_processes_by_name(exe_name))
+    kill_process_batch(processes_to_close, force=False)
@@ -1,21 +1,23 @@
 import os
-import requests
 from pathlib import Path
 
 from tempo_core import logger, online_check
 
-default_current_dir = Path.cwd()
-
 def download_files_from_github_repo(
     repo_url: str,
     repo_branch: str = "master",
     file_paths: list[str] | None = None,
-    output_directory: Path = default_current_dir,
+    output_directory: Path | None = None,
 ) -> None:
     if not file_paths or len(file_paths) == 0:
         return
-    if not online_check.is_online:
+    if not online_check.get_is_online():
         raise RuntimeError('You are not able to download files from github repos when not connected to the web.')
+    if output_directory is None:
+        output_directory = Path.cwd()
+
+    import requests
+
     try:
         parts = repo_url.strip("/").split("/")
         user, repo = parts[-2], parts[-1]
@@ -1,14 +1,11 @@
 import os
 import re
 from pathlib import Path
-import subprocess
 import json
 
-from tempo_core import settings, logger, manager, env
+from tempo_core import settings, logger, manager, env, process_accounting
 from tempo_core.data_structures import UnrealEngineVersion
 
-from tempo_binary_tools import patternsleuth
-
 
 AES_KEY_REGEX = re.compile(r'\b0x[0-9a-fA-F]{64}\b')
 
@@ -21,9 +18,7 @@ def run_patternsleuth_aes_key_scan_command(
         game_exe_path = settings.get_game_exe_path_or_raise()
 
     if not patternsleuth_exe:
-        tool_info = patternsleuth.PatternsleuthToolInfo(cache=manager.tools_cache)
-        tool_info.ensure_tool_installed()
-        patternsleuth_exe = Path(tool_info.get_executable_path())
+        patternsleuth_exe = manager.get_tool_executable("patternsleuth")
 
     command: list[str] = [
         str(patternsleuth_exe),
@@ -34,12 +29,10 @@ def run_patternsleuth_aes_key_scan_command(
         str(game_exe_path),
     ]
 
-    result = subprocess.run(
+    result = process_accounting.run_accounted_process(
         command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
+        patternsleuth_exe.name,
+        capture_output=True,
     )
 
     output = f"{result.stdout}\n{result.stderr}"
@@ -77,9 +70,7 @@ def run_patternsleuth_engine_version_scan_command(
         game_exe_path = settings.get_game_exe_path_or_raise()
 
     if not patternsleuth_exe:
-        tool_info = patternsleuth.PatternsleuthToolInfo(cache=manager.tools_cache)
-        tool_info.ensure_tool_installed()
-        patternsleuth_exe = Path(tool_info.get_executable_path())
+        patternsleuth_exe = manager.get_tool_executable("patternsleuth")
 
     command: list[str] = [
         str(patternsleuth_exe),
@@ -90,12 +81,10 @@ def run_patternsleuth_engine_version_scan_command(
         str(game_exe_path),
     ]
 
-    result = subprocess.run(
+    result = process_accounting.run_accounted_process(
         command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
+        patternsleuth_exe.name,
+        capture_output=True,
     )
 
     output = f"{result.stdout}\n{result.stderr}"
@@ -131,9 +120,7 @@ def run_patternsleuth_build_configuration_scan_command(
         game_exe_path = settings.get_game_exe_path_or_raise()
 
     if not patternsleuth_exe:
-        tool_info = patternsleuth.PatternsleuthToolInfo(cache=manager.tools_cache)
-        tool_info.ensure_tool_installed()
-        patternsleuth_exe = Path(tool_info.get_executable_path())
+        patternsleuth_exe = manager.get_tool_executable("patternsleuth")
 
     command: list[str] = [
         str(patternsleuth_exe),
@@ -144,12 +131,10 @@ def run_patternsleuth_build_configuration_scan_command(
         str(game_exe_path),
     ]
 
-    result = subprocess.run(
+    result = process_accounting.run_accounted_process(
         command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
+        patternsleuth_exe.name,
+        capture_output=True,
     )
 
     output = f"{result.stdout}\n{result.stderr}"
@@ -5,8 +5,6 @@ from pathlib import Path
 
 from tempo_core import settings, app_runner, data_structures, manager
 
-from tempo_binary_tools import repak
-
 
 class RepakCompressionType(Enum):
     """
@@ -21,9 +19,7 @@ class RepakCompressionType(Enum):
 
 
 def run_repak_pack_command(input_directory: Path, output_pak_file: Path) -> None:
-    tool_info = repak.RepakToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    repak_path = tool_info.get_executable_path()
+    repak_path = manager.get_tool_executable("repak")
     args = [
         'pack',
         f'"{input_directory}"',
@@ -1,12 +1,9 @@
 import os
 import shutil
 from pathlib import Path
-import subprocess
 
 from tempo_core.programs import unreal_pak
-from tempo_core import settings, data_structures, utilities, logger, app_runner, manager
-
-from tempo_binary_tools import retoc
+from tempo_core import settings, data_structures, utilities, logger, app_runner, manager, timer, process_accounting
 
 
 def run_retoc_to_zen_command(
@@ -19,9 +16,7 @@ def run_retoc_to_zen_command(
 
     logger.log_message(unreal_version.get_retoc_unreal_version_str())
 
-    tool_info = retoc.RetocToolInfo(cache=manager.tools_cache)
-    tool_info.ensure_tool_installed()
-    tool_path = tool_info.get_executable_path()
+    tool_path = manager.get_tool_executable("retoc")
 
     command = [
         tool_path,
@@ -31,7 +26,7 @@ def run_retoc_to_zen_command(
         "--version",
         unreal_version.get_retoc_unreal_version_str(),
     ]
-    subprocess.run(command)
+    process_accounting.run_accounted_process(command, Path(tool_path).name)
 
     output_pak = output_utoc.with_suffix(".pak")
     output_ucas = output_utoc.with_suffix(".ucas")
@@ -44,6 +39,7 @@ def run_retoc_to_zen_command(
     return file_paths
 
 
+@timer.timed("pack")
 def make_retoc_mod(mod_name: str, dest_pak_file: Path, *, use_symlinks: bool) -> None:
     from tempo_core import packing
     old_ucas = dest_pak_file.with_suffix(".ucas")
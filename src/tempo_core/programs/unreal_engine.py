@@ -1,9 +1,8 @@
-from tempo_core.utilities import get_uproject_dir_or_raise
 import os
 import json
 from pathlib import Path
 
-from tempo_core import file_io, process_management, settings, data_structures
+from tempo_core import file_io, process_management, settings, data_structures, utilities
 from tempo_core.data_structures import PackagingDirType, UnrealEngineVersion, unreal_engine_build_targets
 
 
@@ -223,7 +222,7 @@ def get_build_script_path() -> Path:
 
 # allow this to be specified within the config file as well and use the config value instead of checking the cs files if supplied
 def get_main_build_target_name_or_raise() -> str:
-    uproject_dir = get_uproject_dir_or_raise()
+    uproject_dir = utilities.get_uproject_dir_or_raise()
     src_dir = uproject_dir / "Source"
 
     if not src_dir.is_dir():
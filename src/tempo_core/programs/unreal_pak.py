@@ -5,7 +5,7 @@ from pathlib import Path
 import tempo_core.settings
 import tempo_core.app_runner
 from tempo_core.programs import unreal_engine
-from tempo_core import file_io, packing, utilities, logger
+from tempo_core import file_io, packing, utilities, logger, timer
 from tempo_core.data_structures import CompressionType
 
 
@@ -304,6 +304,7 @@ def make_ue5_iostore_mods(
 
 
 # at this point it seems mostly done outside of intermediary pak location/symlink support, as well as ubulk copying from the uproject
+@timer.timed("pack")
 def make_iostore_unreal_pak_mod(
     *,
     exe_path: Path,
@@ -333,6 +334,7 @@ def make_iostore_unreal_pak_mod(
         )
 
 
+@timer.timed("pack")
 def make_non_iostore_unreal_pak_mod(
     *,
     exe_path: Path,
@@ -403,25 +405,33 @@ def install_unreal_pak_mod(
         )
 
 
+@timer.timed("stage")
 def move_files_for_packing(mod_name: str) -> None:
     from tempo_core import settings
 
     should_use_progress_bars = settings.should_show_progress_bars()
     mod_files_dict = packing.get_mod_file_paths_for_manually_made_pak_mods(mod_name)
     mod_files_dict = utilities.filter_file_paths(mod_files_dict)
+    # files already staged with the same contents are left as they are, checked in one parallel batch
+    unchanged_src_files = file_io.get_unchanged_file_pairs(mod_files_dict)
 
-    def copy_files() -> None:
-        for src_file, dest_file in mod_files_dict.items():
-            dest_dir = dest_file.parent
+    def stage_file(src_file: Path, dest_file: Path) -> None:
+        if src_file in unchanged_src_files:
+            return
+        dest_dir = dest_file.parent
 
-            if dest_file.exists():
-                if not file_io.get_do_files_have_same_hash(src_file, dest_file):
-                    dest_file.unlink()
-            elif not dest_dir.is_dir():
-                dest_dir.mkdir(parents=True)
+        if dest_file.exists():
+            dest_file.unlink()
+        elif not dest_dir.is_dir():
+            dest_dir.mkdir(parents=True)
 
-            if src_file.is_file():
-                shutil.copy2(src_file, dest_file)
+        if src_file.is_file():
+            shutil.copy2(src_file, dest_file)
+            timer.add_bytes_processed(src_file.stat().st_size)
+
+    def copy_files() -> None:
+        for src_file, dest_file in mod_files_dict.items():
+            stage_file(src_file, dest_file)
 
     if should_use_progress_bars:
         from rich.progress import Progress
@@ -431,17 +441,7 @@ def move_files_for_packing(mod_name: str) -> None:
                 f"[green]Copying files for {mod_name} mod...", total=len(mod_files_dict),
             )
             for src_file, dest_file in mod_files_dict.items():
-                dest_dir = dest_file.parent
-
-                if dest_file.exists():
-                    if not file_io.get_do_files_have_same_hash(src_file, dest_file):
-                        dest_file.unlink()
-                elif not dest_dir.is_dir():
-                    dest_dir.mkdir(parents=True)
-
-                if src_file.is_file():
-                    shutil.copy2(src_file, dest_file)
-
+                stage_file(src_file, dest_file)
                 progress.update(task, advance=1)
     else:
         copy_files()
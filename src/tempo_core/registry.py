@@ -1,6 +1,6 @@
 import os
+import sys
 import itertools
-import winreg
 from pathlib import Path
 from uuid import UUID
 from dataclasses import replace
@@ -9,9 +9,15 @@ from tempo_core.programs import unreal_engine
 from tempo_core.data_structures import UnrealEngineVersion
 from tempo_core import logger
 
+if sys.platform == "win32":
+    import winreg
+
 
 def get_unreal_installs_from_registry() -> dict[UnrealEngineVersion | UUID, Path]:
     installs = {}
+    # only windows has a registry, elsewhere engines are found through the config and env vars
+    if sys.platform != "win32":
+        return installs
 
     # Machine-wide installs (Epic Games Launcher)
     machine_paths = [
@@ -72,6 +78,8 @@ def get_unreal_installs_from_registry() -> dict[UnrealEngineVersion | UUID, Path
 
 
 def remove_invalid_unreal_engine_registry_entries() -> None:
+    if sys.platform != "win32":
+        return
     # Machine-wide installs
     machine_paths = [
         r"SOFTWARE\EpicGames\Unreal Engine",
@@ -0,0 +1,149 @@
+"""
+The state a run works on for one project, its settings, mod queues, hook state, game and engine monitors,
+resolved tools and staging workspace, owned by a TempoSession instead of module globals.
+
+Module level names like settings.settings_information keep working and resolve to the current session,
+the one set with use_session in this context, or the default session when none was set. An orchestrator
+can give each project its own session and drive them from separate threads in one process.
+Caches keyed by file path and validated by mtime, like the ini, config line and collection caches,
+stay shared between sessions, so every session reuses what the others have already loaded.
+The run workspace and its lock are process wide too, each session stages into its own directory inside it.
+"""
+
+from __future__ import annotations
+
+import threading
+import functools
+import contextlib
+import contextvars
+from pathlib import Path
+from dataclasses import dataclass, field
+from collections.abc import Callable, Generator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tempo_binary_tool_manager.manager import ToolsCache
+    from tempo_settings.tempo_settings import SettingsInformation
+
+    from tempo_core.hook_states import HookDispatchTable, HookStateInfo
+    from tempo_core.packing import QueueInformation
+    from tempo_core.threads.game_monitor import GameMonitorThreadInformation
+    from tempo_core.threads.thread_engine_monitor import EngineMonitorThreadInformation
+
+
+@dataclass
+class TempoSession:
+    name: str = "default"
+    # state objects by name, each made on first use by the module that owns its type
+    states: dict[str, object] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get_state[T](self, state_name: str, factory: Callable[[], T]) -> T:
+        state = self.states.get(state_name)
+        if state is None:
+            # made outside the lock, factories read other state of this session and the lock is not reentrant,
+            # when two threads race the first one to publish wins
+            new_state = factory()
+            with self.lock:
+                state = self.states.setdefault(state_name, new_state)
+        return state  # ty: ignore
+
+    def set_state(self, state_name: str, state: object) -> None:
+        with self.lock:
+            self.states[state_name] = state
+
+    def drop_state(self, state_name: str) -> None:
+        with self.lock:
+            self.states.pop(state_name, None)
+
+    @property
+    def settings_information(self) -> SettingsInformation:
+        from tempo_core import settings
+
+        return self.get_state("settings_information", settings.new_settings_information)
+
+    @property
+    def queue_information(self) -> QueueInformation:
+        from tempo_core import packing
+
+        return self.get_state("queue_information", packing.new_queue_information)
+
+    @property
+    def command_queue(self) -> list:
+        return self.get_state("command_queue", list)
+
+    @property
+    def hook_state_info(self) -> HookStateInfo:
+        from tempo_core import hook_states
+
+        return self.get_state("hook_state_info", hook_states.new_hook_state_info)
+
+    @property
+    def hook_dispatch_table(self) -> HookDispatchTable:
+        from tempo_core import hook_states
+
+        return self.get_state("hook_dispatch_table", hook_states.new_hook_dispatch_table)
+
+    @property
+    def game_monitor_thread_information(self) -> GameMonitorThreadInformation:
+        from tempo_core.threads import game_monitor
+
+        return self.get_state("game_monitor_thread_information", game_monitor.new_game_monitor_thread_information)
+
+    @property
+    def engine_monitor_thread_information(self) -> EngineMonitorThreadInformation:
+        from tempo_core.threads import thread_engine_monitor
+
+        return self.get_state(
+            "engine_monitor_thread_information", thread_engine_monitor.new_engine_monitor_thread_information,
+        )
+
+    @property
+    def tools_cache(self) -> ToolsCache:
+        from tempo_core import manager
+
+        return self.get_state("tools_cache", manager.new_tools_cache)
+
+    @property
+    def tool_executable_paths(self) -> dict[str, Path]:
+        return self.get_state("tool_executable_paths", dict)
+
+    @property
+    def workspace_dir(self) -> Path:
+        from tempo_core import workspace
+
+        return self.get_state("workspace_dir", functools.partial(workspace.new_session_workspace_dir, self.name))
+
+
+default_session = TempoSession()
+
+current_session: contextvars.ContextVar[TempoSession | None] = contextvars.ContextVar("tempo_session", default=None)
+
+
+def get_current_session() -> TempoSession:
+    return current_session.get() or default_session
+
+
+@contextlib.contextmanager
+def use_session(session: TempoSession) -> Generator[TempoSession, None, None]:
+    """Makes session the current one for the block, in this thread or task only."""
+    token = current_session.set(session)
+    try:
+        yield session
+    finally:
+        current_session.reset(token)
+
+
+def bind_to_current_session[**P, R](function: Callable[P, R]) -> Callable[P, R]:
+    """
+    Wraps function to run in the session that is current now. New threads start outside any session,
+    so anything handed to another thread that reads session state goes through this.
+    """
+    bound_session = get_current_session()
+
+    @functools.wraps(function)
+    def run_in_session(*args: P.args, **kwargs: P.kwargs) -> R:
+        with use_session(bound_session):
+            return function(*args, **kwargs)
+
+    return run_in_session
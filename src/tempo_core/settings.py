@@ -1,4 +1,4 @@
-from typing import final
+from typing import TYPE_CHECKING, final
 import os
 import sys
 import json
@@ -8,19 +8,35 @@ import subprocess
 from pathlib import Path
 
 from tempo_core.programs import unreal_engine
-from tempo_core import data_structures, file_io, logger, process_management, utilities, registry
+from tempo_core import data_structures, file_io, logger, process_management, session, utilities, registry
 
 from tempo_settings.tempo_settings import SettingSpecificInfo, SettingsInformation, SettingsOrigin
 
 
-settings_information = SettingsInformation(
-    settings={},
-    init_settings_done=False,
-    config_file_dir=SettingSpecificInfo(None, None),
-    program_dir=SettingSpecificInfo(None, None),
-    mod_names=set(),
-    config_file=SettingSpecificInfo(None, None),
-)
+def new_settings_information() -> SettingsInformation:
+    return SettingsInformation(
+        settings={},
+        init_settings_done=False,
+        config_file_dir=SettingSpecificInfo(None, None),
+        program_dir=SettingSpecificInfo(None, None),
+        mod_names=set(),
+        config_file=SettingSpecificInfo(None, None),
+    )
+
+
+def get_settings_information() -> SettingsInformation:
+    return session.get_current_session().settings_information
+
+
+if TYPE_CHECKING:
+    settings_information: SettingsInformation
+
+
+def __getattr__(name: str) -> object:
+    # keeps settings.settings_information working for existing callers, it is the current session's
+    if name == "settings_information":
+        return get_settings_information()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def init_settings(config_file_path: Path) -> None:
@@ -28,8 +44,8 @@ def init_settings(config_file_path: Path) -> None:
         raw_settings = json.load(file)
     # raw_settings = Dynaconf(settings_files=[config_file_path])
     # settings_information.settings = configs.DynamicSettings(raw_settings)
-    settings_information.settings = raw_settings
-    settings = settings_information.settings
+    get_settings_information().settings = raw_settings
+    settings = get_settings_information().settings
     process_name = Path(settings.get("game_info", {}).get("game_exe_path", "")).name
     # window_management.change_window_name(settings["general_info"]["window_title"])
     auto_close_game = settings.get("process_kill_events", {}).get(
@@ -64,28 +80,32 @@ def init_settings(config_file_path: Path) -> None:
                     raise FileNotFoundError("Neither pkill nor killall found.")
         else:
             raise NotImplementedError(f"Unsupported OS: {current_os}")
-    settings_information.init_settings_done = True
-    settings_information.config_file = SettingSpecificInfo(
+    get_settings_information().init_settings_done = True
+    get_settings_information().config_file = SettingSpecificInfo(
         path=Path(config_file_path), origin=SettingsOrigin.COMMAND_LINE,
     )
-    settings_information.config_file_dir = SettingSpecificInfo(
+    get_settings_information().config_file_dir = SettingSpecificInfo(
         path=Path(config_file_path).parent, origin=SettingsOrigin.COMMAND_LINE,
     )
 
+    from tempo_core import hook_states
+
+    hook_states.compile_hook_dispatch_table()
+
 
 def load_settings(config_file: Path) -> None:
     logger.log_message(f"settings json: {config_file}")
-    if not settings_information.init_settings_done:
+    if not get_settings_information().init_settings_done:
         init_settings(config_file)
 
 
 def get_unreal_engine_dir() -> Path | None:
-    unreal_engine_directory = settings_information.settings.get("engine_info", {}).get(
+    unreal_engine_directory = get_settings_information().settings.get("engine_info", {}).get(
         "unreal_engine_dir", None,
     )
     if unreal_engine_directory and not unreal_engine_directory.is_absolute():
         unreal_engine_directory = Path(
-            str(settings_information.config_file_dir.path), unreal_engine_directory,
+            str(get_settings_information().config_file_dir.path), unreal_engine_directory,
         )
     else:
         unreal_version = get_unreal_engine_version(engine_path=None)
@@ -169,12 +189,12 @@ def is_loose_packing_enum_in_use() -> bool:
 
 def get_game_exe_path() -> Path | None:
     game_exe_path = Path(
-        settings_information.settings.get("game_info", {}).get(
+        get_settings_information().settings.get("game_info", {}).get(
     "game_exe_path", None,
 ))
     if game_exe_path and not game_exe_path.is_absolute():
         game_exe_path = Path(
-            str(settings_information.config_file_dir.path), game_exe_path,
+            str(get_settings_information().config_file_dir.path), game_exe_path,
         )
     if game_exe_path:
         return game_exe_path
@@ -189,25 +209,25 @@ def get_game_exe_path_or_raise() -> Path:
 
 
 def get_git_info_repo_path() -> Path | None:
-    raw_path = settings_information.settings.get("git_info", {}).get("repo_path", None)
+    raw_path = get_settings_information().settings.get("git_info", {}).get("repo_path", None)
     if not raw_path:
         return None
 
     if not raw_path.is_absolute():
         return Path(
-            str(settings_information.config_file_dir.path), raw_path,
+            str(get_settings_information().config_file_dir.path), raw_path,
         ).resolve()
     else:
         return raw_path.resolve()
 
 
 def get_game_launcher_exe_path() -> Path | None:
-    game_launcher_exe_path = settings_information.settings.get("game_info", {}).get(
+    game_launcher_exe_path = get_settings_information().settings.get("game_info", {}).get(
         "game_launcher_exe", None,
     )
     if game_launcher_exe_path and not game_launcher_exe_path.is_absolute():
         game_launcher_exe_path = Path(
-            str(settings_information.config_file_dir.path), game_launcher_exe_path,
+            str(get_settings_information().config_file_dir.path), game_launcher_exe_path,
         )
     if game_launcher_exe_path:
         return game_launcher_exe_path
@@ -215,8 +235,8 @@ def get_game_launcher_exe_path() -> Path | None:
 
 
 def get_uproject_file() -> Path | None:
-    raw_path = Path(settings_information.settings.get("engine_info", {}).get("unreal_project_file", None))
-    settings_dir = settings_information.config_file_dir.path
+    raw_path = Path(get_settings_information().settings.get("engine_info", {}).get("unreal_project_file", None))
+    settings_dir = get_settings_information().config_file_dir.path
 
     if not settings_dir:
         raise RuntimeError('Settings dir error, from get uproject file')
@@ -255,7 +275,7 @@ def get_uproject_name_or_raise() -> str:
 
 
 def get_cleanup_repo_path() -> Path | None:
-    raw_path = settings_information.settings.get("git_info", {}).get("repo_path", None)
+    raw_path = get_settings_information().settings.get("git_info", {}).get("repo_path", None)
     if not raw_path:
         return None
 
@@ -263,14 +283,14 @@ def get_cleanup_repo_path() -> Path | None:
 
     if not raw_path.is_absolute():
         return Path(
-            str(settings_information.config_file_dir.path), raw_path,
+            str(get_settings_information().config_file_dir.path), raw_path,
         ).resolve()
     else:
         return raw_path.resolve()
 
 
 def get_window_title_override() -> str | None:
-    return settings_information.settings.get("game_info", {}).get(
+    return get_settings_information().settings.get("game_info", {}).get(
         "window_title_override", None,
     )
 
@@ -281,7 +301,7 @@ def get_engine_building_args() -> list:
         "-nodebuginfo",
         "-noP4",
     ]
-    return settings_information.settings.get("engine_info", {}).get(
+    return get_settings_information().settings.get("engine_info", {}).get(
         "engine_building_args", default_args,
     )
 
@@ -302,7 +322,7 @@ def get_engine_packaging_args() -> list:
         "-compressed",
     ]
     default_args.append(arg_to_append)
-    return settings_information.settings.get("engine_info", {}).get(
+    return get_settings_information().settings.get("engine_info", {}).get(
         "engine_packaging_args", default_args,
     )
 
@@ -320,13 +340,13 @@ def get_engine_cooking_args() -> list:
         "-noP4",
     ]
     default_args.append(arg_to_append)
-    return settings_information.settings.get("engine_info", {}).get(
+    return get_settings_information().settings.get("engine_info", {}).get(
         "engine_cooking_args", default_args,
     )
 
 
 def get_window_management_events() -> dict:
-    return settings_information.settings.get("window_management_events", [])
+    return get_settings_information().settings.get("window_management_events", [])
 
 
 def get_persistent_mods_dir() -> Path:
@@ -337,10 +357,10 @@ def get_persistent_mods_dir() -> Path:
     persistent_dir_from_settings_file = get_mods_info_dict_from_json().get("persistent_files_directory", None)
     if persistent_dir_from_settings_file and not persistent_dir_from_settings_file.is_absolute():
         persistent_dir_from_settings_file = Path(
-            f"{settings_information.config_file_dir.path}/{persistent_dir_from_settings_file}",
+            f"{get_settings_information().config_file_dir.path}/{persistent_dir_from_settings_file}",
         )
     default_dir = Path(
-        f"{settings_information.config_file_dir.path}/Modding/mod_packaging/persistent_files",
+        f"{get_settings_information().config_file_dir.path}/Modding/mod_packaging/persistent_files",
     )
     final_dir = Path(
         env_dir or persistent_dir_from_settings_file or default_dir,
@@ -354,7 +374,7 @@ def get_persistent_mod_dir(mod_name: str) -> Path:
     mod_info = utilities.get_mod_info_from_mod_name(mod_name)
     dir_override = mod_info.get("persistent_files_directory", None)
     if dir_override and not dir_override.absolute():
-        dir_override = Path(settings_information.config_file_dir.path / dir_override)
+        dir_override = Path(get_settings_information().config_file_dir.path / dir_override)
     final_dir = dir_override or default_dir
     if isinstance(final_dir, Path):
         final_dir.mkdir(parents=True, exist_ok=True)
@@ -362,13 +382,13 @@ def get_persistent_mod_dir(mod_name: str) -> Path:
 
 
 def get_alt_packing_dir_name() -> str | None:
-    return settings_information.settings.get("packaging_uproject_name", {}).get(
+    return get_settings_information().settings.get("packaging_uproject_name", {}).get(
         "name", None,
     )
 
 
 def get_mods_info_dict_from_json() -> dict:
-    return settings_information.settings.get("mods_info", {})
+    return get_settings_information().settings.get("mods_info", {})
 
 
 def get_should_mod_auto_include_mod_name_dir_name(mod_name: str) -> bool:
@@ -377,24 +397,24 @@ def get_should_mod_auto_include_mod_name_dir_name(mod_name: str) -> bool:
 
 
 def get_exec_events() -> list:
-    return settings_information.settings.get("exec_events", [])
+    return get_settings_information().settings.get("exec_events", [])
 
 
 def get_ide_path() -> Path | None:
-    raw_path = settings_information.settings.get("optionals", {}).get("ide_path", None)
+    raw_path = get_settings_information().settings.get("optionals", {}).get("ide_path", None)
     if not raw_path:
         return None
 
     if not raw_path.is_absolute():
         return Path(
-            str(settings_information.config_file_dir.path), raw_path,
+            str(get_settings_information().config_file_dir.path), raw_path,
         ).resolve()
     else:
         return raw_path.resolve()
 
 
 def get_blender_path() -> Path | None:
-    raw_path = settings_information.settings.get("optionals", {}).get(
+    raw_path = get_settings_information().settings.get("optionals", {}).get(
         "blender_path", None,
     )
     if not raw_path:
@@ -402,33 +422,33 @@ def get_blender_path() -> Path | None:
 
     if not raw_path.is_absolute():
         return Path(
-            str(settings_information.config_file_dir.path), raw_path,
+            str(get_settings_information().config_file_dir.path), raw_path,
         ).resolve()
     else:
         return Path(raw_path).resolve()
 
 
 def get_game_info_launch_type_enum_str_value() -> str:
-    return settings_information.settings["game_info"]["launch_type"]
+    return get_settings_information().settings["game_info"]["launch_type"]
 
 
 def get_game_id() -> int:
-    return settings_information.settings["game_info"]["game_id"]
+    return get_settings_information().settings["game_info"]["game_id"]
 
 
 def get_game_launch_params() -> list[str]:
-    return settings_information.settings.get("game_info", {}).get("launch_params", [])
+    return get_settings_information().settings.get("game_info", {}).get("launch_params", [])
 
 
 def get_engine_launch_args() -> list:
-    return settings_information.settings.get("engine_info", {}).get(
+    return get_settings_information().settings.get("engine_info", {}).get(
         "engine_launch_args", [],
     )
 
 
 # Debug, DebugGame, Development, Shipping, Test, Unknown
 def get_build_configuration_state() -> str:
-    return settings_information.settings.get("engine_info", {}).get(
+    return get_settings_information().settings.get("engine_info", {}).get(
         "build_type", "Shipping",
     )
 
@@ -439,8 +459,8 @@ def get_build_configuration_state() -> str:
 # add other ways to grab this later, like patternsleuth through game scan
 
 def get_unreal_engine_version_from_config() -> data_structures.UnrealEngineVersion | None:
-    config_valid_major_version = settings_information.settings.get("engine_info", {}).get("unreal_engine_major_version", None)
-    config_valid_minor_version = settings_information.settings.get("engine_info", {}).get("unreal_engine_minor_version", None)
+    config_valid_major_version = get_settings_information().settings.get("engine_info", {}).get("unreal_engine_major_version", None)
+    config_valid_minor_version = get_settings_information().settings.get("engine_info", {}).get("unreal_engine_minor_version", None)
     if config_valid_major_version and config_valid_minor_version:
         return data_structures.UnrealEngineVersion(
             major_version=int(config_valid_major_version),
@@ -486,20 +506,20 @@ def get_unreal_engine_version(
     if auto_detected_version:
         return auto_detected_version
     
-    if not settings_information.config_file.path:
+    if not get_settings_information().config_file.path:
         raise FileNotFoundError('Could not locate your config file in the settings_information.')
 
-    output_path = Path(settings_information.config_file.path.parent / "Modding")
+    output_path = Path(get_settings_information().config_file.path.parent / "Modding")
     pattern_sleuth_unreal_engine_version = pattern_sleuth.dump_engine_version(
-        settings_information.config_file.path,
+        get_settings_information().config_file.path,
         output_path,
         True,
     )
 
 
     if pattern_sleuth_unreal_engine_version:
-        settings_information.settings.get("engine_info", {})["unreal_engine_major_version"] = pattern_sleuth_unreal_engine_version.major_version
-        settings_information.settings.get("engine_info", {})["unreal_engine_minor_version"] = pattern_sleuth_unreal_engine_version.minor_version
+        get_settings_information().settings.get("engine_info", {})["unreal_engine_major_version"] = pattern_sleuth_unreal_engine_version.major_version
+        get_settings_information().settings.get("engine_info", {})["unreal_engine_minor_version"] = pattern_sleuth_unreal_engine_version.minor_version
         return pattern_sleuth_unreal_engine_version
 
     return None
@@ -513,9 +533,20 @@ def get_unreal_engine_version_or_raise(engine_path: Path | None) -> data_structu
 
 
 def get_temp_directory() -> Path:
-    temp_dir = Path(file_io.SCRIPT_DIR / "temp")
-    temp_dir.mkdir(parents=True, exist_ok=True)
-    return temp_dir
+    # each session of each run gets its own dir in temp, so concurrent runs and sessions do not stage over each other
+    from tempo_core import workspace
+
+    return workspace.get_session_workspace_dir()
+
+
+def get_cache_directory() -> Path:
+    from tempo_core import manager
+
+    return Path(manager.get_tools_cache().get_cache_dir())
+
+
+def get_locks_directory() -> Path:
+    return Path(get_cache_directory() / "locks")
 
 
 # want to use this instead, but it tends to give permission errors
@@ -537,7 +568,7 @@ def is_linux() -> bool:
 
 def get_is_game_iostore_from_config() -> bool | None:
     # Have this check manually passed param, env file, env var, config param, check from game, default to none
-    return settings_information.settings.get("game_info", {}).get("is_iostore", None)
+    return get_settings_information().settings.get("game_info", {}).get("is_iostore", None)
 
 
 def get_build_target_platform() -> str:
@@ -545,7 +576,7 @@ def get_build_target_platform() -> str:
         default_target_platform = 'Win64'
     else:
         default_target_platform = 'Linux'
-    return settings_information.settings.get('engine_info', {}).get('build_target_platform', default_target_platform)
+    return get_settings_information().settings.get('engine_info', {}).get('build_target_platform', default_target_platform)
 
 
 def get_unreal_engine_target_platform() -> str:
@@ -553,7 +584,7 @@ def get_unreal_engine_target_platform() -> str:
         default_target_platform = 'WindowsNoEditor'
     else:
         default_target_platform = 'LinuxNoEditor'
-    return settings_information.settings.get('engine_info', {}).get('unreal_engine_target_platform', default_target_platform)
+    return get_settings_information().settings.get('engine_info', {}).get('unreal_engine_target_platform', default_target_platform)
 
 
 def get_default_release_dir() -> Path:
@@ -571,7 +602,7 @@ def get_default_release_base_files_dir() -> Path:
 def get_enabled_mod_names() -> set[str]:
     mod_names = set()
     mods_info_dict = get_mods_info_dict_from_json()
-    for mod_name in settings_information.mod_names:
+    for mod_name in get_settings_information().mod_names:
         if mods_info_dict[mod_name].get('is_enabled', True) == True:
             mod_names.add(mod_name)
     return mod_names
@@ -580,7 +611,7 @@ def get_enabled_mod_names() -> set[str]:
 def get_disabled_mod_names() -> set[str]:
     mod_names = set()
     mods_info_dict = get_mods_info_dict_from_json()
-    for mod_name in settings_information.mod_names:
+    for mod_name in get_settings_information().mod_names:
         if mods_info_dict[mod_name].get('is_enabled', True) == False:
             mod_names.add(mod_name)
     return mod_names
@@ -1,39 +1,34 @@
-import threading
-import time
 from dataclasses import dataclass
 
 from tempo_core import hook_states, logger
 from tempo_core.data_structures import HookStateType
+from tempo_core.threads import monitor_reactor
+
+# constant hook state checks scan processes and windows, so they run a few times a second rather than every 10 ms
+CONSTANT_TICK_INTERVAL = 0.25
+
+CONSTANT_JOB_NAME = "constant_hook_state"
 
 
 @dataclass
 class ConstantThreadInformation:
     run_constant_thread: bool
-    constant_thread: threading.Thread
 
 
 constant_thread_information = ConstantThreadInformation(
     run_constant_thread=False,
-    constant_thread=None,  # type: ignore
 )
 
 
-def constant_thread_runner(tick_rate: float = 0.01) -> None:
-    while constant_thread_information.run_constant_thread:
-        time.sleep(tick_rate)
-        constant_thread_logic()
-
-
 def constant_thread_logic() -> None:
     hook_states.hook_state_checks(HookStateType.CONSTANT)
 
 
-def start_constant_thread() -> None:
+def start_constant_thread(tick_rate: float = CONSTANT_TICK_INTERVAL) -> None:
     constant_thread_information.run_constant_thread = True
-    constant_thread_information.constant_thread = threading.Thread(
-        target=constant_thread_runner, daemon=True,
-    )
-    constant_thread_information.constant_thread.start()
+    # nothing to tick when no event is bound to the constant hook state
+    if hook_states.is_hook_state_used(HookStateType.CONSTANT):
+        monitor_reactor.add_periodic_job(CONSTANT_JOB_NAME, tick_rate, constant_thread_logic)
 
 
 @hook_states.hook_state_decorator(HookStateType.POST_INIT)
@@ -48,4 +43,5 @@ def constant_thread() -> None:
 
 def stop_constant_thread() -> None:
     constant_thread_information.run_constant_thread = False
+    monitor_reactor.remove_periodic_job(CONSTANT_JOB_NAME)
     logger.log_message("Thread: Constant Thread Ended")
@@ -1,16 +1,21 @@
-import threading
-import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import tempo_core.timer
 from tempo_core import (
     hook_states,
     logger,
+    session,
     process_management,
     utilities,
     window_management,
 )
 from tempo_core.data_structures import HookStateType
+from tempo_core.threads import monitor_reactor
+
+# games often open a launcher or splash window under the same title before the real one,
+# so the game window search starts this long after the process shows up
+GAME_WINDOW_SEARCH_DELAY = 4.0
 
 
 @dataclass
@@ -19,24 +24,32 @@ class GameMonitorThreadInformation:
     found_window: bool
     found_process: bool
     window_closed: bool
-    run_game_monitor_thread: bool
-    game_monitor_thread: threading.Thread
+    monitor_target: monitor_reactor.MonitorTarget | None
 
 
-game_monitor_thread_information = GameMonitorThreadInformation(
-    init_done=False,
-    found_window=False,
-    found_process=False,
-    window_closed=False,
-    run_game_monitor_thread=False,
-    game_monitor_thread=None,  # type: ignore
-)
+def new_game_monitor_thread_information() -> GameMonitorThreadInformation:
+    return GameMonitorThreadInformation(
+        init_done=False,
+        found_window=False,
+        found_process=False,
+        window_closed=False,
+        monitor_target=None,
+    )
+
+
+def get_game_monitor_thread_information() -> GameMonitorThreadInformation:
+    return session.get_current_session().game_monitor_thread_information
+
 
+if TYPE_CHECKING:
+    game_monitor_thread_information: GameMonitorThreadInformation
 
-def game_monitor_thread_runner(tick_rate: float = 0.01) -> None:
-    while game_monitor_thread_information.run_game_monitor_thread:
-        time.sleep(tick_rate)
-        game_monitor_thread_logic()
+
+def __getattr__(name: str) -> object:
+    # keeps game_monitor_thread_information importable, it is the current session's
+    if name == "game_monitor_thread_information":
+        return get_game_monitor_thread_information()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_game_window(): # noqa
@@ -45,31 +58,18 @@ def get_game_window(): # noqa
     )
 
 
-@hook_states.hook_state_decorator(HookStateType.POST_GAME_LAUNCH)
-def found_game_window() -> None:
-    logger.log_message("Window: Game Window Found")
-    game_monitor_thread_information.found_window = True
+def found_game_process() -> None:
+    get_game_monitor_thread_information().found_process = True
 
 
-def game_monitor_thread_logic() -> None:
-    if (
-        not game_monitor_thread_information.found_process
-        and process_management.is_process_running(
-            process_management.get_game_process_name(),
-        )
-    ):
-        logger.log_message("Process: Found Game Process")
-        game_monitor_thread_information.found_process = True
+@hook_states.hook_state_decorator(HookStateType.POST_GAME_LAUNCH)
+def found_game_window() -> None:
+    get_game_monitor_thread_information().found_window = True
 
-    elif not game_monitor_thread_information.found_window:
-        time.sleep(4)
-        if get_game_window():
-            found_game_window()
 
-    elif not game_monitor_thread_information.window_closed and not get_game_window():
-        logger.log_message("Window: Game Window Closed")
-        stop_game_monitor_thread()
-        game_monitor_thread_information.window_closed = True
+def game_window_closed() -> None:
+    get_game_monitor_thread_information().window_closed = True
+    stop_game_monitor_thread()
 
 
 # finish this later
@@ -78,25 +78,41 @@ def get_should_skip_game_monitoring() -> bool:
 
 
 def start_game_monitor_thread() -> None:
-    game_monitor_thread_information.run_game_monitor_thread = True
-    game_monitor_thread_information.game_monitor_thread = threading.Thread(
-        target=game_monitor_thread_runner, daemon=True,
+    game_monitor_thread_information = get_game_monitor_thread_information()
+    game_monitor_thread_information.found_process = False
+    game_monitor_thread_information.found_window = False
+    game_monitor_thread_information.window_closed = False
+    game_monitor_thread_information.init_done = True
+    game_monitor_thread_information.monitor_target = monitor_reactor.add_monitor_target(
+        monitor_reactor.MonitorTarget(
+            label="Game",
+            process_name=process_management.get_game_process_name(),
+            window_title=utilities.get_game_window_title(),
+            on_process_found=found_game_process,
+            on_window_found=found_game_window,
+            on_window_closed=game_window_closed,
+            window_search_delay=GAME_WINDOW_SEARCH_DELAY,
+        ),
     )
-    game_monitor_thread_information.game_monitor_thread.start()
 
 
 @hook_states.hook_state_decorator(HookStateType.POST_GAME_CLOSE)
 def stop_game_monitor_thread() -> None:
-    game_monitor_thread_information.run_game_monitor_thread = False
+    monitor_target = get_game_monitor_thread_information().monitor_target
+    if monitor_target:
+        monitor_target.state = monitor_reactor.MonitorState.FINISHED
+        monitor_target.done.set()
 
 
 def game_monitor_thread() -> None:
     # check for a skip via env var, settings file, launch param for skipping finding game window
     if not get_should_skip_game_monitoring():
         start_game_monitor_thread()
-        logger.log_message("Thread: Game Monitoring Thread Started")
-        game_monitor_thread_information.game_monitor_thread.join()
-        logger.log_message("Thread: Game Monitoring Thread Ended")
+        logger.log_message("Thread: Game Monitoring Started")
+        monitor_target = get_game_monitor_thread_information().monitor_target
+        if monitor_target is not None:
+            monitor_reactor.wait_for_monitor_target(monitor_target)
+        logger.log_message("Thread: Game Monitoring Ended")
         logger.log_message(
             f"Timer: Time since script execution: {tempo_core.timer.get_running_time()}",
         )
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import os
+import time
+import select
+import threading
+from enum import Enum
+from dataclasses import dataclass, field
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from tempo_core import logger, process_management, session, window_management
+
+if TYPE_CHECKING:
+    import psutil
+
+# searching backs off from the first interval up to the max, so an idle search settles at a few checks a second
+PROCESS_SEARCH_FIRST_INTERVAL = 0.05
+PROCESS_SEARCH_MAX_INTERVAL = 1.0
+WINDOW_SEARCH_FIRST_INTERVAL = 0.1
+WINDOW_SEARCH_MAX_INTERVAL = 1.0
+BACKOFF_MULTIPLIER = 1.5
+
+# once a window is found it is only rechecked at this rate, process exit wakes the reactor immediately
+WINDOW_WATCH_INTERVAL = 1.0
+
+# longest the reactor sleeps when nothing is scheduled sooner
+IDLE_INTERVAL = 5.0
+
+
+class MonitorState(Enum):
+    SEARCHING_PROCESS = "searching_process"
+    SEARCHING_WINDOW = "searching_window"
+    WATCHING = "watching"
+    FINISHED = "finished"
+
+
+@dataclass
+class MonitorTarget:
+    """
+    A process and window to follow from launch to close.
+    The callbacks run on the reactor thread, normally hook state decorated functions,
+    in the session that added the target.
+    """
+
+    label: str
+    process_name: str
+    window_title: str
+    on_process_found: Callable[[], None]
+    on_window_found: Callable[[], None]
+    on_window_closed: Callable[[], None]
+    # how long after the process is found before the first window check
+    window_search_delay: float = 0.0
+    state: MonitorState = MonitorState.SEARCHING_PROCESS
+    process: psutil.Process | None = None
+    process_exited: bool = False
+    next_check: float = 0.0
+    interval: float = PROCESS_SEARCH_FIRST_INTERVAL
+    done: threading.Event = field(default_factory=threading.Event)
+    owner_session: session.TempoSession = field(default_factory=session.get_current_session)
+
+    def __post_init__(self) -> None:
+        # names are matched lowercased on every check, so normalize them once
+        self.process_name = self.process_name.lower()
+        self.window_title = self.window_title.strip()
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval: float
+    callback: Callable[[], None]
+    next_run: float = 0.0
+    owner_session: session.TempoSession = field(default_factory=session.get_current_session)
+
+
+@dataclass
+class MonitorReactorInformation:
+    targets: list[MonitorTarget]
+    periodic_jobs: dict[str, PeriodicJob]
+    lock: threading.Lock
+    wake_event: threading.Event
+    run_reactor: bool
+    reactor_thread: threading.Thread | None
+
+
+monitor_reactor_information = MonitorReactorInformation(
+    targets=[],
+    periodic_jobs={},
+    lock=threading.Lock(),
+    wake_event=threading.Event(),
+    run_reactor=False,
+    reactor_thread=None,
+)
+
+
+def can_track_windows() -> bool:
+    # window functions are stubs off windows, so the process lifetime stands in for the window there
+    return window_management.IS_WINDOWS
+
+
+def wake_monitor_reactor() -> None:
+    monitor_reactor_information.wake_event.set()
+
+
+def start_monitor_reactor() -> None:
+    with monitor_reactor_information.lock:
+        if monitor_reactor_information.run_reactor:
+            return
+        monitor_reactor_information.run_reactor = True
+        monitor_reactor_information.reactor_thread = threading.Thread(
+            target=monitor_reactor_runner, name="monitor_reactor", daemon=True,
+        )
+        monitor_reactor_information.reactor_thread.start()
+    logger.log_message("Thread: Monitor Reactor Started")
+
+
+def stop_monitor_reactor() -> None:
+    with monitor_reactor_information.lock:
+        monitor_reactor_information.run_reactor = False
+    wake_monitor_reactor()
+    logger.log_message("Thread: Monitor Reactor Ended")
+
+
+def add_monitor_target(target: MonitorTarget) -> MonitorTarget:
+    with monitor_reactor_information.lock:
+        monitor_reactor_information.targets.append(target)
+    start_monitor_reactor()
+    wake_monitor_reactor()
+    return target
+
+
+def wait_for_monitor_target(target: MonitorTarget) -> None:
+    target.done.wait()
+
+
+def add_periodic_job(name: str, interval: float, callback: Callable[[], None]) -> None:
+    with monitor_reactor_information.lock:
+        monitor_reactor_information.periodic_jobs[name] = PeriodicJob(name, interval, callback)
+    start_monitor_reactor()
+    wake_monitor_reactor()
+
+
+def remove_periodic_job(name: str) -> None:
+    with monitor_reactor_information.lock:
+        monitor_reactor_information.periodic_jobs.pop(name, None)
+
+
+def wait_for_process_exit(target: MonitorTarget, process: psutil.Process) -> None:
+    """
+    Blocks a helper thread until the process exits, then wakes the reactor.
+    Uses a pidfd on linux, and psutil's wait (a process handle wait on windows) elsewhere.
+    """
+    import psutil
+
+    try:
+        if hasattr(os, "pidfd_open"):
+            pidfd = os.pidfd_open(process.pid)
+            try:
+                select.select([pidfd], [], [])
+            finally:
+                os.close(pidfd)
+        else:
+            process.wait()
+    except (OSError, psutil.Error):
+        pass
+    target.process_exited = True
+    wake_monitor_reactor()
+
+
+def find_processes(targets: list[MonitorTarget]) -> None:
+    """One process table snapshot serves every target that is still searching."""
+    snapshot = process_management.get_process_snapshot()
+    for target in targets:
+        if target.process is None:
+            matches = snapshot.get_processes_by_substring(target.process_name)
+            if matches:
+                target.process = matches[0]
+
+
+def is_target_window_open(target: MonitorTarget) -> bool:
+    return bool(window_management.get_windows_by_title(target.window_title))
+
+
+def get_backed_off_interval(interval: float, max_interval: float) -> float:
+    return min(interval * BACKOFF_MULTIPLIER, max_interval)
+
+
+def finish_monitor_target(target: MonitorTarget) -> None:
+    target.state = MonitorState.FINISHED
+    logger.log_message(f"Window: {target.label} Window Closed")
+    target.on_window_closed()
+    target.done.set()
+
+
+def on_monitor_target_process_found(target: MonitorTarget, now: float) -> None:
+    logger.log_message(f"Process: Found {target.label} Process")
+    target.on_process_found()
+    threading.Thread(
+        target=wait_for_process_exit,
+        args=(target, target.process),
+        name=f"{target.label.lower()}_exit_waiter",
+        daemon=True,
+    ).start()
+    if can_track_windows():
+        target.state = MonitorState.SEARCHING_WINDOW
+        target.interval = WINDOW_SEARCH_FIRST_INTERVAL
+        target.next_check = now + target.window_search_delay
+    else:
+        on_monitor_target_window_found(target, now)
+
+
+def on_monitor_target_window_found(target: MonitorTarget, now: float) -> None:
+    logger.log_message(f"Window: {target.label} Window Found")
+    target.on_window_found()
+    target.state = MonitorState.WATCHING
+    target.interval = WINDOW_WATCH_INTERVAL
+    target.next_check = now + WINDOW_WATCH_INTERVAL
+
+
+def step_monitor_target(target: MonitorTarget, now: float) -> None:
+    if target.state == MonitorState.SEARCHING_PROCESS:
+        if target.process is not None:
+            on_monitor_target_process_found(target, now)
+        else:
+            target.interval = get_backed_off_interval(target.interval, PROCESS_SEARCH_MAX_INTERVAL)
+            target.next_check = now + target.interval
+    elif target.state == MonitorState.SEARCHING_WINDOW:
+        if target.process_exited:
+            finish_monitor_target(target)
+        elif is_target_window_open(target):
+            on_monitor_target_window_found(target, now)
+        else:
+            target.interval = get_backed_off_interval(target.interval, WINDOW_SEARCH_MAX_INTERVAL)
+            target.next_check = now + target.interval
+    elif target.state == MonitorState.WATCHING:
+        if target.process_exited or (can_track_windows() and not is_target_window_open(target)):
+            finish_monitor_target(target)
+        else:
+            target.next_check = now + WINDOW_WATCH_INTERVAL
+
+
+def monitor_reactor_tick() -> float:
+    """Runs everything that is due and returns how long the reactor can sleep."""
+    now = time.monotonic()
+    with monitor_reactor_information.lock:
+        targets = [
+            target for target in monitor_reactor_information.targets
+            if target.state != MonitorState.FINISHED
+        ]
+        monitor_reactor_information.targets = targets
+        periodic_jobs = list(monitor_reactor_information.periodic_jobs.values())
+
+    due_targets = [target for target in targets if target.process_exited or target.next_check <= now]
+    searching_targets = [
+        target for target in due_targets if target.state == MonitorState.SEARCHING_PROCESS
+    ]
+    if searching_targets:
+        find_processes(searching_targets)
+    for target in due_targets:
+        try:
+            with session.use_session(target.owner_session):
+                step_monitor_target(target, now)
+        except Exception as error:  # noqa: BLE001
+            # a failing callback must not leave a caller blocked in wait_for_monitor_target
+            logger.log_message(f"Error: {target.label} monitoring stopped: {error}")
+            target.state = MonitorState.FINISHED
+            target.done.set()
+
+    for periodic_job in periodic_jobs:
+        if periodic_job.next_run <= now:
+            try:
+                with session.use_session(periodic_job.owner_session):
+                    periodic_job.callback()
+            except Exception as error:  # noqa: BLE001
+                # the job runs again next interval, the reactor has targets of its own to keep serving
+                logger.log_message(f"Error: periodic job {periodic_job.name} failed: {error}")
+            periodic_job.next_run = now + periodic_job.interval
+
+    next_times = [target.next_check for target in targets if target.state != MonitorState.FINISHED]
+    next_times.extend(periodic_job.next_run for periodic_job in periodic_jobs)
+    if not next_times:
+        return IDLE_INTERVAL
+    return max(0.0, min(next_times) - time.monotonic())
+
+
+def monitor_reactor_runner() -> None:
+    wake_event = monitor_reactor_information.wake_event
+    while monitor_reactor_information.run_reactor:
+        # cleared before the targets are looked at, so a wake that comes in during the tick cuts the sleep short
+        wake_event.clear()
+        sleep_time = monitor_reactor_tick()
+        wake_event.wait(sleep_time)
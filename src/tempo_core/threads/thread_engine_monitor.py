@@ -1,16 +1,15 @@
-import threading
-import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from tempo_core import (
     hook_states,
     logger,
-    process_management,
+    session,
     settings,
-    window_management,
 )
 from tempo_core.data_structures import HookStateType
 from tempo_core.programs import unreal_engine
+from tempo_core.threads import monitor_reactor
 
 
 @dataclass
@@ -19,74 +18,79 @@ class EngineMonitorThreadInformation:
     found_window: bool
     found_process: bool
     window_closed: bool
-    run_engine_monitor_thread: bool
-    engine_monitor_thread: threading.Thread
+    monitor_target: monitor_reactor.MonitorTarget | None
 
 
-engine_monitor_thread_information = EngineMonitorThreadInformation(
-    init_done=False,
-    found_window=False,
-    found_process=False,
-    window_closed=False,
-    run_engine_monitor_thread=False,
-    engine_monitor_thread=None,  # type: ignore
-)
+def new_engine_monitor_thread_information() -> EngineMonitorThreadInformation:
+    return EngineMonitorThreadInformation(
+        init_done=False,
+        found_window=False,
+        found_process=False,
+        window_closed=False,
+        monitor_target=None,
+    )
+
+
+def get_engine_monitor_thread_information() -> EngineMonitorThreadInformation:
+    return session.get_current_session().engine_monitor_thread_information
+
+
+if TYPE_CHECKING:
+    engine_monitor_thread_information: EngineMonitorThreadInformation
+
+
+def __getattr__(name: str) -> object:
+    # keeps engine_monitor_thread_information importable, it is the current session's
+    if name == "engine_monitor_thread_information":
+        return get_engine_monitor_thread_information()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def engine_monitor_thread() -> None:
     start_engine_monitor_thread()
-    logger.log_message("Thread: Engine Monitoring Thread Started")
-    engine_monitor_thread_information.engine_monitor_thread.join()
-    logger.log_message("Thread: Engine Monitoring Thread Ended")
+    logger.log_message("Thread: Engine Monitoring Started")
+    monitor_target = get_engine_monitor_thread_information().monitor_target
+    if monitor_target is not None:
+        monitor_reactor.wait_for_monitor_target(monitor_target)
+    logger.log_message("Thread: Engine Monitoring Ended")
 
 
-def engine_monitor_thread_runner(tick_rate: float = 0.01) -> None:
-    while engine_monitor_thread_information.run_engine_monitor_thread:
-        time.sleep(tick_rate)
-        engine_monitor_thread_logic()
+def found_engine_process() -> None:
+    get_engine_monitor_thread_information().found_process = True
 
 
 @hook_states.hook_state_decorator(HookStateType.POST_ENGINE_OPEN)
 def found_engine_window() -> None:
-    logger.log_message("Window: Engine Window Found")
-    engine_monitor_thread_information.found_window = True
+    get_engine_monitor_thread_information().found_window = True
 
 
-def engine_monitor_thread_logic() -> None:
-    if not engine_monitor_thread_information.init_done:
-        engine_monitor_thread_information.found_process = False
-        engine_monitor_thread_information.found_window = False
-        engine_monitor_thread_information.window_closed = False
-        engine_monitor_thread_information.init_done = True
-
-    engine_window_name = unreal_engine.get_engine_window_title(
-        settings.get_uproject_file(), # ty: ignore
-    )
-    if not engine_monitor_thread_information.found_process:
-        engine_process_name = unreal_engine.get_engine_process_name(
-            settings.get_unreal_engine_dir(), # ty: ignore
-        )
-        if process_management.is_process_running(engine_process_name):
-            logger.log_message("Process: Found Engine Process")
-            engine_monitor_thread_information.found_process = True
-    elif not engine_monitor_thread_information.found_window:
-        if window_management.does_window_exist(engine_window_name):
-            found_engine_window()
-    elif not engine_monitor_thread_information.window_closed:
-        if not window_management.does_window_exist(engine_window_name):
-            logger.log_message("Window: Engine Window Closed")
-            engine_monitor_thread_information.window_closed = True
-            stop_engine_monitor_thread()
+def engine_window_closed() -> None:
+    get_engine_monitor_thread_information().window_closed = True
+    stop_engine_monitor_thread()
 
 
 def start_engine_monitor_thread() -> None:
-    engine_monitor_thread_information.run_engine_monitor_thread = True
-    engine_monitor_thread_information.engine_monitor_thread = threading.Thread(
-        target=engine_monitor_thread_runner, daemon=True,
+    engine_monitor_thread_information = get_engine_monitor_thread_information()
+    engine_monitor_thread_information.found_process = False
+    engine_monitor_thread_information.found_window = False
+    engine_monitor_thread_information.window_closed = False
+    engine_monitor_thread_information.init_done = True
+    # resolved once here rather than on every check
+    engine_monitor_thread_information.monitor_target = monitor_reactor.add_monitor_target(
+        monitor_reactor.MonitorTarget(
+            label="Engine",
+            process_name=unreal_engine.get_engine_process_name(settings.get_unreal_engine_dir_or_raise()),
+            window_title=unreal_engine.get_engine_window_title(settings.get_uproject_file_or_raise()),
+            on_process_found=found_engine_process,
+            on_window_found=found_engine_window,
+            on_window_closed=engine_window_closed,
+        ),
     )
-    engine_monitor_thread_information.engine_monitor_thread.start()
 
 
 @hook_states.hook_state_decorator(HookStateType.POST_ENGINE_CLOSE)
 def stop_engine_monitor_thread() -> None:
-    engine_monitor_thread_information.run_engine_monitor_thread = False
+    monitor_target = get_engine_monitor_thread_information().monitor_target
+    if monitor_target:
+        monitor_target.state = monitor_reactor.MonitorState.FINISHED
+        monitor_target.done.set()
@@ -1,7 +1,226 @@
+import functools
+import inspect
+import json
+import os
+import threading
 import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ParamSpec, TypeVar
 
 start_time = time.time()
+start_perf_counter_ns = time.perf_counter_ns()
 
 
 def get_running_time() -> float:
     return time.time() - start_time
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int | None
+    thread_id: int
+    thread_name: str
+    mod_name: str | None
+    bytes_processed: int
+
+    def get_duration_ns(self) -> int:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return end_ns - self.start_ns
+
+
+@dataclass
+class SpanInformation:
+    spans: list[Span]
+    lock: threading.Lock
+    open_spans: threading.local
+
+
+span_information = SpanInformation(
+    spans=[],
+    lock=threading.Lock(),
+    open_spans=threading.local(),
+)
+
+
+def get_open_spans() -> list[Span]:
+    open_spans = getattr(span_information.open_spans, "stack", None)
+    if open_spans is None:
+        open_spans = []
+        span_information.open_spans.stack = open_spans
+    return open_spans
+
+
+@contextmanager
+def span(
+    name: str,
+    category: str = "tempo",
+    mod_name: str | None = None,
+) -> Generator[Span, None, None]:
+    current_thread = threading.current_thread()
+    open_spans = get_open_spans()
+    if mod_name is None and open_spans:
+        mod_name = open_spans[-1].mod_name
+    current_span = Span(
+        name=name,
+        category=category,
+        start_ns=time.perf_counter_ns(),
+        end_ns=None,
+        thread_id=current_thread.ident or 0,
+        thread_name=current_thread.name,
+        mod_name=mod_name,
+        bytes_processed=0,
+    )
+    open_spans.append(current_span)
+    try:
+        yield current_span
+    finally:
+        current_span.end_ns = time.perf_counter_ns()
+        open_spans.pop()
+        with span_information.lock:
+            span_information.spans.append(current_span)
+
+
+def add_bytes_processed(byte_count: int) -> None:
+    # attributes the bytes to the innermost span open on the calling thread
+    open_spans = get_open_spans()
+    if open_spans:
+        open_spans[-1].bytes_processed += byte_count
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def timed(category: str = "function") -> Callable[[Callable[P, R]], Callable[P, R]]:
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        parameter_names = list(inspect.signature(function).parameters)
+        mod_name_index = (
+            parameter_names.index("mod_name") if "mod_name" in parameter_names else None
+        )
+
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            mod_name = kwargs.get("mod_name")
+            if mod_name is None and mod_name_index is not None and mod_name_index < len(args):
+                mod_name = args[mod_name_index]
+            with span(function.__name__, category, mod_name=mod_name): # ty: ignore
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_finished_spans() -> list[Span]:
+    with span_information.lock:
+        return list(span_information.spans)
+
+
+def get_chrome_trace_events() -> list[dict]:
+    process_id = os.getpid()
+    trace_events = []
+    thread_names = {}
+    for finished_span in get_finished_spans():
+        thread_names[finished_span.thread_id] = finished_span.thread_name
+        args = {"bytes_processed": finished_span.bytes_processed}
+        if finished_span.mod_name:
+            args["mod_name"] = finished_span.mod_name
+        trace_events.append(
+            {
+                "name": finished_span.name,
+                "cat": finished_span.category,
+                "ph": "X",
+                "ts": (finished_span.start_ns - start_perf_counter_ns) / 1000,
+                "dur": finished_span.get_duration_ns() / 1000,
+                "pid": process_id,
+                "tid": finished_span.thread_id,
+                "args": args,
+            },
+        )
+    for thread_id, thread_name in thread_names.items():
+        trace_events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": process_id,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            },
+        )
+    return trace_events
+
+
+def write_chrome_trace(output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as trace_file:
+        json.dump(
+            {"traceEvents": get_chrome_trace_events(), "displayTimeUnit": "ms"},
+            trace_file,
+        )
+
+
+@dataclass
+class SpanSummaryEntry:
+    name: str
+    category: str
+    count: int
+    total_seconds: float
+    max_seconds: float
+    bytes_processed: int
+
+
+def get_span_summary() -> list[SpanSummaryEntry]:
+    summary: dict[tuple[str, str], SpanSummaryEntry] = {}
+    for finished_span in get_finished_spans():
+        key = (finished_span.category, finished_span.name)
+        duration_seconds = finished_span.get_duration_ns() / 1_000_000_000
+        entry = summary.get(key)
+        if entry is None:
+            entry = SpanSummaryEntry(
+                name=finished_span.name,
+                category=finished_span.category,
+                count=0,
+                total_seconds=0.0,
+                max_seconds=0.0,
+                bytes_processed=0,
+            )
+            summary[key] = entry
+        entry.count += 1
+        entry.total_seconds += duration_seconds
+        entry.max_seconds = max(entry.max_seconds, duration_seconds)
+        entry.bytes_processed += finished_span.bytes_processed
+    return sorted(summary.values(), key=lambda entry: entry.total_seconds, reverse=True)
+
+
+def get_span_summary_lines() -> list[str]:
+    name_width = max(
+        [len("Span")] + [len(entry.name) for entry in get_span_summary()],
+    )
+    lines = [
+        f"{'Span':<{name_width}}  {'Category':<12}  {'Count':>6}  {'Total (s)':>10}  {'Max (s)':>10}  {'Bytes':>14}",
+    ]
+    for entry in get_span_summary():
+        lines.append(
+            f"{entry.name:<{name_width}}  {entry.category:<12}  {entry.count:>6}  "
+            f"{entry.total_seconds:>10.3f}  {entry.max_seconds:>10.3f}  {entry.bytes_processed:>14}",
+        )
+    return lines
+
+
+def write_run_timing_report() -> None:
+    from tempo_core import logger
+
+    if not get_finished_spans():
+        return
+    log_file_path = logger.get_log_file_path()
+    trace_path = log_file_path.with_name(f"{log_file_path.stem}_trace.json")
+    write_chrome_trace(trace_path)
+    for line in get_span_summary_lines():
+        logger.log_message(f"Timer: {line}")
+    logger.log_message(f"Timer: Chrome trace written to {trace_path}")
@@ -4,16 +4,20 @@ import getpass
 import os
 import re
 import shutil
+import sys
+import threading
+import contextlib
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from pathlib import Path
 from typing import TYPE_CHECKING
 import json
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Generator, Iterable, Iterator
 
-from tempo_core import data_structures, logger, utilities
+from tempo_core import data_structures, file_io, logger, utilities
 
 # This module does not account for when collections are across
 # different collections directories, like local, shared, and private
@@ -29,9 +33,6 @@ from tempo_core import data_structures, logger, utilities
 # Issues:
 # lots of extra spaces can end up in the config
 # duplicate lines can end up in the content lines, this means the check if in lines checks are off
-# dynamic/static using the proper content_lines/filter_lines/unreal_asset_path_lines is bugged right now
-# when passing a path/to/file/file.uasset to unreal asset path it doesn't remove the extension before it makes the full file path
-# when passed in test.txt it will return test.txt.test.txt instead of test.test
 
 
 class UnrealGuid:
@@ -43,6 +44,7 @@ class UnrealGuid:
 
     Methods:
         __repr__() -> str: Returns the GUID as a string representation.
+        __eq__() / __hash__(): Compare and hash by uid, so GUIDs work as set members and dict keys.
         generate_unreal_guid() -> str: Static method to generate a new UUID and return it as a string in uppercase format.
         to_uid() -> str: Returns the GUID as a string.
         from_uid(uid: str) -> UnrealGuid: Class method to create an UnrealGuid object from a given UID string.
@@ -69,6 +71,14 @@ class UnrealGuid:
         """
         return self.uid
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnrealGuid):
+            return NotImplemented
+        return self.uid == other.uid
+
+    def __hash__(self) -> int:
+        return hash(self.uid)
+
     @staticmethod
     def generate_unreal_guid() -> str:
         """
@@ -170,32 +180,68 @@ class UnrealCollectionColor:
 
 class UnrealAssetPath:
     """
-    A class for managing Unreal Engine asset paths and references.
+    An immutable Unreal Engine asset path, split into an interned directory and an asset name.
+
+    Collections can hold hundreds of thousands of these, and most of them share a handful of
+    directories, so each directory string is stored once and the asset reference is only built
+    when asked for. Instances hash and compare by directory and name, so they work as set members
+    and dict keys.
 
     Attributes:
-        normalized_path (str): The normalized asset path with forward slashes.
+        directory (str): The interned directory, like "/Game/Mods/MyMod".
+        name (str): The asset name, like "MyAsset".
+        normalized_path (str): The normalized asset path, like "/Game/Mods/MyMod/MyAsset".
         asset_reference (str): The full asset reference in the format "/path/to/asset.AssetName".
 
     Methods:
-        normalize_path(path: str) -> str: Normalizes the provided path by replacing backslashes with forward slashes and trimming any surrounding slashes.
+        normalize_path(path: str) -> str: Normalizes the provided path by trimming whitespace, replacing backslashes with forward slashes, trimming any surrounding slashes and dropping an object name or file extension.
         to_asset_reference() -> str: Converts the normalized path into an asset reference in the format "/path/to/asset.AssetName".
         from_asset_reference() -> str: Extracts and returns the asset path from the asset reference (removes the asset name).
+        list_from_lines(lines) -> list[UnrealAssetPath]: Builds asset paths from collection lines in bulk.
+        set_from_lines(lines) -> frozenset[UnrealAssetPath]: Builds a set of asset paths from collection lines in bulk.
         __repr__() -> str: Returns the asset reference as a string representation.
     """
 
+    __slots__ = ("directory", "name")
+
+    directory: str
+    name: str
+
     def __init__(self, path: str) -> None:
         """
         Initializes the UnrealAssetPath with the given asset path.
 
         Args:
-            path (str): The path to the asset, which will be normalized and converted into an asset reference.
+            path (str): The path to the asset, or an asset reference, which will be normalized.
         """
-        self.normalized_path = self.normalize_path(path)
-        self.asset_reference = self.to_asset_reference()
+        directory, _, name = self.normalize_path(path).rpartition("/")
+        object.__setattr__(self, "directory", sys.intern(directory))
+        object.__setattr__(self, "name", name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"UnrealAssetPath is immutable, cannot set {name!r}")
 
-    def normalize_path(self, path: str) -> str:
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"UnrealAssetPath is immutable, cannot delete {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnrealAssetPath):
+            return NotImplemented
+        # interned directories usually make the first comparison an identity check
+        return self.directory == other.directory and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash((self.directory, self.name))
+
+    def __reduce__(self) -> tuple[type[UnrealAssetPath], tuple[str]]:
+        return (UnrealAssetPath, (self.normalized_path,))
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
         """
-        Normalizes the provided asset path by replacing backslashes with forward slashes and trimming surrounding slashes.
+        Normalizes the provided asset path by trimming surrounding whitespace, replacing backslashes with forward slashes
+        and trimming surrounding slashes, the same way iter_from_lines treats collection lines.
+        An object name or file extension on the last segment is dropped, so "/Game/A/B.B" and "Game/A/B.uasset" both become "/Game/A/B".
 
         Args:
             path (str): The asset path to normalize.
@@ -203,8 +249,17 @@ class UnrealAssetPath:
         Returns:
             str: The normalized path with forward slashes and no surrounding slashes.
         """
-        path = path.replace("\\", "/").strip("/")
-        return f"/{path}"
+        path = path.strip().replace("\\", "/").strip("/")
+        directory, separator, name = path.rpartition("/")
+        return f"/{directory}{separator}{name.split('.', 1)[0]}"
+
+    @property
+    def normalized_path(self) -> str:
+        return f"{self.directory}/{self.name}"
+
+    @property
+    def asset_reference(self) -> str:
+        return self.to_asset_reference()
 
     def to_asset_reference(self) -> str:
         """
@@ -213,8 +268,7 @@ class UnrealAssetPath:
         Returns:
             str: The asset reference including both the normalized path and asset name.
         """
-        asset_name = self.normalized_path.split("/")[-1]
-        return f"{self.normalized_path}.{asset_name}"
+        return f"{self.directory}/{self.name}.{self.name}"
 
     def from_asset_reference(self) -> str:
         """
@@ -223,10 +277,7 @@ class UnrealAssetPath:
         Returns:
             str: The asset path without the asset name (e.g., "/path/to/asset").
         """
-        if "." in self.asset_reference:
-            path, _ = self.asset_reference.rsplit(".", 1)
-            return path
-        return self.asset_reference
+        return self.normalized_path
 
     @staticmethod
     def static_from_asset_reference(asset_reference: str) -> str:
@@ -245,6 +296,38 @@ class UnrealAssetPath:
             else asset_reference
         )
 
+    @classmethod
+    def iter_from_lines(cls, lines: Iterable[str]) -> Iterator[UnrealAssetPath]:
+        """
+        Builds asset paths from collection lines, skipping blank ones.
+        Directories are interned through a local table, so a run of lines from the same directory
+        normalizes and interns it once instead of once per line.
+        """
+        directories: dict[str, str] = {}
+        new_instance = object.__new__
+        set_attribute = object.__setattr__
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            raw_directory, _, raw_name = line.replace("\\", "/").strip("/").rpartition("/")
+            directory = directories.get(raw_directory)
+            if directory is None:
+                directory = sys.intern(f"/{raw_directory}" if raw_directory else "")
+                directories[raw_directory] = directory
+            asset_path = new_instance(cls)
+            set_attribute(asset_path, "directory", directory)
+            set_attribute(asset_path, "name", raw_name.split(".", 1)[0])
+            yield asset_path
+
+    @classmethod
+    def list_from_lines(cls, lines: Iterable[str]) -> list[UnrealAssetPath]:
+        return list(cls.iter_from_lines(lines))
+
+    @classmethod
+    def set_from_lines(cls, lines: Iterable[str]) -> frozenset[UnrealAssetPath]:
+        return frozenset(cls.iter_from_lines(lines))
+
     def __repr__(self) -> str:
         """
         Returns the asset reference as a string representation.
@@ -252,7 +335,7 @@ class UnrealAssetPath:
         Returns:
             str: The asset reference in string format.
         """
-        return self.asset_reference
+        return self.to_asset_reference()
 
 
 class UnrealContentLineType(Enum):
@@ -323,6 +406,123 @@ def get_shared_collections_directory(
     return Path(collections_directory)
 
 
+COLLECTION_KEY_PREFIXES = ("FileVersion:", "Type:", "Guid:", "ParentGuid:", "Color:")
+
+
+def raise_if_collection_path_missing(collection_path: Path) -> None:
+    if not collection_path.is_file():
+        config_not_found_error = (
+            f'No file exists at the following provided collection path "{collection_path}".'
+        )
+        raise FileNotFoundError(config_not_found_error)
+
+
+def split_collection_lines(lines: Iterable[str]) -> tuple[dict[str, str], list[str], list[str]]:
+    """
+    Splits collection lines in one pass into the first value of each key,
+    the key lines themselves, and the stripped non key lines.
+    """
+    key_values: dict[str, str] = {}
+    key_lines: list[str] = []
+    non_key_lines: list[str] = []
+    for line in lines:
+        stripped_line = line.strip()
+        for key_prefix in COLLECTION_KEY_PREFIXES:
+            if stripped_line.startswith(key_prefix):
+                key_values.setdefault(key_prefix, stripped_line[len(key_prefix):])
+                key_lines.append(stripped_line)
+                break
+        else:
+            non_key_lines.append(stripped_line)
+    return key_values, key_lines, non_key_lines
+
+
+def read_collection_lines(collection_path: Path) -> tuple[dict[str, str], list[str], list[str]]:
+    raise_if_collection_path_missing(collection_path)
+    with Path.open(collection_path, encoding="utf-8") as file:
+        return split_collection_lines(file)
+
+
+def get_collection_key_value(key_values: dict[str, str], key_prefix: str, collection_path: Path) -> str:
+    if key_prefix not in key_values:
+        config_error = f'There is no "{key_prefix}" line in the following config "{collection_path}"'
+        raise RuntimeError(config_error)
+    return key_values[key_prefix]
+
+
+def get_content_lines_for_type(
+    content_type: UnrealContentLineType, lines: Iterable[str],
+) -> list[UnrealAssetPath] | list[str]:
+    """Static collections hold asset paths, dynamic ones hold filter lines that are kept as written."""
+    if content_type == UnrealContentLineType.STATIC:
+        return UnrealAssetPath.list_from_lines(lines)
+    # the blank separator line between the keys and the content is not a content line
+    return [line for line in lines if line]
+
+
+def get_content_line_for_collection(
+    collection: UnrealCollection, content_line: UnrealAssetPath | str,
+) -> UnrealAssetPath | str:
+    if collection.content_type == UnrealContentLineType.STATIC and isinstance(content_line, str):
+        return UnrealAssetPath(path=content_line)
+    return content_line
+
+
+def parse_unreal_collection(collection_path: Path) -> UnrealCollection:
+    """Builds an UnrealCollection from a single read of the collection file."""
+    key_values, _, non_key_lines = read_collection_lines(collection_path)
+    content_type = UnrealContentLineType(
+        data_structures.get_enum_from_val(
+            UnrealContentLineType,
+            get_collection_key_value(key_values, "Type:", collection_path),
+        ),
+    )
+    return UnrealCollection(
+        file_system_path=collection_path,
+        file_version=int(get_collection_key_value(key_values, "FileVersion:", collection_path)),
+        content_type=content_type,
+        parent_guid=UnrealGuid(get_collection_key_value(key_values, "ParentGuid:", collection_path)),
+        guid=UnrealGuid(get_collection_key_value(key_values, "Guid:", collection_path)),
+        color=UnrealCollectionColor(get_collection_key_value(key_values, "Color:", collection_path)),
+        content_lines=get_content_lines_for_type(content_type, non_key_lines),
+    )
+
+
+@dataclass
+class CollectionStore:
+    """
+    Caches parsed collections by path, reparsing a file only when its mtime or size changes.
+    Callers get their own copy of the content lines, so editing one does not leak into the cache.
+    """
+
+    entries: dict[Path, tuple[int, int, UnrealCollection]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, collection_path: Path) -> UnrealCollection:
+        raise_if_collection_path_missing(collection_path)
+        stat_result = collection_path.stat()
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self.lock:
+            entry = self.entries.get(collection_path)
+        if entry and entry[:2] == stamp:
+            collection = entry[2]
+        else:
+            collection = parse_unreal_collection(collection_path)
+            with self.lock:
+                self.entries[collection_path] = (*stamp, collection)
+        return replace(collection, content_lines=list(collection.content_lines))
+
+    def invalidate(self, collection_path: Path | None = None) -> None:
+        with self.lock:
+            if collection_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(collection_path, None)
+
+
+collection_store = CollectionStore()
+
+
 def get_unreal_collection_from_unreal_collection_path(
     collection_path: Path,
 ) -> UnrealCollection:
@@ -331,21 +531,7 @@ def get_unreal_collection_from_unreal_collection_path(
             f'The following collection path file does not exist "{collection_path}"'
         )
         raise FileNotFoundError(unreal_collection_path_does_not_exist_error)
-    new_content_lines = []
-    for line in get_all_non_key_lines_from_collection_path(collection_path):
-        new_content_lines.append(UnrealAssetPath(path=line))
-    collection_to_return = UnrealCollection(
-        file_system_path=collection_path,
-        file_version=get_file_version_from_collection_path(collection_path),
-        content_type=get_type_from_unreal_collection_path(collection_path),
-        parent_guid=get_parent_guid_from_unreal_collection_path(collection_path),
-        guid=get_guid_from_unreal_collection_path(collection_path),
-        color=get_collection_color_from_unreal_collection_path(collection_path),
-        content_lines=new_content_lines,
-    )
-    if collection_to_return is None:
-        raise RuntimeError
-    return collection_to_return
+    return collection_store.get(collection_path)
 
 
 def get_enabled_collection_paths(collections_directory: Path) -> list[Path]:
@@ -386,30 +572,131 @@ def get_disabled_collections(collections_directory: Path) -> list[UnrealCollecti
     ]
 
 
+@dataclass
+class CollectionGraph:
+    """
+    The parent/child hierarchy of one collections directory, indexed by guid.
+    Ancestor and descendant sets are computed on first use and kept for the life of the graph.
+    """
+
+    collections_by_guid: dict[UnrealGuid, UnrealCollection]
+    enabled_guids: set[UnrealGuid]
+    disabled_guids: set[UnrealGuid]
+    children_by_guid: dict[UnrealGuid, list[UnrealGuid]]
+    ancestor_guids: dict[UnrealGuid, tuple[UnrealGuid, ...]] = field(default_factory=dict)
+    descendant_guids: dict[UnrealGuid, frozenset[UnrealGuid]] = field(default_factory=dict)
+
+    def get_parent(self, guid: UnrealGuid) -> UnrealCollection | None:
+        collection = self.collections_by_guid.get(guid)
+        if collection is None:
+            return None
+        return self.collections_by_guid.get(collection.parent_guid)
+
+    def get_ancestor_guids(self, guid: UnrealGuid) -> tuple[UnrealGuid, ...]:
+        """Parent first, then up to the root. A cycle in the parent guids ends the chain."""
+        if guid in self.ancestor_guids:
+            return self.ancestor_guids[guid]
+        ancestors: list[UnrealGuid] = []
+        seen = {guid}
+        parent = self.get_parent(guid)
+        while parent is not None and parent.guid not in seen:
+            ancestors.append(parent.guid)
+            seen.add(parent.guid)
+            parent = self.get_parent(parent.guid)
+        self.ancestor_guids[guid] = tuple(ancestors)
+        return self.ancestor_guids[guid]
+
+    def get_descendant_guids(self, guid: UnrealGuid) -> frozenset[UnrealGuid]:
+        if guid in self.descendant_guids:
+            return self.descendant_guids[guid]
+        descendants: set[UnrealGuid] = set()
+        pending = list(self.children_by_guid.get(guid, []))
+        while pending:
+            child_guid = pending.pop()
+            if child_guid in descendants or child_guid == guid:
+                continue
+            descendants.add(child_guid)
+            pending.extend(self.children_by_guid.get(child_guid, []))
+        self.descendant_guids[guid] = frozenset(descendants)
+        return self.descendant_guids[guid]
+
+    def get_children(self, guid: UnrealGuid) -> list[UnrealCollection]:
+        return [self.collections_by_guid[child_guid] for child_guid in self.children_by_guid.get(guid, [])]
+
+    def has_disabled_ancestor(self, guid: UnrealGuid) -> bool:
+        return any(ancestor_guid in self.disabled_guids for ancestor_guid in self.get_ancestor_guids(guid))
+
+
+def build_collection_graph(collections: list[UnrealCollection], disabled_guids: set[UnrealGuid]) -> CollectionGraph:
+    collections_by_guid = {collection.guid: collection for collection in collections}
+    children_by_guid: dict[UnrealGuid, list[UnrealGuid]] = {}
+    for collection in collections:
+        children_by_guid.setdefault(collection.parent_guid, []).append(collection.guid)
+    return CollectionGraph(
+        collections_by_guid=collections_by_guid,
+        enabled_guids=set(collections_by_guid) - disabled_guids,
+        disabled_guids=disabled_guids,
+        children_by_guid=children_by_guid,
+    )
+
+
+def get_collections_directory_snapshot(collections_directory: Path) -> tuple[tuple[str, int, int], ...]:
+    snapshot = []
+    for collection_path in get_all_collection_paths(collections_directory):
+        stat_result = collection_path.stat()
+        snapshot.append((collection_path.name, stat_result.st_mtime_ns, stat_result.st_size))
+    return tuple(sorted(snapshot))
+
+
+@dataclass
+class CollectionGraphCache:
+    graphs: dict[Path, tuple[tuple[tuple[str, int, int], ...], CollectionGraph]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+collection_graph_cache = CollectionGraphCache()
+
+
+def get_collection_graph(collections_directory: Path) -> CollectionGraph:
+    """Returns the directory's graph, rebuilt only when a collection file was added, removed or changed."""
+    snapshot = get_collections_directory_snapshot(collections_directory)
+    with collection_graph_cache.lock:
+        cached = collection_graph_cache.graphs.get(collections_directory)
+    if cached and cached[0] == snapshot:
+        return cached[1]
+    enabled_collections = [
+        collection_store.get(collection_path)
+        for collection_path in get_enabled_collection_paths(collections_directory)
+    ]
+    disabled_collections = [
+        collection_store.get(collection_path)
+        for collection_path in get_disabled_collection_paths(collections_directory)
+    ]
+    graph = build_collection_graph(
+        [*enabled_collections, *disabled_collections],
+        {collection.guid for collection in disabled_collections},
+    )
+    with collection_graph_cache.lock:
+        collection_graph_cache.graphs[collections_directory] = (snapshot, graph)
+    return graph
+
+
 def has_disabled_parent(
     collection: UnrealCollection,
     collections: list[UnrealCollection],
     disabled_guids: set[UnrealGuid],
 ) -> bool:
-    parent_guid = collection.parent_guid
-    while parent_guid:
-        if parent_guid in disabled_guids:
-            return True
-        parent = next((col for col in collections if col.guid == parent_guid), None)
-        parent_guid = parent.parent_guid if parent else None
-    return False
+    return build_collection_graph(collections, disabled_guids).has_disabled_ancestor(collection.guid)
 
 
 def prune_disabled_parents(
     collections: list[UnrealCollection], collections_directory: Path,
 ) -> list[UnrealCollection]:
-    disabled_guids = {
-        col.guid for col in get_disabled_collections(collections_directory)
-    }
+    graph = get_collection_graph(collections_directory)
     return [
         col
         for col in collections
-        if not has_disabled_parent(col, collections, disabled_guids)
+        if not graph.has_disabled_ancestor(col.guid)
     ]
 
 
@@ -423,134 +710,58 @@ def get_all_collections(collections_directory: Path) -> list[UnrealCollection]:
 def get_parent_collection(
     collection: UnrealCollection, collections_directory: Path,
 ) -> UnrealCollection:
-    parent_collection_file = None
     parent_guid = get_parent_guid_from_unreal_collection_path(
         collection.file_system_path,
     )
-    if parent_guid and parent_guid != get_blank_unreal_guid():
-        all_collection_files = get_enabled_collections(collections_directory)
-        for collection_file in all_collection_files:
-            if (
-                get_guid_from_unreal_collection_path(collection_file.file_system_path)
-                == parent_guid
-            ):
-                parent_collection_file = collection_file
-                break
-    if parent_collection_file:
-        return parent_collection_file
-    else:
-        collection_error = "parent collection was none"
-        raise RuntimeError(collection_error)
+    parent_collection = None
+    if parent_guid != get_blank_unreal_guid():
+        graph = get_collection_graph(collections_directory)
+        if parent_guid in graph.enabled_guids and not graph.has_disabled_ancestor(parent_guid):
+            parent_collection = graph.collections_by_guid[parent_guid]
+    if parent_collection:
+        return replace(parent_collection, content_lines=list(parent_collection.content_lines))
+    collection_error = "parent collection was none"
+    raise RuntimeError(collection_error)
 
 
 def get_file_version_from_collection_path(collection_path: Path) -> int:
-    config_not_found_error = (
-        f'No file exists at the following provided collection path "{collection_path}".'
-    )
-    if not collection_path.is_file():
-        raise FileNotFoundError(config_not_found_error)
-    config_lines = get_all_lines_in_config(collection_path)
-    config_line_prefix = "FileVersion:"
-
-    for line in config_lines:
-        if line.strip("\n").startswith(config_line_prefix):
-            return int(line.strip("\n").replace(config_line_prefix, ""))
-
-    config_error = f'There was no "{config_line_prefix}" line in the following config "{collection_path}"'
-    raise RuntimeError(config_error)
+    return collection_store.get(collection_path).file_version
 
 
 def get_type_from_unreal_collection_path(
     collection_path: Path,
 ) -> UnrealContentLineType:
-    config_not_found_error = (
-        f'No file exists at the following provided collection path "{collection_path}".'
-    )
-    if not collection_path.is_file():
-        raise FileNotFoundError(config_not_found_error)
-    config_lines = get_all_lines_in_config(collection_path)
-    config_line_prefix = "Type:"
-
-    for line in config_lines:
-        if line.strip("\n").startswith(config_line_prefix):
-            return UnrealContentLineType(
-                data_structures.get_enum_from_val(
-                    UnrealContentLineType,
-                    line.strip("\n").replace(config_line_prefix, ""),
-                ),
-            )
-
-    config_error = f'There is no "{config_line_prefix}" line in the following config "{collection_path}"'
-    raise RuntimeError(config_error)
+    return collection_store.get(collection_path).content_type
 
 
 def get_guid_from_unreal_collection_path(collection_path: Path) -> UnrealGuid:
-    config_not_found_error = (
-        f'No file exists at the following provided collection path "{collection_path}".'
-    )
-    if not collection_path.is_file():
-        raise FileNotFoundError(config_not_found_error)
-    config_lines = get_all_lines_in_config(collection_path)
-    config_line_prefix = "Guid:"
-
-    for line in config_lines:
-        if line.strip("\n").startswith(config_line_prefix):
-            return UnrealGuid(line.strip("\n").replace(config_line_prefix, ""))
-
-    config_error = f'There is no "{config_line_prefix}" line in the following config "{collection_path}"'
-    raise RuntimeError(config_error)
+    return collection_store.get(collection_path).guid
 
 
 def get_parent_guid_from_unreal_collection_path(collection_path: Path) -> UnrealGuid:
-    config_not_found_error = (
-        f'No file exists at the following provided collection path "{collection_path}".'
-    )
-    if not collection_path.is_file():
-        raise FileNotFoundError(config_not_found_error)
-    config_lines = get_all_lines_in_config(collection_path)
-    config_line_prefix = "ParentGuid:"
-
-    for line in config_lines:
-        if line.strip("\n").startswith(config_line_prefix):
-            return UnrealGuid(line.strip("\n").replace(config_line_prefix, ""))
-
-    config_error = f'There is no "{config_line_prefix}" line in the following config "{collection_path}"'
-    raise RuntimeError(config_error)
+    return collection_store.get(collection_path).parent_guid
 
 
 def get_collection_color_from_unreal_collection_path(
     collection_path: Path,
 ) -> UnrealCollectionColor:
-    config_not_found_error = (
-        f'No file exists at the following provided collection path "{collection_path}".'
-    )
-    if not collection_path.is_file():
-        raise FileNotFoundError(config_not_found_error)
-    config_lines = get_all_lines_in_config(collection_path)
-    config_line_prefix = "Color:"
-
-    for line in config_lines:
-        if line.strip("\n").startswith(config_line_prefix):
-            return UnrealCollectionColor(
-                line.strip("\n").replace(config_line_prefix, ""),
-            )
-
-    config_error = f'There is no "{config_line_prefix}" line in the following config "{collection_path}"'
-    raise RuntimeError(config_error)
+    return collection_store.get(collection_path).color
 
 
 def add_content_lines_to_collection(
     collection: UnrealCollection, content_lines: list[UnrealAssetPath] | list[str],
 ) -> None:
-    for content_line in content_lines:
-        add_content_line_to_collection(collection, content_line)
+    with batch_collection_writes():
+        for content_line in content_lines:
+            add_content_line_to_collection(collection, content_line)
 
 
 def remove_content_lines_from_collection(
     collection: UnrealCollection, content_lines: list[UnrealAssetPath] | list[str],
 ) -> None:
-    for content_line in content_lines:
-        remove_content_line_from_collection(collection, content_line)
+    with batch_collection_writes():
+        for content_line in content_lines:
+            remove_content_line_from_collection(collection, content_line)
 
 
 def rename_collection_from_collection(collection: UnrealCollection, new_name: str) -> None:
@@ -595,46 +806,13 @@ def delete_collection(collection: UnrealCollection | Path) -> None:
 
 
 def get_all_key_lines_from_collection_path(collection_path: Path) -> list[str]:
-    if not collection_path.is_file():
-        no_collection_found_error = f'No file exists at the following provided collection path "{collection_path}".'
-        raise FileNotFoundError(no_collection_found_error)
-
-    config_lines = get_all_lines_in_config(collection_path)
-
-    key_start_sub_strings = ["FileVersion:", "Type:", "Guid:", "ParentGuid:", "Color:"]
-
-    return [
-        line.strip()
-        for line in config_lines
-        if any(
-            line.strip().startswith(sub_string) for sub_string in key_start_sub_strings
-        )
-    ]
+    _, key_lines, _ = read_collection_lines(collection_path)
+    return key_lines
 
 
 def get_all_non_key_lines_from_collection_path(collection_path: Path) -> list[str]:
-    if not collection_path.is_file():
-        no_collection_error = f'No file exists at the following provided collection path "{collection_path}".'
-        raise FileNotFoundError(no_collection_error)
-
-    config_lines = get_all_lines_in_config(collection_path)
-
-    removal_start_sub_strings = [
-        "FileVersion:",
-        "Type:",
-        "Guid:",
-        "ParentGuid:",
-        "Color:",
-    ]
-
-    return [
-        line.strip()
-        for line in config_lines
-        if not any(
-            line.strip().startswith(sub_string)
-            for sub_string in removal_start_sub_strings
-        )
-    ]
+    _, _, non_key_lines = read_collection_lines(collection_path)
+    return non_key_lines
 
 
 def get_blank_unreal_guid() -> UnrealGuid:
@@ -666,10 +844,11 @@ def add_child_collections_to_parent_collection(
     collections_directory: Path,
     parent_collection: UnrealCollection,
 ) -> None:
-    for collection in child_collections:
-        set_collection_parent_guid(
-            collection, collections_directory, parent_collection.guid,
-        )
+    with batch_collection_writes():
+        for collection in child_collections:
+            set_collection_parent_guid(
+                collection, collections_directory, parent_collection.guid,
+            )
 
 
 def remove_child_collection_from_parent_collection(
@@ -685,12 +864,13 @@ def remove_child_collection_from_parent_collection(
 def remove_child_collections_from_parent_collection(
     child_collections: list[UnrealCollection], collections_directory: Path,
 ) -> None:
-    for collection in child_collections:
-        set_collection_parent_guid(
-            collection,
-            collections_directory,
-            UnrealGuid(UnrealGuid.generate_unreal_guid()),
-        )
+    with batch_collection_writes():
+        for collection in child_collections:
+            set_collection_parent_guid(
+                collection,
+                collections_directory,
+                UnrealGuid(UnrealGuid.generate_unreal_guid()),
+            )
 
 
 def create_collection(
@@ -705,14 +885,9 @@ def create_collection(
     *,
     exist_ok: bool,
 ) -> None:
-    new_content_lines = []
-    if isinstance(content_lines, list) and all(
-        isinstance(x, str) for x in content_lines
-    ):
-        for content_line in content_lines:
-            new_content_lines.append(UnrealAssetPath(path=str(content_line)))
-    else:
-        new_content_lines = content_lines
+    new_content_lines = content_lines
+    if collection_type == UnrealContentLineType.STATIC:
+        new_content_lines = UnrealAssetPath.list_from_lines(str(content_line) for content_line in content_lines)
     collection_path = Path(f"{collections_directory}/{collection_name}")
     if collection_path.is_file() and not exist_ok:
         collection_exists_error = (
@@ -728,7 +903,7 @@ def create_collection(
         guid=guid,
         parent_guid=parent_guid,
         color=color,
-        content_lines=content_lines,
+        content_lines=new_content_lines,
     )
     unreal_collection_file_system_path = unreal_collection.file_system_path
     if unreal_collection_file_system_path.is_file():
@@ -792,23 +967,16 @@ def set_collection_guid_from_collection(
     original_collection_guid = get_guid_from_unreal_collection_path(
         collection.file_system_path,
     )
-    all_collection_paths = get_all_collection_paths(collections_directory)
-    all_collection_guids = [
-        get_guid_from_unreal_collection_path(path) for path in all_collection_paths
-    ]
-    if new_guid in all_collection_guids:
+    graph = get_collection_graph(collections_directory)
+    if new_guid in graph.collections_by_guid:
         guid_already_in_use_error = ""
         raise RuntimeError(guid_already_in_use_error)
-    if fix_child_collections_parent_guids:
-        for path in all_collection_paths:
-            if original_collection_guid == get_parent_guid_from_unreal_collection_path(
-                path,
-            ):
-                get_unreal_collection_from_unreal_collection_path(
-                    path,
-                ).parent_guid = new_guid
-    collection.guid = new_guid
-    save_unreal_collection_to_file(collection)
+    with batch_collection_writes():
+        if fix_child_collections_parent_guids:
+            for child_collection in graph.get_children(original_collection_guid):
+                save_unreal_collection_to_file(replace(child_collection, parent_guid=new_guid))
+        collection.guid = new_guid
+        save_unreal_collection_to_file(collection)
 
 
 def set_collection_parent_guid(
@@ -816,14 +984,7 @@ def set_collection_parent_guid(
     collections_directory: Path,
     new_guid: UnrealGuid = UnrealGuid(UnrealGuid.generate_unreal_guid()), # noqa
 ) -> None:
-    all_collection_paths = get_all_collection_paths(collections_directory)
-    parent_exists = False
-
-    for path in all_collection_paths:
-        other_collection = get_unreal_collection_from_unreal_collection_path(path)
-        if new_guid == other_collection.parent_guid:
-            parent_exists = True
-            break
+    parent_exists = new_guid in get_collection_graph(collections_directory).children_by_guid
 
     if not parent_exists:
         parent_guid_not_found_error = (
@@ -849,6 +1010,7 @@ def set_collection_color(
 def add_content_line_to_collection(
     collection: UnrealCollection, content_line: UnrealAssetPath | str,
 ) -> None:
+    content_line = get_content_line_for_collection(collection, content_line)
     if content_line not in collection.content_lines:
         collection.content_lines.append(content_line) # ty: ignore
         save_unreal_collection_to_file(collection)
@@ -857,21 +1019,27 @@ def add_content_line_to_collection(
 def get_child_collections(
     collection: UnrealCollection, collections_directory: Path,
 ) -> list[UnrealCollection]:
-    parent_guid = collection.parent_guid
-    child_collections = []
-    all_collection_paths = get_all_collection_paths(collections_directory)
-    for collection_path in all_collection_paths:
-        other_collection = get_unreal_collection_from_unreal_collection_path(
-            collection_path,
-        )
-        if other_collection.guid == parent_guid:
-            child_collections.append(other_collection)
-    return child_collections
+    graph = get_collection_graph(collections_directory)
+    return [
+        replace(child_collection, content_lines=list(child_collection.content_lines))
+        for child_collection in graph.get_children(collection.guid)
+    ]
+
+
+def get_descendant_collections(
+    collection: UnrealCollection, collections_directory: Path,
+) -> list[UnrealCollection]:
+    graph = get_collection_graph(collections_directory)
+    return [
+        replace(graph.collections_by_guid[guid], content_lines=list(graph.collections_by_guid[guid].content_lines))
+        for guid in graph.get_descendant_guids(collection.guid)
+    ]
 
 
 def remove_content_line_from_collection(
     collection: UnrealCollection, line_to_remove: UnrealAssetPath | str,
 ) -> None:
+    line_to_remove = get_content_line_for_collection(collection, line_to_remove)
     if line_to_remove in collection.content_lines:
         collection.content_lines.remove(line_to_remove) # ty: ignore
         save_unreal_collection_to_file(collection)
@@ -966,30 +1134,63 @@ def set_content_lines_from_collection_path(
     set_all_lines_in_config(collection_path, formatted_lines)
 
 
+def serialize_unreal_collection(unreal_collection: UnrealCollection) -> str:
+    lines = [
+        f"FileVersion:{unreal_collection.file_version}",
+        f"Type:{unreal_collection.content_type.value}",
+        f"Guid:{unreal_collection.guid}",
+        f"ParentGuid:{unreal_collection.parent_guid}",
+        f"Color:{unreal_collection.color.get_formatted_string()}",
+        "",
+    ]
+    lines.extend(str(content_line) for content_line in unreal_collection.content_lines)
+    return "".join(f"{line}\n" for line in lines)
+
+
+def write_file_atomically(file_path: Path, contents: str) -> bool:
+    """Writes through file_io.write_file_atomically and drops the file from the collection store."""
+    was_written = file_io.write_file_atomically(file_path, contents)
+    if was_written:
+        # the mtime alone can miss a rewrite within the same timestamp tick
+        collection_store.invalidate(file_path)
+    return was_written
+
+
+# collections saved inside batch_collection_writes on this thread, by path, last save wins
+collection_write_batch = threading.local()
+
+
+@contextlib.contextmanager
+def batch_collection_writes() -> Generator[None, None, None]:
+    """
+    Defers every save_unreal_collection_to_file in the block to one write per file at the end.
+    Nested batches join the outermost one. When the block raises nothing is written,
+    so a failed bulk edit never leaves half of its collections saved.
+    """
+    if getattr(collection_write_batch, "pending", None) is not None:
+        yield
+        return
+    collection_write_batch.pending = {}
+    try:
+        yield
+        pending_collections = collection_write_batch.pending
+    finally:
+        collection_write_batch.pending = None
+    for unreal_collection in pending_collections.values():
+        write_file_atomically(unreal_collection.file_system_path, serialize_unreal_collection(unreal_collection))
+
+
 def save_unreal_collection_to_file(
     unreal_collection: UnrealCollection, *, exist_ok: bool = True,
 ) -> None:
     if not exist_ok and unreal_collection.file_system_path.is_file():
         collection_already_exists_error = f'The following collection file already exists "{unreal_collection.file_system_path}".'
         raise FileExistsError(collection_already_exists_error)
-    set_color_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.color,
-    )
-    set_parent_guid_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.parent_guid,
-    )
-    set_guid_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.guid,
-    )
-    set_collection_type_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.content_type,
-    )
-    set_file_version_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.file_version,
-    )
-    set_content_lines_from_collection_path(
-        unreal_collection.file_system_path, unreal_collection.content_lines,
-    )
+    pending_collections = getattr(collection_write_batch, "pending", None)
+    if pending_collections is not None:
+        pending_collections[unreal_collection.file_system_path] = unreal_collection
+        return
+    write_file_atomically(unreal_collection.file_system_path, serialize_unreal_collection(unreal_collection))
 
 
 # Code below is file_io specific
@@ -1011,10 +1212,9 @@ def save_unreal_collection_to_file(
 def set_all_lines_in_config(
     config_path: Path, lines: list[str], *, auto_add_new_line: bool = True,
 ) -> None:
-    with Path.open(config_path, "w", encoding="utf-8") as file:
-        if auto_add_new_line:
-            lines = [line if line.endswith("\n") else line + "\n" for line in lines]
-        file.writelines(lines)
+    if auto_add_new_line:
+        lines = [line if line.endswith("\n") else line + "\n" for line in lines]
+    write_file_atomically(config_path, "".join(lines))
 
 
 def get_all_lines_in_config(
@@ -1036,8 +1236,9 @@ def get_files_in_dir(directory: Path) -> list[Path]:
 
 
 def filter_by_extension(files: list[Path], extension: str) -> list[Path]:
-    ext = extension.lower().lstrip(".")
-    return [f for f in files if f.suffix.lower().lstrip(".") == ext]
+    # matched against the whole name, so multi part extensions like .collection.disabled work
+    ext = f".{extension.lower().lstrip('.')}"
+    return [f for f in files if f.name.lower().endswith(ext)]
 
 
 # Code below is unreal auto mod specific
@@ -1,113 +1,365 @@
+"""
+A section aware model of Unreal Engine ini files.
+
+An IniDocument is parsed once, keeps every line it was not asked to change exactly as written,
+comments and ordering included, and understands the array operators Unreal uses:
+
+    Key=Value     sets the value, clearing anything set before it
+    +Key=Value    adds the value if it is not already there
+    .Key=Value    adds the value even if it is already there
+    -Key=Value    removes the value
+    !Key=...      clears the key
+
+Edits made inside edit_ini_document are applied in memory and written once, atomically, at the end.
+"""
+
+from __future__ import annotations
+
+import threading
+import contextlib
 from pathlib import Path
+from dataclasses import dataclass, field, replace
+from collections.abc import Callable, Generator
+
+from tempo_core import file_io
+
+INI_ARRAY_OPERATORS = ("+", "-", "!", ".")
+
+ASSET_MANAGER_SETTINGS_SECTION = "/Script/Engine.AssetManagerSettings"
+GAME_MAPS_SETTINGS_SECTION = "/Script/EngineSettings.GameMapsSettings"
+PROJECT_PACKAGING_SETTINGS_SECTION = "/Script/UnrealEd.ProjectPackagingSettings"
+
+
+@dataclass(frozen=True, slots=True)
+class IniLine:
+    """One line of an ini file, text is kept as read so untouched lines are written back unchanged."""
+
+    text: str
+    key: str | None = None
+    operator: str = ""
+    value: str = ""
+
+    @classmethod
+    def from_text(cls, text: str) -> IniLine:
+        stripped = text.strip()
+        if not stripped or stripped.startswith((";", "#")):
+            return cls(text=text)
+        operator = stripped[0] if stripped[0] in INI_ARRAY_OPERATORS else ""
+        key, _, value = stripped[len(operator):].partition("=")
+        return cls(text=text, key=key.strip(), operator=operator, value=value.strip())
+
+    @classmethod
+    def from_key_value(cls, key: str, value: str, operator: str = "") -> IniLine:
+        return cls(text=f"{operator}{key}={value}", key=key, operator=operator, value=value)
+
+
+@dataclass(slots=True)
+class IniSection:
+    name: str
+    # the header as written, None for the lines before the first header
+    header: str | None
+    lines: list[IniLine] = field(default_factory=list)
+
+    def get_key_lines(self, key: str) -> list[IniLine]:
+        return [line for line in self.lines if line.key == key]
+
+    def insert_line(self, line: IniLine) -> None:
+        """Adds the line after the last non blank line, so the blank line before the next section stays put."""
+        index = len(self.lines)
+        while index > 0 and not self.lines[index - 1].text.strip():
+            index -= 1
+        self.lines.insert(index, line)
+
+
+@dataclass
+class IniDocument:
+    path: Path
+    sections: list[IniSection]
+    newline: str = "\n"
+    has_trailing_newline: bool = True
+    is_modified: bool = False
+
+    @classmethod
+    def parse(cls, path: Path, text: str) -> IniDocument:
+        newline = "\r\n" if "\r\n" in text else "\n"
+        lines = text.split(newline)
+        has_trailing_newline = lines[-1] == ""
+        if has_trailing_newline:
+            lines.pop()
+        sections = [IniSection(name="", header=None)]
+        for line in lines:
+            stripped = line.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                sections.append(IniSection(name=stripped[1:-1].strip(), header=line))
+            else:
+                sections[-1].lines.append(IniLine.from_text(line))
+        return cls(path=path, sections=sections, newline=newline, has_trailing_newline=has_trailing_newline)
+
+    def serialize(self) -> str:
+        lines = []
+        for section in self.sections:
+            if section.header is not None:
+                lines.append(section.header)
+            lines.extend(line.text for line in section.lines)
+        text = self.newline.join(lines)
+        if lines and self.has_trailing_newline:
+            text += self.newline
+        return text
+
+    def copy(self) -> IniDocument:
+        # lines are frozen, so copying the per section lists is enough to keep edits apart
+        return replace(
+            self,
+            sections=[replace(section, lines=list(section.lines)) for section in self.sections],
+        )
+
+    def get_section(self, section_name: str) -> IniSection | None:
+        for section in self.sections:
+            if section.header is not None and section.name == section_name:
+                return section
+        return None
+
+    def get_or_add_section(self, section_name: str) -> IniSection:
+        section = self.get_section(section_name)
+        if section is None:
+            last_section = self.sections[-1]
+            if last_section.lines and last_section.lines[-1].text.strip():
+                last_section.lines.append(IniLine(text=""))
+            section = IniSection(name=section_name, header=f"[{section_name}]")
+            self.sections.append(section)
+            self.is_modified = True
+        return section
+
+    def get_section_names(self) -> list[str]:
+        return [section.name for section in self.sections if section.header is not None]
+
+    def get_values(self, section_name: str, key: str) -> list[str]:
+        """The values the key ends up with once every operator in the section has been applied in order."""
+        section = self.get_section(section_name)
+        values: list[str] = []
+        if section is None:
+            return values
+        for line in section.get_key_lines(key):
+            if line.operator == "":
+                values = [line.value]
+            elif line.operator == "+":
+                if line.value not in values:
+                    values.append(line.value)
+            elif line.operator == ".":
+                values.append(line.value)
+            elif line.operator == "-":
+                values = [value for value in values if value != line.value]
+            elif line.operator == "!":
+                values = []
+        return values
+
+    def get_value(self, section_name: str, key: str) -> str | None:
+        values = self.get_values(section_name, key)
+        return values[-1] if values else None
+
+    def set_value(self, section_name: str, key: str, value: str) -> None:
+        """Sets a single value, rewriting the first plain assignment in place and dropping any other lines for the key."""
+        section = self.get_or_add_section(section_name)
+        new_line = IniLine.from_key_value(key, value)
+        new_lines = []
+        was_placed = False
+        for line in section.lines:
+            if line.key != key:
+                new_lines.append(line)
+            elif not was_placed and line.operator == "":
+                new_lines.append(line if line.value == value else new_line)
+                was_placed = True
+        if was_placed:
+            if new_lines != section.lines:
+                section.lines[:] = new_lines
+                self.is_modified = True
+            return
+        section.lines[:] = new_lines
+        section.insert_line(new_line)
+        self.is_modified = True
+
+    def add_array_value(self, section_name: str, key: str, value: str, operator: str = "+") -> None:
+        section = self.get_or_add_section(section_name)
+        if any(line.operator == operator and line.value == value for line in section.get_key_lines(key)):
+            return
+        section.insert_line(IniLine.from_key_value(key, value, operator))
+        self.is_modified = True
+
+    def remove_array_value(self, section_name: str, key: str, value: str) -> None:
+        """Drops the lines adding the value, the value is not written out as a -Key line."""
+        self.remove_lines(
+            section_name, lambda line: line.key == key and line.operator in ("+", ".") and line.value == value,
+        )
+
+    def remove_key(self, section_name: str, key: str) -> None:
+        self.remove_lines(section_name, lambda line: line.key == key)
+
+    def remove_lines(self, section_name: str, predicate: Callable[[IniLine], bool]) -> None:
+        section = self.get_section(section_name)
+        if section is None:
+            return
+        new_lines = [line for line in section.lines if not predicate(line)]
+        if len(new_lines) != len(section.lines):
+            section.lines[:] = new_lines
+            self.is_modified = True
+
+    def find_sections_with_key(self, key: str) -> list[str]:
+        return [
+            section.name for section in self.sections
+            if section.header is not None and section.get_key_lines(key)
+        ]
+
+
+@dataclass
+class IniDocumentCache:
+    """Parsed documents by path, reparsed only when the mtime or size changes."""
+
+    entries: dict[Path, tuple[int, int, IniDocument]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, ini_path: Path) -> IniDocument:
+        stat_result = ini_path.stat()
+        stamp = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self.lock:
+            entry = self.entries.get(ini_path)
+        if entry and entry[:2] == stamp:
+            document = entry[2]
+        else:
+            with ini_path.open(encoding="utf-8-sig", newline="") as file:
+                document = IniDocument.parse(ini_path, file.read())
+            with self.lock:
+                self.entries[ini_path] = (*stamp, document)
+        return document.copy()
+
+    def invalidate(self, ini_path: Path | None = None) -> None:
+        with self.lock:
+            if ini_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(ini_path, None)
 
 
-def add_meta_data_tags_for_asset_registry_to_unreal_ini(ini: Path, tags: list[str]) -> None:
-    with ini.open("r") as file:
-        lines = file.readlines()
+ini_document_cache = IniDocumentCache()
+
 
-    for i, line in enumerate(lines):
-        if line.strip().startswith("MetaDataTagsForAssetRegistry"):
-            existing_tags = (
-                line.split("=")[1].strip().strip("()").replace('"', "").split(",")
-            )
-            existing_tags = [tag.strip() for tag in existing_tags if tag.strip()]
+def get_ini_document(ini_path: Path) -> IniDocument:
+    """Returns a copy of the parsed ini, edits to it do not touch the cache or the file until saved."""
+    if not ini_path.is_file():
+        return IniDocument(path=ini_path, sections=[IniSection(name="", header=None)])
+    return ini_document_cache.get(ini_path)
 
-            for tag in tags:
-                if tag not in existing_tags:
-                    existing_tags.append(tag)
 
-            updated_tags = ",".join(f'"{tag}"' for tag in existing_tags)
-            lines[i] = f"MetaDataTagsForAssetRegistry=({updated_tags})\n"
-            break
-    else:
-        updated_tags = ",".join(f'"{tag}"' for tag in tags)
-        lines.append(f"MetaDataTagsForAssetRegistry=({updated_tags})\n")
+def save_ini_document(document: IniDocument) -> None:
+    if not document.is_modified:
+        return
+    file_io.write_file_atomically(document.path, document.serialize(), newline="")
+    ini_document_cache.invalidate(document.path)
+    document.is_modified = False
+
 
-    with ini.open("w") as file:
-        file.writelines(lines)
+@contextlib.contextmanager
+def edit_ini_document(ini_path: Path) -> Generator[IniDocument, None, None]:
+    """Yields the parsed ini for any number of edits, then writes it once if anything changed."""
+    document = get_ini_document(ini_path)
+    yield document
+    save_ini_document(document)
+
+
+def parse_meta_data_tags(value: str) -> list[str]:
+    tags = value.strip().strip("()").replace('"', "").split(",")
+    return [tag.strip() for tag in tags if tag.strip()]
+
+
+def format_meta_data_tags(tags: list[str]) -> str:
+    return "(" + ",".join(f'"{tag}"' for tag in tags) + ")"
+
+
+def add_meta_data_tags_for_asset_registry_to_unreal_ini(ini: Path, tags: list[str]) -> None:
+    with edit_ini_document(ini) as document:
+        section_names = document.find_sections_with_key("MetaDataTagsForAssetRegistry")
+        section_name = section_names[0] if section_names else ASSET_MANAGER_SETTINGS_SECTION
+        existing_tags = parse_meta_data_tags(document.get_value(section_name, "MetaDataTagsForAssetRegistry") or "")
+        for tag in tags:
+            if tag not in existing_tags:
+                existing_tags.append(tag)
+        document.set_value(section_name, "MetaDataTagsForAssetRegistry", format_meta_data_tags(existing_tags))
 
 
 def remove_meta_data_tags_for_asset_registry_from_unreal_ini(
     ini: Path, tags: list[str],
 ) -> None:
-    with ini.open("r") as file:
-        lines = file.readlines()
+    with edit_ini_document(ini) as document:
+        section_names = document.find_sections_with_key("MetaDataTagsForAssetRegistry")
+        if not section_names:
+            return
+        section_name = section_names[0]
+        existing_tags = parse_meta_data_tags(document.get_value(section_name, "MetaDataTagsForAssetRegistry") or "")
+        updated_tags = [tag for tag in existing_tags if tag not in tags]
+        document.set_value(section_name, "MetaDataTagsForAssetRegistry", format_meta_data_tags(updated_tags))
 
-    for i, line in enumerate(lines):
-        if line.strip().startswith("MetaDataTagsForAssetRegistry"):
-            existing_tags = (
-                line.split("=")[1].strip().strip("()").replace('"', "").split(",")
-            )
-            existing_tags = [tag.strip() for tag in existing_tags if tag.strip()]
 
-            updated_tags = [tag for tag in existing_tags if tag not in tags]
+def set_default_map_in_ini(ini: Path, map_path: str) -> None:
+    with edit_ini_document(ini) as document:
+        document.set_value(GAME_MAPS_SETTINGS_SECTION, "GameDefaultMap", map_path)
 
-            if updated_tags:
-                updated_tags = ",".join(f'"{tag}"' for tag in updated_tags)
-                lines[i] = f"MetaDataTagsForAssetRegistry=({updated_tags})\n"
-            else:
-                lines[i] = "MetaDataTagsForAssetRegistry=()\n"
-            break
-    else:
-        return
 
-    with ini.open("w") as file:
-        file.writelines(lines)
+def get_default_map_in_ini(ini: Path) -> str | None:
+    return get_ini_document(ini).get_value(GAME_MAPS_SETTINGS_SECTION, "GameDefaultMap")
 
 
-# def disable_serialized_properties_in_ini():
-#     return
-
-
-# def enable_serialized_properties_in_ini():
-#     return
+def set_default_editor_startup_map(ini: Path, map_path: str) -> None:
+    with edit_ini_document(ini) as document:
+        document.set_value(GAME_MAPS_SETTINGS_SECTION, "EditorStartupMap", map_path)
 
 
-# def set_default_map_in_ini():
-#     return
+def set_packaging_settings_in_ini(ini: Path, values: dict[str, str]) -> None:
+    """Sets any number of project packaging settings with a single write."""
+    with edit_ini_document(ini) as document:
+        for key, value in values.items():
+            document.set_value(PROJECT_PACKAGING_SETTINGS_SECTION, key, value)
 
 
-# def get_default_map_in_ini():
-#     return
+def disable_share_material_libraries(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bSharedMaterialNativeLibraries": "False"})
 
 
-# def disable_share_material_libraries():
-#     return
+def disable_share_material_code(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bShareMaterialShaderCode": "False"})
 
 
-# def disable_share_material_code():
-#     return
+def disable_iostore(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bUseIoStore": "False"})
 
 
-# def disable_iostore():
-#     return
+def disable_chunking(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bGenerateChunks": "False"})
 
 
-# def disable_chunking():
-#     return
+def enable_compressed_paks(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bCompressed": "True"})
 
 
-# def set_unreal_engine_theme():
-#     return
+def enable_using_pak(ini: Path) -> None:
+    set_packaging_settings_in_ini(ini, {"bUsePakFile": "True"})
 
 
-# def delete_asset_manager_maps_rule():
+# def disable_serialized_properties_in_ini():
 #     return
 
 
-# def enable_iterative_cooking():
+# def enable_serialized_properties_in_ini():
 #     return
 
 
-# def enable_compressed_paks():
+# def set_unreal_engine_theme():
 #     return
 
 
-# def enable_using_pak():
+# def delete_asset_manager_maps_rule():
 #     return
 
 
-# def set_default_editor_startup_map():
+# def enable_iterative_cooking():
 #     return
 
 
@@ -1,6 +1,4 @@
-from tempo_binary_tool_manager.manager import is_windows, is_linux
 import os
-import shutil
 from pathlib import Path
 
 from tempo_core import file_io, settings
@@ -138,9 +136,9 @@ def get_persistent_mod_files(mod_name: str) -> list[Path]:
 
 
 def clean_temp_dir() -> None:
-    temp_dir = settings.get_temp_directory()
-    if temp_dir.is_dir():
-        shutil.rmtree(temp_dir)
+    from tempo_core import workspace
+
+    workspace.clear_workspace()
 
 
 def filter_file_paths(paths_dict: dict[Path, Path]) -> dict[Path, Path]:
@@ -164,9 +162,9 @@ def get_game_window_title() -> str:
 
 
 def get_maximum_command_length() -> int:
-    if is_windows():
+    if settings.is_windows():
         return 32767
-    elif is_linux():
+    elif settings.is_linux():
         return os.sysconf('SC_ARG_MAX') # ty: ignore
     else:
         raise RuntimeError('unsupported os')
@@ -0,0 +1,211 @@
+import os
+import time
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+
+from tempo_core import collection_resolver, data_structures, logger, packing, settings, timer, unreal_collections, utilities
+from tempo_core.data_structures import PackingType
+from tempo_core.programs import unreal_engine
+
+# how often the watched trees are rescanned
+DEFAULT_POLL_INTERVAL = 0.25
+
+# a burst of writes, like a cook, is handled once it has been quiet this long
+DEFAULT_DEBOUNCE_SECONDS = 0.3
+
+# engine mods come out of a full project package, so there is nothing to repack per mod
+UNWATCHABLE_PACKING_TYPES = {PackingType.ENGINE}
+
+
+@dataclass
+class ModWatchIndex:
+    """Maps files and directories under watch back to the enabled mods that include them."""
+
+    file_to_mods: dict[Path, set[str]] = field(default_factory=dict)
+    # directories whose whole tree belongs to the mods, so new files are picked up too
+    tree_to_mods: dict[Path, set[str]] = field(default_factory=dict)
+    # cooked asset paths without extension, so a new .ubulk next to an included asset still counts
+    asset_base_to_mods: dict[Path, set[str]] = field(default_factory=dict)
+    collection_mods: set[str] = field(default_factory=set)
+    collection_dirs: list[Path] = field(default_factory=list)
+
+    def get_watch_roots(self) -> list[Path]:
+        roots = {*self.tree_to_mods, *self.collection_dirs}
+        roots.update(asset_base.parent for asset_base in self.asset_base_to_mods)
+        roots.update(file_path.parent for file_path in self.file_to_mods)
+        # roots that do not exist yet are kept, every poll checks them again, so a cooked or collection dir
+        # made after watching started is picked up as soon as it shows up
+        return sorted(roots)
+
+    def get_mods_for_path(self, changed_path: Path) -> set[str]:
+        mod_names = set(self.file_to_mods.get(changed_path, ()))
+        mod_names.update(self.asset_base_to_mods.get(changed_path.with_suffix(""), ()))
+        for parent in changed_path.parents:
+            mod_names.update(self.tree_to_mods.get(parent, ()))
+            if parent in self.collection_dirs:
+                mod_names.update(self.collection_mods)
+        return mod_names
+
+
+def get_watched_mod_names() -> list[str]:
+    mods_info = settings.get_mods_info_dict_from_json()
+    mod_names = []
+    for mod_name in sorted(settings.get_enabled_mod_names()):
+        packing_type = data_structures.get_enum_from_val(PackingType, mods_info[mod_name]["packing_type"])
+        if packing_type not in UNWATCHABLE_PACKING_TYPES:
+            mod_names.append(mod_name)
+    return mod_names
+
+
+def get_mod_source_paths(mod_name: str) -> list[Path]:
+    if packing.get_mod_packing_type(mod_name) == PackingType.LOOSE:
+        return list(packing.get_mod_paths_for_loose_mods(mod_name))
+    return list(packing.get_mod_file_paths_for_manually_made_pak_mods(mod_name))
+
+
+def get_collection_dirs(uproject_dir: Path) -> list[Path]:
+    return [
+        unreal_collections.get_local_collections_directory(uproject_dir, create_directory_if_missing=False),
+        unreal_collections.get_private_collections_directory(uproject_dir, create_directory_if_missing=False),
+        unreal_collections.get_shared_collections_directory(uproject_dir, create_directory_if_missing=False),
+    ]
+
+
+@timer.timed("watch")
+def build_mod_watch_index() -> ModWatchIndex:
+    index = ModWatchIndex()
+    uproject_file = settings.get_uproject_file_or_raise()
+    cooked_uproject_dir = unreal_engine.get_cooked_uproject_dir(
+        uproject_file, settings.get_unreal_engine_dir_or_raise(),
+    )
+    index.collection_dirs = get_collection_dirs(uproject_file.parent)
+    for mod_name in get_watched_mod_names():
+        for source_path in get_mod_source_paths(mod_name):
+            index.file_to_mods.setdefault(Path(source_path), set()).add(mod_name)
+
+        mod_trees = [
+            settings.get_persistent_mod_dir(mod_name),
+            Path(
+                cooked_uproject_dir / "Content" / utilities.get_unreal_mod_tree_type_str(mod_name)
+                / utilities.get_mod_name_dir_name(mod_name),
+            ),
+        ]
+        file_includes = packing.get_mod_pak_entry(mod_name).get("file_includes", {})
+        mod_trees.extend(Path(cooked_uproject_dir / tree) for tree in file_includes.get("tree_paths", []))
+        for mod_tree in mod_trees:
+            index.tree_to_mods.setdefault(mod_tree, set()).add(mod_name)
+        for asset in collection_resolver.get_mod_asset_paths(mod_name):
+            index.asset_base_to_mods.setdefault(Path(cooked_uproject_dir / asset), set()).add(mod_name)
+        if any(file_includes.get(key) for key in collection_resolver.COLLECTION_FILE_INCLUDE_KEYS):
+            index.collection_mods.add(mod_name)
+    return index
+
+
+def scan_tree(root: Path, stamps: dict[Path, tuple[int, int]]) -> None:
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                scan_tree(Path(entry.path), stamps)
+            else:
+                stat_result = entry.stat()
+                stamps[Path(entry.path)] = (stat_result.st_mtime_ns, stat_result.st_size)
+        except OSError:
+            # deleted between listing and stat, the next scan reports it as removed
+            continue
+
+
+def scan_watch_roots(roots: list[Path]) -> dict[Path, tuple[int, int]]:
+    stamps: dict[Path, tuple[int, int]] = {}
+    for root in roots:
+        scan_tree(root, stamps)
+    return stamps
+
+
+def get_changed_paths(
+    old_stamps: dict[Path, tuple[int, int]], new_stamps: dict[Path, tuple[int, int]],
+) -> set[Path]:
+    changed_paths = {path for path, stamp in new_stamps.items() if old_stamps.get(path) != stamp}
+    changed_paths.update(old_stamps.keys() - new_stamps.keys())
+    return changed_paths
+
+
+def repack_mods(mod_names: set[str], *, use_symlinks: bool) -> None:
+    """Restages, repacks and reinstalls only the given mods, leaving every other installed mod alone."""
+    for mod_name in sorted(mod_names):
+        with timer.span(f"repack_{mod_name}", category="watch"):
+            packing_type = packing.get_mod_packing_type(mod_name)
+            packing.uninstall_mod(packing_type, mod_name)
+            compression_type_str = packing.get_mod_pak_entry(mod_name).get("compression_type")
+            compression_type = None
+            if packing_type == PackingType.UNREAL_PAK and compression_type_str:
+                compression_type = data_structures.get_enum_from_val(
+                    data_structures.CompressionType, compression_type_str,
+                )
+            packing.install_mod(
+                packing_type=packing_type,
+                mod_name=mod_name,
+                compression_type=compression_type,
+                use_symlinks=use_symlinks,
+            )
+
+
+def watch_mods(
+    *,
+    use_symlinks: bool,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    stop_event: threading.Event | None = None,
+) -> None:
+    """
+    Watches cooked output, persistent mod dirs and collections, repacking the mods a change belongs to.
+    Runs until stop_event is set, or until interrupted when none is given.
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    index = build_mod_watch_index()
+    roots = index.get_watch_roots()
+    stamps = scan_watch_roots(roots)
+    logger.log_message(f"Watch: watching {len(stamps)} files in {len(roots)} directories")
+
+    pending_paths: set[Path] = set()
+    last_change_time = 0.0
+    try:
+        while not stop_event.wait(poll_interval):
+            new_stamps = scan_watch_roots(roots)
+            changed_paths = get_changed_paths(stamps, new_stamps)
+            stamps = new_stamps
+            if changed_paths:
+                pending_paths.update(changed_paths)
+                last_change_time = time.monotonic()
+                continue
+            if not pending_paths or time.monotonic() - last_change_time < debounce_seconds:
+                continue
+
+            affected_mod_names: set[str] = set()
+            for changed_path in pending_paths:
+                affected_mod_names.update(index.get_mods_for_path(changed_path))
+            pending_paths.clear()
+            if not affected_mod_names:
+                continue
+
+            logger.log_message(f"Watch: repacking {', '.join(sorted(affected_mod_names))}")
+            start_time = time.perf_counter()
+            try:
+                repack_mods(affected_mod_names, use_symlinks=use_symlinks)
+            except Exception as error:  # noqa: BLE001
+                # keep watching, the next save usually fixes whatever broke the repack
+                logger.log_message(f"Error: Watch: repack failed: {error}")
+                continue
+            logger.log_message(f"Watch: repacked in {time.perf_counter() - start_time:.2f}s")
+
+            # new files may have joined a mod, and staging may have created watched directories
+            index = build_mod_watch_index()
+            roots = index.get_watch_roots()
+            stamps = scan_watch_roots(roots)
+    except KeyboardInterrupt:
+        logger.log_message("Watch: stopped")
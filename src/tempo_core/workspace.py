@@ -0,0 +1,130 @@
+"""
+Per run workspaces in the temp dir, so several tempo processes can run side by side on one machine.
+Within a run every session stages into its own subdirectory, so sessions working on different projects
+in one process never share a mod's staging or intermediate pak dirs.
+
+Each run stages into its own directory and holds a lock file next to it for as long as the process lives,
+taken before the directory is made. A workspace whose lock can be taken belongs to a run that has exited,
+so clearing purges those, along with anything older versions left directly in the temp dir.
+"""
+
+import os
+import uuid
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from tempo_core import cleanup, file_io, file_locks, logger, session
+
+RUN_DIR_PREFIX = "run_"
+LOCK_SUFFIX = ".lock"
+
+
+@dataclass
+class WorkspaceInformation:
+    run_id: str
+    workspace_dir: Path | None = None
+    lock_file_descriptor: int | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+workspace_information = WorkspaceInformation(
+    run_id=f"{datetime.now().strftime('%Y_%m_%d_%H%M_%S')}_{os.getpid()}_{uuid.uuid4().hex[:6]}",
+)
+
+
+def get_workspaces_root() -> Path:
+    # TEMPO_TEMP_DIRECTORY moves the workspaces out of the install dir, the benchmarks keep them in their work dir
+    env_value = os.environ.get("TEMPO_TEMP_DIRECTORY")
+    if env_value:
+        return Path(env_value)
+    return Path(file_io.SCRIPT_DIR / "temp")
+
+
+def get_workspace_lock_path(workspace_dir: Path) -> Path:
+    return workspace_dir.with_name(f"{workspace_dir.name}{LOCK_SUFFIX}")
+
+
+def get_run_workspace_dir() -> Path:
+    """This run's own temp dir, locked for the rest of the process on first use."""
+    with workspace_information.lock:
+        if workspace_information.workspace_dir is None:
+            workspace_dir = Path(get_workspaces_root() / f"{RUN_DIR_PREFIX}{workspace_information.run_id}")
+            workspace_information.lock_file_descriptor = file_locks.acquire_file_lock(
+                get_workspace_lock_path(workspace_dir),
+            )
+            workspace_information.workspace_dir = workspace_dir
+        workspace_dir = workspace_information.workspace_dir
+    workspace_dir.mkdir(parents=True, exist_ok=True)
+    return workspace_dir
+
+
+def new_session_workspace_dir(session_name: str) -> Path:
+    return Path(get_run_workspace_dir() / f"{session_name}_{uuid.uuid4().hex[:6]}")
+
+
+def get_session_workspace_dir() -> Path:
+    """The current session's staging dir within this run's workspace."""
+    workspace_dir = session.get_current_session().workspace_dir
+    workspace_dir.mkdir(parents=True, exist_ok=True)
+    return workspace_dir
+
+
+def move_stale_workspace_to_trash(workspace_dir: Path) -> Path | None:
+    lock_path = get_workspace_lock_path(workspace_dir)
+    lock_file_descriptor = file_locks.acquire_file_lock(lock_path, timeout=0)
+    if lock_file_descriptor is None:
+        # the run is still going
+        return None
+    try:
+        trash_path = cleanup.move_to_trash(workspace_dir) if workspace_dir.is_dir() else None
+    except OSError as error:
+        file_locks.release_file_lock(lock_file_descriptor)
+        logger.log_message(f'Warning: could not remove the old workspace "{workspace_dir}": {error}')
+        return None
+    file_locks.release_and_delete_file_lock(lock_path, lock_file_descriptor)
+    return trash_path
+
+
+def purge_stale_workspaces() -> None:
+    """Deletes the workspaces of runs that have exited, and whatever else is left over in the temp dir."""
+    workspaces_root = get_workspaces_root()
+    own_workspace_dir = workspace_information.workspace_dir
+    trash_paths = []
+    try:
+        entries = list(os.scandir(workspaces_root))
+    except OSError:
+        return
+    for entry in entries:
+        entry_path = Path(entry.path)
+        if own_workspace_dir is not None and entry.name in {own_workspace_dir.name, f"{own_workspace_dir.name}{LOCK_SUFFIX}"}:
+            continue
+        if not entry.is_dir(follow_symlinks=False) and not entry.name.endswith(LOCK_SUFFIX):
+            entry_path.unlink(missing_ok=True)
+        elif cleanup.is_trash_dir_name(entry.name):
+            trash_paths.append(entry_path)
+        elif entry.name.startswith(RUN_DIR_PREFIX):
+            workspace_dir = entry_path.with_name(entry.name.removesuffix(LOCK_SUFFIX))
+            # a workspace shows up as its dir and its lock file, either one is enough to handle it
+            if entry.name.endswith(LOCK_SUFFIX) and Path(workspaces_root / workspace_dir.name).exists():
+                continue
+            trash_path = move_stale_workspace_to_trash(workspace_dir)
+            if trash_path is not None:
+                trash_paths.append(trash_path)
+        else:
+            # staged files from versions that shared one temp dir between runs
+            try:
+                trash_paths.append(cleanup.move_to_trash(entry_path))
+            except OSError as error:
+                logger.log_message(f'Warning: could not remove "{entry_path}": {error}')
+    cleanup.delete_in_background(trash_paths)
+
+
+def clear_workspace() -> None:
+    """Purges stale workspaces and empties the current session's, deleting in the background."""
+    purge_stale_workspaces()
+    workspace_dir = get_session_workspace_dir()
+    # at startup the workspace was only just made, there is nothing in it to move aside and delete
+    if next(workspace_dir.iterdir(), None) is not None:
+        cleanup.purge_directory(workspace_dir)
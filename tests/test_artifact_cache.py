@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import artifact_cache
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.cache_dir = self.root / "cache"
+        self.source_file = self.root / "Mod" / "Asset.uasset"
+        self.source_file.parent.mkdir()
+        self.source_file.write_bytes(b"asset")
+        self.artifact_file = self.root / "built" / "Mod.pak"
+        self.artifact_file.parent.mkdir()
+        self.artifact_file.write_bytes(b"p" * 100)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def get_key(self, parameters: dict | None = None) -> str:
+        return artifact_cache.get_artifact_key(
+            parameters or {"packing_type": "repak"},
+            {"Mod/Content/Asset.uasset": self.source_file},
+            cache_dir=self.cache_dir,
+        )
+
+    def test_key_follows_content_not_mtime(self) -> None:
+        key = self.get_key()
+        os.utime(self.source_file, ns=(1, 1))
+        self.assertEqual(self.get_key(), key)
+        self.source_file.write_bytes(b"changed")
+        self.assertNotEqual(self.get_key(), key)
+        self.assertNotEqual(self.get_key({"packing_type": "retoc"}), self.get_key())
+
+    def test_store_then_install(self) -> None:
+        key = self.get_key()
+        dest_dir = self.root / "Paks"
+        self.assertIsNone(artifact_cache.install_artifacts(key, dest_dir, cache_dir=self.cache_dir))
+        artifact_cache.store_artifacts(key, [self.artifact_file], cache_dir=self.cache_dir)
+        installed_files = artifact_cache.install_artifacts(key, dest_dir, cache_dir=self.cache_dir)
+        self.assertEqual(installed_files, [dest_dir / "Mod.pak"])
+        self.assertEqual((dest_dir / "Mod.pak").read_bytes(), b"p" * 100)
+        # installed files are copies, they outlive the entry they came from
+        self.assertFalse((dest_dir / "Mod.pak").is_symlink())
+        artifact_cache.prune_cache(0, cache_dir=self.cache_dir)
+        self.assertEqual((dest_dir / "Mod.pak").read_bytes(), b"p" * 100)
+
+    def test_prune_evicts_least_recently_used(self) -> None:
+        for key in ("aa01", "bb02", "cc03"):
+            artifact_cache.store_artifacts(key, [self.artifact_file], cache_dir=self.cache_dir)
+        for last_used, key in enumerate(("bb02", "aa01", "cc03")):
+            os.utime(artifact_cache.get_entry_dir(self.cache_dir, key) / artifact_cache.ENTRY_METADATA_FILE_NAME, (last_used, last_used))
+        freed_size = artifact_cache.prune_cache(200, cache_dir=self.cache_dir)
+        self.assertEqual(freed_size, 100)
+        self.assertEqual(sorted(entry.key for entry in artifact_cache.iter_entries(self.cache_dir)), ["aa01", "cc03"])
+
+    def test_store_keeps_cache_within_quota(self) -> None:
+        with mock.patch.dict(os.environ, {"TEMPO_ARTIFACT_CACHE_QUOTA_MB": str(150 / (1024 * 1024))}):
+            artifact_cache.store_artifacts("aa01", [self.artifact_file], cache_dir=self.cache_dir)
+            artifact_cache.store_artifacts("bb02", [self.artifact_file], cache_dir=self.cache_dir)
+            stats = artifact_cache.get_cache_stats(cache_dir=self.cache_dir)
+        self.assertEqual(stats.entry_count, 1)
+        self.assertEqual(artifact_cache.iter_entries(self.cache_dir)[0].key, "bb02")
+        self.assertEqual(stats.total_size, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import cleanup
+
+
+class TestCleanup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for directory in ("Project/Intermediate/Build", "Project/Plugins/Tool/Binaries", "Project/Source"):
+            (self.root / directory).mkdir(parents=True)
+            (self.root / directory / "file.bin").write_bytes(b"x" * 100)
+
+    def tearDown(self) -> None:
+        cleanup.wait_for_background_cleanup()
+        self.temp_dir.cleanup()
+
+    def test_walk_prunes_matches(self) -> None:
+        found = cleanup.find_cleanup_targets(self.root, {"Intermediate", "Binaries", "Build"})
+        self.assertEqual(
+            found.targets,
+            [self.root / "Project" / "Intermediate", self.root / "Project" / "Plugins" / "Tool" / "Binaries"],
+        )
+
+    def test_dry_run_counts_bytes_without_deleting(self) -> None:
+        total_size = cleanup.cleanup_directories(self.root, {"Intermediate", "Binaries"}, dry_run=True)
+        self.assertEqual(total_size, 200)
+        self.assertTrue((self.root / "Project" / "Intermediate").is_dir())
+
+    def test_cleanup_removes_targets_and_leftover_trash(self) -> None:
+        leftover_trash = self.root / "Project" / f"{cleanup.TRASH_MARKER}Cooked.0000"
+        leftover_trash.mkdir()
+        with mock.patch.object(cleanup, "start_detached_delete") as start_detached_delete:
+            self.assertIsNone(cleanup.cleanup_directories(self.root, {"Intermediate", "Binaries"}))
+        start_detached_delete.assert_not_called()
+        self.assertFalse((self.root / "Project" / "Intermediate").exists())
+        cleanup.wait_for_background_cleanup()
+        self.assertEqual(
+            sorted(path.name for path in (self.root / "Project").iterdir()),
+            ["Plugins", "Source"],
+        )
+        self.assertTrue((self.root / "Project" / "Source" / "file.bin").is_file())
+
+    def test_background_delete_reports_progress(self) -> None:
+        trash_dir = self.root / f"{cleanup.TRASH_MARKER}Cooked.0000"
+        for index in range(20):
+            (trash_dir / f"Asset{index}").mkdir(parents=True)
+        messages = []
+        with mock.patch.object(cleanup.logger, "log_message", side_effect=messages.append):
+            cleanup.delete_trash([trash_dir], max_workers=4)
+        self.assertFalse(trash_dir.exists())
+        progress_messages = [message for message in messages if message.startswith("Cleanup: deleted")]
+        self.assertEqual(len(progress_messages), 10)
+        self.assertEqual(progress_messages[-1], "Cleanup: deleted 20/20 entries")
+
+    def test_cleanup_does_not_walk_sizes(self) -> None:
+        with mock.patch.object(cleanup, "get_trees_size") as get_trees_size, mock.patch.object(
+            cleanup, "start_background_delete",
+        ) as start_background_delete:
+            cleanup.cleanup_directories(self.root, {"Intermediate"})
+        get_trees_size.assert_not_called()
+        trash_paths = start_background_delete.call_args.args[0]
+        self.assertEqual(len(trash_paths), 1)
+        self.assertTrue(cleanup.is_trash_dir_name(trash_paths[0].name))
+
+    def test_purge_directory_leaves_a_fresh_empty_dir(self) -> None:
+        temp_dir = self.root / "temp"
+        (temp_dir / "staged").mkdir(parents=True)
+        (temp_dir / "staged" / "mod.pak").write_bytes(b"pak")
+        with mock.patch.object(cleanup, "start_detached_delete", return_value=False):
+            cleanup.purge_directory(temp_dir)
+        self.assertTrue(temp_dir.is_dir())
+        self.assertEqual(list(temp_dir.iterdir()), [])
+        cleanup.wait_for_background_cleanup()
+        self.assertEqual([path.name for path in self.root.iterdir() if path.name != "Project"], ["temp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tempo_core import collection_resolver, unreal_collections
+
+COLLECTION_KEYS = (
+    "FileVersion:2\n"
+    "Type:{type}\n"
+    "Guid:{guid}\n"
+    "ParentGuid:00000000-0000-0000-0000-000000000000\n"
+    "Color:(R=1.000000,G=1.000000,B=1.000000,A=1.000000)\n"
+    "\n"
+)
+
+ASSET_FILES = [
+    "Props/Rock.uasset",
+    "Props/Tree.uasset",
+    "Maps/RockLevel.umap",
+    "Mods/Item.uasset",
+    "Mods/ModMap.umap",
+    "Mods/Notes.txt",
+]
+
+
+class TestCollectionResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.content_dir = Path(self.temp_dir.name) / "Content"
+        for asset_file in ASSET_FILES:
+            asset_path = self.content_dir / asset_file
+            asset_path.parent.mkdir(parents=True, exist_ok=True)
+            asset_path.write_bytes(b"")
+        self.collections_dir = Path(self.content_dir / "Collections")
+        self.collections_dir.mkdir()
+
+    def tearDown(self) -> None:
+        collection_resolver.invalidate_asset_index()
+        unreal_collections.collection_store.invalidate()
+        self.temp_dir.cleanup()
+
+    def write_collection(self, name: str, collection_type: str, content: str) -> Path:
+        collection_path = Path(self.collections_dir / f"{name}.collection")
+        keys = COLLECTION_KEYS.format(type=collection_type, guid=unreal_collections.UnrealGuid.generate_unreal_guid())
+        collection_path.write_text(keys + content, encoding="utf-8")
+        return collection_path
+
+    def resolve(self, collection_path: Path) -> list[str]:
+        asset_index = collection_resolver.get_asset_index(self.content_dir)
+        return sorted(collection_resolver.resolve_collection_package_paths(collection_path, asset_index))
+
+    def test_static_collection_keeps_existing_assets(self) -> None:
+        collection_path = self.write_collection(
+            "Static", "Static", "/Game/Props/Rock.Rock\n/Game/Props/Gone.Gone\n/Game/Mods/Item.Item\n",
+        )
+        self.assertEqual(self.resolve(collection_path), ["/Game/Mods/Item", "/Game/Props/Rock"])
+
+    def test_dynamic_collection_filter(self) -> None:
+        collection_path = self.write_collection(
+            "Dynamic", "Dynamic", "DynamicQueryText:Name=Rock* OR (Path:/Game/Mods AND NOT Extension=umap)\n",
+        )
+        self.assertEqual(self.resolve(collection_path), ["/Game/Maps/RockLevel", "/Game/Mods/Item", "/Game/Props/Rock"])
+
+    def test_filter_terms(self) -> None:
+        asset_index = collection_resolver.get_asset_index(self.content_dir)
+
+        def match(filter_text: str) -> list[str]:
+            predicate = collection_resolver.compile_asset_filter(filter_text)
+            return sorted(asset.name for asset in asset_index.assets if predicate(asset))
+
+        self.assertEqual(match("tree"), ["Tree"])
+        self.assertEqual(match("Extension!=uasset"), ["ModMap", "RockLevel"])
+        self.assertEqual(match("NOT Path:/Game/Props rock"), ["RockLevel"])
+        self.assertEqual(match("Type:Texture2D"), [])
+
+    def test_index_is_rebuilt_when_a_file_is_added(self) -> None:
+        # an old mtime on every directory, so adding a file always moves one
+        for directory, _, _ in os.walk(self.content_dir):
+            os.utime(directory, ns=(0, 0))
+        asset_index = collection_resolver.get_asset_index(self.content_dir)
+        self.assertIs(collection_resolver.get_asset_index(self.content_dir), asset_index)
+        Path(self.content_dir / "Props" / "Bush.uasset").write_bytes(b"")
+        rebuilt_index = collection_resolver.get_asset_index(self.content_dir)
+        self.assertIsNot(rebuilt_index, asset_index)
+        self.assertIn("/Game/Props/Bush", rebuilt_index.package_paths)
+        self.assertNotIn("/Game/Mods/Notes", rebuilt_index.package_paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
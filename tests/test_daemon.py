@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pathlib import Path
+from multiprocessing.connection import Listener
+
+from tempo_core import collection_resolver, daemon, logger, session, settings
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.project_session = self.enterContext(session.use_session(session.TempoSession()))
+        self.enterContext(mock.patch.object(daemon, "get_daemon_runtime_dir", return_value=self.root))
+        self.enterContext(mock.patch.object(daemon, "daemon_information", daemon.DaemonInformation(None, False)))
+
+    @unittest.skipIf(sys.platform == "win32", "the pipe name is per user, a real daemon could be listening on it")
+    def test_request_is_forwarded_and_its_log_streamed_back(self) -> None:
+        calls = []
+
+        def echo(value: int) -> None:
+            calls.append((value, Path.cwd()))
+            logger.log_message(f"echo {value}")
+
+        def fail() -> None:
+            raise RuntimeError("broken")
+
+        listener = Listener(
+            daemon.get_daemon_address(), family=daemon.get_daemon_family(), authkey=daemon.create_daemon_authkey(),
+        )
+        self.addCleanup(listener.close)
+
+        def serve(request_count: int) -> None:
+            for _ in range(request_count):
+                daemon.handle_daemon_connection(listener.accept())
+
+        serve_thread = threading.Thread(target=serve, args=(3,), daemon=True)
+        serve_thread.start()
+        original_cwd = Path.cwd()
+        log_lines = []
+        with (
+            mock.patch.object(daemon, "get_daemon_commands", return_value={"echo": echo, "fail": fail}),
+            mock.patch.object(daemon, "write_log_line", side_effect=log_lines.append),
+        ):
+            os.chdir(self.root)
+            try:
+                self.assertEqual(daemon.forward_to_daemon("echo", {"value": 1}), 0)
+            finally:
+                os.chdir(original_cwd)
+            self.assertEqual(daemon.forward_to_daemon("fail", {}), 1)
+            self.assertEqual(daemon.forward_to_daemon("missing", {}), 2)
+        serve_thread.join(5.0)
+
+        # the command ran in the client's working directory, and the daemon went back to its own after
+        self.assertEqual(calls, [(1, self.root.resolve())])
+        self.assertEqual(Path.cwd(), original_cwd)
+        self.assertEqual(log_lines[0], "echo 1")
+        self.assertTrue(log_lines[1].startswith("Error: broken"))
+        self.assertIn("unknown daemon command 'missing'", log_lines[2])
+
+    def test_no_daemon_leaves_the_command_to_the_caller(self) -> None:
+        self.assertIsNone(daemon.forward_to_daemon("echo", {}))
+
+    def test_config_change_reloads_settings_and_drops_warm_state(self) -> None:
+        config_file = self.root / "config.json"
+        config_file.write_text("{}")
+        uproject_file = self.root / "Project" / "Project.uproject"
+        (uproject_file.parent / "Config").mkdir(parents=True)
+        uproject_file.write_text("{}")
+        ini_file = uproject_file.parent / "Config" / "DefaultGame.ini"
+        ini_file.write_text("[/Script/Engine.GameSession]\n")
+        settings_information = self.project_session.settings_information
+        settings_information.init_settings_done = True
+        settings_information.config_file = settings.SettingSpecificInfo(config_file, settings.SettingsOrigin.COMMAND_LINE)
+        init_settings = self.enterContext(mock.patch.object(daemon.settings, "init_settings"))
+        self.enterContext(mock.patch.object(daemon.settings, "get_uproject_file", return_value=uproject_file))
+        invalidate_asset_index = self.enterContext(mock.patch.object(collection_resolver, "invalidate_asset_index"))
+
+        daemon.snapshot_watched_files()
+        self.assertEqual(list(daemon.daemon_information.watched_files), [config_file, uproject_file, ini_file])
+        self.project_session.tool_executable_paths["repak"] = self.root / "repak"
+        daemon.check_watched_files()
+        init_settings.assert_not_called()
+        invalidate_asset_index.assert_not_called()
+
+        config_file.write_text('{"engine_info": {}}')
+        daemon.check_watched_files()
+        init_settings.assert_called_once_with(config_file)
+        invalidate_asset_index.assert_called_once()
+        self.assertEqual(self.project_session.tool_executable_paths, {})
+
+        # the stamps were taken again, so the same change is not handled twice
+        daemon.check_watched_files()
+        init_settings.assert_called_once()
+
+        # an ini change drops the caches without reloading the config
+        ini_file.write_text("[/Script/Engine.GameSession]\nMaxPlayers=4\n")
+        daemon.check_watched_files()
+        init_settings.assert_called_once()
+        self.assertEqual(invalidate_asset_index.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
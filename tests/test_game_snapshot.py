@@ -0,0 +1,80 @@
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import game_snapshot
+
+
+class TestGameSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.temp_dir.name)
+        self.root = self.base_dir / "game"
+        self.backup_dir = self.base_dir / "backup"
+        self.snapshot_path = self.base_dir / "game_file_list.json"
+        (self.root / "Content" / "Paks").mkdir(parents=True)
+        (self.root / "Content" / "Paks" / "game.pak").write_text("original")
+        (self.root / "game.exe").write_text("exe")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_restore_undoes_added_modified_and_removed_files(self) -> None:
+        snapshot = game_snapshot.create_snapshot(self.root, backup_dir=self.backup_dir)
+        game_snapshot.write_snapshot(snapshot, self.snapshot_path)
+
+        (self.root / "Content" / "Paks" / "game.pak").write_text("modded pak")
+        (self.root / "game.exe").unlink()
+        (self.root / "Content" / "Paks" / "LogicMods").mkdir()
+        (self.root / "Content" / "Paks" / "LogicMods" / "mod.pak").write_text("mod")
+
+        diff = game_snapshot.restore_snapshot(self.root, self.snapshot_path, backup_dir=self.backup_dir)
+        self.assertEqual(diff.added, ["Content/Paks/LogicMods/mod.pak"])
+        self.assertEqual(diff.modified, ["Content/Paks/game.pak"])
+        self.assertEqual(diff.removed, ["game.exe"])
+        self.assertEqual((self.root / "Content" / "Paks" / "game.pak").read_text(), "original")
+        self.assertTrue((self.root / "game.exe").is_file())
+        self.assertFalse((self.root / "Content" / "Paks" / "LogicMods").exists())
+
+        current_entries = game_snapshot.scan_tree(self.root)
+        diff = game_snapshot.diff_snapshot(game_snapshot.read_snapshot(self.snapshot_path, self.root), current_entries)
+        self.assertEqual((diff.added, diff.modified, diff.removed), ([], [], []))
+
+    def test_identical_files_share_one_backup_object(self) -> None:
+        duplicates_dir = self.root / "Duplicates"
+        duplicates_dir.mkdir()
+        for index in range(200):
+            (duplicates_dir / f"Copy{index}.bin").write_bytes(b"identical")
+        copy_file = shutil.copyfile
+
+        def slow_copy_file(source: Path, destination: Path) -> None:
+            # holds each copy open long enough for the other threads to start copying the same content
+            time.sleep(0.01)
+            copy_file(source, destination)
+
+        with mock.patch.object(game_snapshot.shutil, "copyfile", side_effect=slow_copy_file):
+            snapshot = game_snapshot.create_snapshot(self.root, backup_dir=self.backup_dir, max_workers=16)
+        fingerprints = {snapshot.entries[f"Duplicates/Copy{index}.bin"].fingerprint for index in range(200)}
+        self.assertEqual(len(fingerprints), 1)
+        fingerprint = fingerprints.pop()
+        assert fingerprint is not None
+        object_path = game_snapshot.get_backup_object_path(self.backup_dir, fingerprint)
+        self.assertEqual(object_path.read_bytes(), b"identical")
+        self.assertEqual([path.name for path in object_path.parent.iterdir()], [fingerprint])
+
+    def test_legacy_path_list_only_removes_added_files(self) -> None:
+        self.snapshot_path.write_text(
+            json.dumps([str(self.root / "Content" / "Paks" / "game.pak"), str(self.root / "game.exe")]),
+        )
+        (self.root / "extra.txt").write_text("extra")
+        diff = game_snapshot.restore_snapshot(self.root, self.snapshot_path)
+        self.assertEqual(diff.added, ["extra.txt"])
+        self.assertFalse((self.root / "extra.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import hashlib
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import file_io, hashing
+
+
+class TestHashing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.contents = {f"file_{index}.bin": bytes([index]) * (index * 1000) for index in range(8)}
+        for file_name, contents in self.contents.items():
+            (self.root / file_name).write_bytes(contents)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def get_expected_digest(self, file_name: str) -> str:
+        return hashlib.blake2b(self.contents[file_name], digest_size=hashing.BLAKE2B_DIGEST_SIZE).hexdigest()
+
+    def test_buffered_and_mapped_reads_agree(self) -> None:
+        file_path = self.root / "file_7.bin"
+        self.assertEqual(hashing.hash_file(file_path), self.get_expected_digest("file_7.bin"))
+        with mock.patch.object(hashing, "MMAP_THRESHOLD", 1):
+            self.assertEqual(hashing.hash_file(file_path), self.get_expected_digest("file_7.bin"))
+        self.assertEqual(hashing.hash_file(file_path, "sha256"), hashlib.sha256(self.contents["file_7.bin"]).hexdigest())
+
+    def test_batch(self) -> None:
+        digests = hashing.hash_files(self.root / file_name for file_name in self.contents)
+        self.assertEqual(
+            digests, {self.root / file_name: self.get_expected_digest(file_name) for file_name in self.contents},
+        )
+
+    def test_unchanged_file_pairs(self) -> None:
+        staged_dir = self.root / "staged"
+        staged_dir.mkdir()
+        (staged_dir / "file_1.bin").write_bytes(self.contents["file_1.bin"])
+        (staged_dir / "file_2.bin").write_bytes(b"x" * len(self.contents["file_2.bin"]))
+        (staged_dir / "file_3.bin").write_bytes(b"short")
+        file_pairs = {self.root / file_name: staged_dir / file_name for file_name in self.contents}
+        self.assertEqual(file_io.get_unchanged_file_pairs(file_pairs), {self.root / "file_1.bin"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from tempo_core import hook_states, session
+from tempo_core.data_structures import ExecutionMode, HookStateType
+
+
+def get_hook_settings(process_name: str) -> dict:
+    return {
+        "process_kill_events": {
+            "processes": [
+                {"hook_state": "post_init", "process_name": process_name, "use_substring_check": True},
+            ],
+        },
+        "exec_events": [
+            {
+                "hook_state": "pre_cooking",
+                "alt_exe_path": "tool.exe",
+                "variable_args": ["-a"],
+                "execution_mode": "sync",
+            },
+        ],
+    }
+
+
+class TestHookDispatchTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.project_session = self.enterContext(session.use_session(session.TempoSession()))
+
+    def test_events_are_grouped_by_hook_state(self) -> None:
+        self.project_session.settings_information.settings = get_hook_settings("Game")
+        post_init_events = hook_states.get_hook_state_events(HookStateType.POST_INIT)
+        assert post_init_events is not None
+        self.assertEqual(
+            post_init_events.process_kill_events, [hook_states.ProcessKillEvent("Game", use_substring_check=True)],
+        )
+        pre_cooking_events = hook_states.get_hook_state_events(HookStateType.PRE_COOKING)
+        assert pre_cooking_events is not None
+        self.assertEqual(pre_cooking_events.exec_events[0].execution_mode, ExecutionMode.SYNC)
+        self.assertFalse(hook_states.is_hook_state_used(HookStateType.CONSTANT))
+
+    def test_table_is_compiled_once_and_again_when_settings_change(self) -> None:
+        self.project_session.settings_information.settings = get_hook_settings("Game")
+        hook_states.get_hook_state_events(HookStateType.POST_INIT)
+        hook_dispatch_table = self.project_session.hook_dispatch_table
+        hook_states.get_hook_state_events(HookStateType.PRE_COOKING)
+        self.assertIs(self.project_session.hook_dispatch_table, hook_dispatch_table)
+
+        # a reload puts a new settings dict in place, which the table notices by identity
+        self.project_session.settings_information.settings = get_hook_settings("Editor")
+        post_init_events = hook_states.get_hook_state_events(HookStateType.POST_INIT)
+        assert post_init_events is not None
+        self.assertIsNot(self.project_session.hook_dispatch_table, hook_dispatch_table)
+        self.assertEqual(post_init_events.process_kill_events[0].process_name, "Editor")
+
+    def test_sessions_compile_their_own_tables(self) -> None:
+        self.project_session.settings_information.settings = get_hook_settings("Game")
+        self.assertTrue(hook_states.is_hook_state_used(HookStateType.POST_INIT))
+        with session.use_session(session.TempoSession()):
+            self.assertFalse(hook_states.is_hook_state_used(HookStateType.POST_INIT))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import statistics
+import subprocess
+import unittest
+
+# time tempo_core's own modules may spend importing tempo_core.main_logic, which every cli command imports.
+# third party imports are left out, their cost depends on the machine's installs rather than on this package.
+# TEMPO_IMPORT_TIME_BUDGET_MS raises it on slow runners
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("TEMPO_IMPORT_TIME_BUDGET_MS", 250))
+# a cold subprocess import is noisy, so the budget is checked against the median of a few
+IMPORT_TIME_RUNS = 3
+
+# modules that should only be imported once a command actually needs them,
+# kept out of tempo_core.main_logic since every cli command imports it
+LAZY_MODULES = ["psutil", "requests", "rich", "tempo_binary_tools", "tempo_binary_tool_manager"]
+
+
+def get_import_times_ms(module_name: str) -> dict[str, tuple[float, float]]:
+    """Self and cumulative import time of every module imported along with module_name."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line.removeprefix("import time:").split("|")
+        if self_time.strip().isdigit() and cumulative.strip().isdigit():
+            import_times[name.strip()] = (int(self_time) / 1000, int(cumulative) / 1000)
+    return import_times
+
+
+def get_own_import_time_ms(import_times: dict[str, tuple[float, float]]) -> float:
+    return sum(
+        self_time for name, (self_time, _) in import_times.items()
+        if name == "tempo_core" or name.startswith("tempo_core.")
+    )
+
+
+class TestImportTime(unittest.TestCase):
+    def test_main_logic_import_time_budget(self) -> None:
+        own_import_times = []
+        for _ in range(IMPORT_TIME_RUNS):
+            import_times = get_import_times_ms("tempo_core.main_logic")
+            self.assertIn("tempo_core.main_logic", import_times)
+            own_import_times.append(get_own_import_time_ms(import_times))
+        self.assertLess(statistics.median(own_import_times), IMPORT_TIME_BUDGET_MS)
+
+    def test_heavy_modules_are_imported_lazily(self) -> None:
+        import_times = get_import_times_ms("tempo_core.main_logic")
+        self.assertIn("tempo_core.main_logic", import_times)
+        for module_name in LAZY_MODULES:
+            self.assertNotIn(module_name, import_times)
+
+
+if __name__ == "__main__":
+    unittest.main()
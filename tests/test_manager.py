@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import manager, session
+
+
+class TestToolExecutableResolution(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.installed_path = self.root / "tools" / "repak"
+        self.installed_path.parent.mkdir()
+        self.installed_path.write_bytes(b"repak")
+        self.install_tool = mock.Mock(return_value=self.installed_path)
+        for patcher in (
+            mock.patch.object(manager.settings, "get_cache_directory", return_value=self.root / "cache"),
+            mock.patch.object(manager, "install_tool", self.install_tool),
+            mock.patch.dict(os.environ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop("TEMPO_REPAK_EXECUTABLE", None)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def resolve_in_new_session(self) -> Path:
+        with session.use_session(session.TempoSession()):
+            return manager.get_tool_executable("repak")
+
+    def test_env_override_comes_first(self) -> None:
+        os.environ["TEMPO_REPAK_EXECUTABLE"] = os.fspath(self.root / "local_repak")
+        self.assertEqual(self.resolve_in_new_session(), self.root / "local_repak")
+        self.install_tool.assert_not_called()
+        self.assertFalse(manager.get_tool_registry_path().exists())
+
+    def test_session_memo_then_registry_then_install(self) -> None:
+        project_session = session.TempoSession()
+        with session.use_session(project_session):
+            self.assertEqual(manager.get_tool_executable("repak"), self.installed_path)
+            self.install_tool.assert_called_once_with("repak")
+            # the second lookup in the session is answered from its memo, without reading the registry
+            with mock.patch.object(manager, "read_tool_registry") as read_tool_registry:
+                self.assertEqual(manager.get_tool_executable("repak"), self.installed_path)
+            read_tool_registry.assert_not_called()
+        self.assertEqual(project_session.tool_executable_paths, {"repak": self.installed_path})
+
+        # a new session, like a new run, finds the install in the persisted registry
+        self.assertEqual(self.resolve_in_new_session(), self.installed_path)
+        self.install_tool.assert_called_once()
+
+    def test_changed_executable_is_installed_again(self) -> None:
+        self.resolve_in_new_session()
+        # a reinstall or upgrade changes the size, so the registry stamp no longer matches
+        self.installed_path.write_bytes(b"repak 2")
+        self.assertIsNone(manager.get_persisted_tool_executable("repak"))
+        self.resolve_in_new_session()
+        self.assertEqual(self.install_tool.call_count, 2)
+        self.assertEqual(manager.get_persisted_tool_executable("repak"), self.installed_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
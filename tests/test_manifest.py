@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from tempo_core import manifest
+
+ENTRIES = [
+    manifest.ManifestEntry(f"Content/Paks/Dir{index % 7}/File_{index}.pak", index, index * 1000, bytes([index % 255 + 1]) * 20)
+    for index in range(500)
+] + [manifest.ManifestEntry("Content/Paks/ünïcode.pak", 1, 2, None)]
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = Path(self.temp_dir.name) / "files.manifest"
+        manifest.write_manifest(self.manifest_path, ENTRIES, {"root": "game"})
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self) -> None:
+        loaded_manifest = manifest.read_manifest(self.manifest_path)
+        self.assertEqual(loaded_manifest.metadata, {"root": "game"})
+        self.assertEqual(list(loaded_manifest.iter_entries()), sorted(ENTRIES, key=lambda entry: entry.path))
+
+    def test_find(self) -> None:
+        loaded_manifest = manifest.read_manifest(self.manifest_path)
+        self.assertEqual(loaded_manifest.find("Content/Paks/Dir3/File_10.pak"), ENTRIES[10])
+        self.assertEqual(loaded_manifest.find("Content/Paks/ünïcode.pak"), ENTRIES[-1])
+        self.assertIsNone(loaded_manifest.find("Content/Paks/Dir3/File_10"))
+        self.assertIsNone(loaded_manifest.find("A"))
+
+    def test_json_round_trip(self) -> None:
+        json_path = Path(self.temp_dir.name) / "files.json"
+        reimported_path = Path(self.temp_dir.name) / "reimported.manifest"
+        manifest.export_manifest_json(self.manifest_path, json_path)
+        manifest.import_manifest_json(json_path, reimported_path)
+        self.assertEqual(reimported_path.read_bytes(), self.manifest_path.read_bytes())
+
+    def test_merge_diff(self) -> None:
+        old_manifest = manifest.read_manifest(self.manifest_path)
+        new_entries = [entry for entry in ENTRIES if entry.path != ENTRIES[0].path]
+        new_entries[1] = new_entries[1]._replace(digest=b"\xff" * 20)
+        new_entries.append(manifest.ManifestEntry("Content/Paks/new.pak", 1, 1))
+        manifest.write_manifest(self.manifest_path, new_entries)
+        diff = manifest.diff_manifests(old_manifest, manifest.read_manifest(self.manifest_path))
+        self.assertEqual(diff.added, ["Content/Paks/new.pak"])
+        self.assertEqual(diff.removed, [ENTRIES[0].path])
+        self.assertEqual(diff.modified, [new_entries[1].path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import threading
+import unittest
+from unittest import mock
+
+from tempo_core.threads import monitor_reactor
+
+
+class FakeProcessSnapshot:
+    def __init__(self, process_names: dict[str, object]) -> None:
+        self.process_names = process_names
+
+    def get_processes_by_substring(self, process_name: str) -> list[object]:
+        return [process for name, process in self.process_names.items() if process_name in name]
+
+
+class TestMonitorReactor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reactor_information = monitor_reactor.MonitorReactorInformation(
+            targets=[],
+            periodic_jobs={},
+            lock=threading.Lock(),
+            wake_event=threading.Event(),
+            run_reactor=False,
+            reactor_thread=None,
+        )
+        self.process_names: dict[str, object] = {}
+        for patcher in (
+            mock.patch.object(monitor_reactor, "monitor_reactor_information", self.reactor_information),
+            mock.patch.object(
+                monitor_reactor.process_management,
+                "get_process_snapshot",
+                side_effect=lambda: FakeProcessSnapshot(self.process_names),
+            ),
+            # the exit waiter is driven by hand through process_exited
+            mock.patch.object(monitor_reactor, "wait_for_process_exit"),
+            mock.patch.object(monitor_reactor, "can_track_windows", return_value=False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_target_is_followed_from_launch_to_close(self) -> None:
+        events = []
+        target = monitor_reactor.MonitorTarget(
+            label="Game",
+            process_name="Game.exe",
+            window_title="Game",
+            on_process_found=lambda: events.append("process"),
+            on_window_found=lambda: events.append("window"),
+            on_window_closed=lambda: events.append("closed"),
+        )
+        self.reactor_information.targets.append(target)
+
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(target.state, monitor_reactor.MonitorState.SEARCHING_PROCESS)
+        self.assertGreater(target.interval, monitor_reactor.PROCESS_SEARCH_FIRST_INTERVAL)
+
+        # names are matched lowercased
+        self.process_names["game.exe"] = object()
+        target.next_check = 0.0
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(events, ["process", "window"])
+        self.assertEqual(target.state, monitor_reactor.MonitorState.WATCHING)
+
+        # process exit is handled right away, without waiting for the next check
+        target.process_exited = True
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(events, ["process", "window", "closed"])
+        self.assertTrue(target.done.is_set())
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(self.reactor_information.targets, [])
+
+    def test_failing_callback_finishes_its_target(self) -> None:
+        def fail() -> None:
+            raise RuntimeError
+
+        target = monitor_reactor.MonitorTarget(
+            label="Engine",
+            process_name="UnrealEditor",
+            window_title="Unreal Editor",
+            on_process_found=fail,
+            on_window_found=lambda: None,
+            on_window_closed=lambda: None,
+        )
+        self.reactor_information.targets.append(target)
+        self.process_names["unrealeditor"] = object()
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(target.state, monitor_reactor.MonitorState.FINISHED)
+        self.assertTrue(target.done.is_set())
+
+    def test_periodic_jobs_run_when_due_and_survive_errors(self) -> None:
+        runs = []
+
+        def fail() -> None:
+            raise RuntimeError
+
+        self.reactor_information.periodic_jobs["failing"] = monitor_reactor.PeriodicJob("failing", 60.0, fail)
+        self.reactor_information.periodic_jobs["counting"] = monitor_reactor.PeriodicJob(
+            "counting", 60.0, lambda: runs.append("run"),
+        )
+        sleep_time = monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(runs, ["run"])
+        self.assertGreater(sleep_time, 50.0)
+        monitor_reactor.monitor_reactor_tick()
+        self.assertEqual(runs, ["run"])
+
+    def test_wake_during_a_tick_is_not_lost(self) -> None:
+        tick_count = 0
+        second_tick = threading.Event()
+
+        def tick() -> float:
+            nonlocal tick_count
+            tick_count += 1
+            if tick_count > 1:
+                self.reactor_information.run_reactor = False
+                second_tick.set()
+                return 0.0
+            # something changes while the reactor is busy, it has to look again instead of sleeping
+            monitor_reactor.wake_monitor_reactor()
+            return monitor_reactor.IDLE_INTERVAL
+
+        self.reactor_information.run_reactor = True
+        with mock.patch.object(monitor_reactor, "monitor_reactor_tick", side_effect=tick):
+            reactor_thread = threading.Thread(target=monitor_reactor.monitor_reactor_runner, daemon=True)
+            reactor_thread.start()
+            self.assertTrue(second_tick.wait(1.0))
+        reactor_thread.join(1.0)
+        self.assertFalse(reactor_thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
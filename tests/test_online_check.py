@@ -0,0 +1,49 @@
+import os
+import socket
+import unittest
+from unittest import mock
+
+from tempo_core import online_check
+
+
+class TestOnlineCheck(unittest.TestCase):
+    def setUp(self) -> None:
+        online_check.reset_online_status()
+
+    def tearDown(self) -> None:
+        online_check.reset_online_status()
+
+    def get_probe_env(self, port: int) -> dict[str, str]:
+        return {
+            "TEMPO_ONLINE_CHECK_HOST": "127.0.0.1",
+            "TEMPO_ONLINE_CHECK_PORT": str(port),
+            "TEMPO_ONLINE_CHECK_CACHE_TTL": "0",
+            "TEMPO_FORCE_ONLINE": "",
+            "TEMPO_FORCE_OFFLINE": "",
+        }
+
+    def test_online_against_local_stand_in(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            port = server.getsockname()[1]
+            with mock.patch.dict(os.environ, self.get_probe_env(port)):
+                online_check.init_is_online()
+                self.assertTrue(online_check.get_is_online())
+                self.assertTrue(online_check.is_online)
+
+    def test_offline_when_stand_in_is_closed(self) -> None:
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            port = server.getsockname()[1]
+        with mock.patch.dict(os.environ, self.get_probe_env(port)):
+            online_check.init_is_online()
+            self.assertFalse(online_check.get_is_online())
+
+    def test_force_offline_skips_probe(self) -> None:
+        with mock.patch.dict(os.environ, {"TEMPO_FORCE_OFFLINE": "1", "TEMPO_FORCE_ONLINE": ""}):
+            with mock.patch.object(online_check, "probe_is_online") as probe:
+                online_check.init_is_online()
+                self.assertFalse(online_check.get_is_online())
+                probe.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
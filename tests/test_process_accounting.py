@@ -0,0 +1,64 @@
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import process_accounting
+
+
+class TestProcessAccounting(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(self.temp_dir.name) / "process_history.sqlite3"
+        self.db_path_patch = mock.patch.object(process_accounting, "get_process_history_db_path", return_value=db_path)
+        self.db_path_patch.start()
+
+    def tearDown(self) -> None:
+        self.db_path_patch.stop()
+        self.temp_dir.cleanup()
+
+    def add_record(self, wall_seconds: float, started_at: float) -> None:
+        process_accounting.add_process_record_to_history(
+            process_accounting.ProcessRecord(
+                tool_name="repak",
+                command="repak pack",
+                started_at=started_at,
+                wall_seconds=wall_seconds,
+                user_cpu_seconds=0.0,
+                system_cpu_seconds=0.0,
+                peak_rss_bytes=0,
+                read_bytes=0,
+                write_bytes=0,
+                return_code=0,
+            ),
+        )
+
+    def test_child_process_is_recorded(self) -> None:
+        command = [sys.executable, "-c", "print('hello')"]
+        result = process_accounting.run_accounted_process(command, "python", capture_output=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "hello\n")
+
+        records = process_accounting.get_process_history("python")
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record.command, process_accounting.get_command_str(command))
+        self.assertEqual(record.return_code, 0)
+        self.assertGreater(record.wall_seconds, 0)
+        self.assertGreaterEqual(record.user_cpu_seconds + record.system_cpu_seconds, 0)
+        self.assertEqual(process_accounting.get_process_history_tool_names(), ["python"])
+
+    def test_trend_flags_slowdown_against_median(self) -> None:
+        for started_at, wall_seconds in enumerate((1.0, 1.2, 0.8, 2.0)):
+            self.add_record(wall_seconds, float(started_at))
+        trend = process_accounting.get_process_trend("repak", slowdown_threshold_percent=50.0)
+        self.assertIsNotNone(trend)
+        assert trend is not None
+        self.assertEqual(trend.run_count, 4)
+        self.assertEqual(trend.baseline_wall_seconds, 1.0)
+        self.assertTrue(trend.is_regression)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import time
+import subprocess
+import unittest
+from unittest import mock
+
+import psutil
+
+from tempo_core import process_management
+
+
+class TestProcessManagement(unittest.TestCase):
+    def setUp(self) -> None:
+        process_management.invalidate_process_snapshot()
+        self.addCleanup(process_management.invalidate_process_snapshot)
+
+    def start_sleeper(self) -> subprocess.Popen:
+        sleeper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        self.addCleanup(sleeper.wait)
+        self.addCleanup(sleeper.kill)
+        return sleeper
+
+    def test_snapshot_is_reused_within_its_ttl(self) -> None:
+        with mock.patch.object(
+            process_management, "take_process_snapshot", wraps=process_management.take_process_snapshot,
+        ) as take_process_snapshot:
+            snapshot = process_management.get_process_snapshot()
+            self.assertIs(process_management.get_process_snapshot(), snapshot)
+            self.assertEqual(take_process_snapshot.call_count, 1)
+            # older than the max age asked for, so it is taken again
+            time.sleep(0.01)
+            self.assertIsNot(process_management.get_process_snapshot(max_age=0.0), snapshot)
+            process_management.invalidate_process_snapshot()
+            process_management.get_process_snapshot()
+            self.assertEqual(take_process_snapshot.call_count, 3)
+
+    def test_snapshot_finds_processes_by_name_and_substring(self) -> None:
+        sleeper = self.start_sleeper()
+        snapshot = process_management.take_process_snapshot()
+        process_name = snapshot.process_names[sleeper.pid]
+        self.assertIn(sleeper.pid, [process.pid for process in snapshot.get_processes_by_name(process_name.upper())])
+        self.assertIn(sleeper.pid, [process.pid for process in snapshot.get_processes_by_substring(process_name[:3])])
+
+    def test_batch_kill_waits_for_every_process_once(self) -> None:
+        sleepers = [self.start_sleeper() for _ in range(3)]
+        processes = [psutil.Process(sleeper.pid) for sleeper in sleepers]
+        snapshot = process_management.get_process_snapshot()
+        with mock.patch.object(psutil, "wait_procs", wraps=psutil.wait_procs) as wait_procs:
+            # a process matched by two events is only signalled and waited on once
+            alive = process_management.kill_process_batch([*processes, processes[0]], timeout=5.0)
+        self.assertEqual(alive, [])
+        wait_procs.assert_called_once()
+        self.assertEqual(len(wait_procs.call_args.args[0]), 3)
+        for sleeper in sleepers:
+            self.assertIsNotNone(sleeper.poll())
+        # the processes are gone, so the next lookup takes a fresh snapshot
+        self.assertIsNot(process_management.get_process_snapshot(), snapshot)
+
+    def test_batch_kill_ignores_processes_that_already_exited(self) -> None:
+        sleeper = self.start_sleeper()
+        process = psutil.Process(sleeper.pid)
+        sleeper.kill()
+        sleeper.wait()
+        self.assertEqual(process_management.kill_process_batch([process], timeout=1.0), [])
+        self.assertEqual(process_management.kill_process_batch([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
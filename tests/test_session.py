@@ -0,0 +1,52 @@
+import threading
+import unittest
+
+from tempo_core import manager, session
+
+
+class TestSession(unittest.TestCase):
+    def test_use_session_is_scoped_to_the_block(self) -> None:
+        project_session = session.TempoSession(name="project")
+        self.assertIs(session.get_current_session(), session.default_session)
+        with session.use_session(project_session):
+            self.assertIs(session.get_current_session(), project_session)
+            with session.use_session(session.TempoSession(name="nested")):
+                self.assertEqual(session.get_current_session().name, "nested")
+            self.assertIs(session.get_current_session(), project_session)
+        self.assertIs(session.get_current_session(), session.default_session)
+
+    def test_threads_only_see_a_session_they_were_bound_to(self) -> None:
+        project_session = session.TempoSession(name="project")
+        seen_sessions = []
+
+        def record_session() -> None:
+            seen_sessions.append(session.get_current_session())
+
+        with session.use_session(project_session):
+            threads = [
+                threading.Thread(target=record_session),
+                threading.Thread(target=session.bind_to_current_session(record_session)),
+            ]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertEqual(seen_sessions, [session.default_session, project_session])
+
+    def test_state_is_made_once_per_session(self) -> None:
+        first_session = session.TempoSession()
+        second_session = session.TempoSession()
+        self.assertIs(first_session.command_queue, first_session.command_queue)
+        first_session.command_queue.append("command")
+        self.assertEqual(second_session.command_queue, [])
+
+    def test_state_factories_can_read_other_state(self) -> None:
+        # the tools cache is made from the settings of the same session, both are made on this first access
+        project_session = session.TempoSession()
+        with session.use_session(project_session):
+            tools_cache = manager.tools_cache
+        self.assertIs(project_session.tools_cache, tools_cache)
+        self.assertIn("settings_information", project_session.states)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,7 +65,7 @@ SETTINGS_FILE = Path(f"{CWD}/tests/{GAME_STR}_tempo.json")
 
 
 def cache_files() -> list[Path]:
-    tests_cache_dir = Path(f"{tempo_core.manager.tools_cache.get_cache_dir()}/testing")
+    tests_cache_dir = Path(f"{tempo_core.manager.get_tools_cache().get_cache_dir()}/testing")
     ue4ss_zip_cache_dir = Path(f"{tests_cache_dir}/ue4ss_zip")
     packaged_games_cache_dir = Path(f"{tests_cache_dir}/packaged_games")
     uproject_files_cache_dir = Path(f"{tests_cache_dir}/uproject_files")
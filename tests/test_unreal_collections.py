@@ -0,0 +1,191 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+from dataclasses import replace
+from pathlib import Path
+
+from tempo_core import unreal_collections
+
+BLANK_GUID = "00000000-0000-0000-0000-000000000000"
+PARENT_GUID = "0D3F3C6E-4B1A-4E2F-9C1D-2A6B8E7F5A01"
+CHILD_GUID = "7A9E1B42-8C3D-4F5E-A6B7-C8D9E0F1A2B3"
+
+STATIC_COLLECTION = (
+    "FileVersion:2\n"
+    "Type:Static\n"
+    f"Guid:{PARENT_GUID}\n"
+    f"ParentGuid:{BLANK_GUID}\n"
+    "Color:(R=0.250000,G=0.018259,B=0.000337,A=1.000000)\n"
+    "\n"
+    "/Game/Mods/MyMod/BP_Item.BP_Item\n"
+    "/Game/Mods/MyMod/Meshes/SM_Item.SM_Item\n"
+)
+
+DYNAMIC_COLLECTION = (
+    "FileVersion:2\n"
+    "Type:Dynamic\n"
+    f"Guid:{CHILD_GUID}\n"
+    f"ParentGuid:{PARENT_GUID}\n"
+    "Color:(R=1.000000,G=1.000000,B=1.000000,A=1.000000)\n"
+    "\n"
+    "Name=Item Path:/Game/Mods/MyMod AND NOT (Type:Texture2D OR Type:Material)\n"
+)
+
+
+class TestUnrealCollections(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.collections_dir = Path(self.temp_dir.name) / "Collections"
+        self.collections_dir.mkdir()
+        self.static_path = self.collections_dir / "Static.collection"
+        self.static_path.write_bytes(STATIC_COLLECTION.encode("utf-8"))
+        self.dynamic_path = self.collections_dir / "Dynamic.collection"
+        self.dynamic_path.write_bytes(DYNAMIC_COLLECTION.encode("utf-8"))
+
+    def tearDown(self) -> None:
+        unreal_collections.collection_store.invalidate()
+        unreal_collections.collection_graph_cache.graphs.clear()
+        self.temp_dir.cleanup()
+
+    def assert_round_trips(self, collection_path: Path, contents: str) -> None:
+        collection = unreal_collections.get_unreal_collection_from_unreal_collection_path(collection_path)
+        copy_path = Path(self.temp_dir.name) / collection_path.name
+        unreal_collections.save_unreal_collection_to_file(replace(collection, file_system_path=copy_path))
+        self.assertEqual(copy_path.read_bytes(), contents.encode("utf-8"))
+
+    def test_static_collection_round_trips(self) -> None:
+        collection = unreal_collections.get_unreal_collection_from_unreal_collection_path(self.static_path)
+        self.assertEqual(collection.content_type, unreal_collections.UnrealContentLineType.STATIC)
+        self.assertEqual(
+            collection.content_lines,
+            [
+                unreal_collections.UnrealAssetPath("/Game/Mods/MyMod/BP_Item"),
+                unreal_collections.UnrealAssetPath("/Game/Mods/MyMod/Meshes/SM_Item"),
+            ],
+        )
+        self.assert_round_trips(self.static_path, STATIC_COLLECTION)
+
+    def test_dynamic_collection_round_trips(self) -> None:
+        collection = unreal_collections.get_unreal_collection_from_unreal_collection_path(self.dynamic_path)
+        self.assertEqual(collection.content_type, unreal_collections.UnrealContentLineType.DYNAMIC)
+        self.assertEqual(collection.content_lines, [DYNAMIC_COLLECTION.splitlines()[-1]])
+        self.assert_round_trips(self.dynamic_path, DYNAMIC_COLLECTION)
+
+    def test_store_hands_out_copies(self) -> None:
+        collection = unreal_collections.collection_store.get(self.static_path)
+        collection.content_lines.clear()
+        self.assertEqual(len(unreal_collections.collection_store.get(self.static_path).content_lines), 2)
+
+    def test_graph_looks_up_parents_and_children_by_guid(self) -> None:
+        graph = unreal_collections.get_collection_graph(self.collections_dir)
+        # fresh guid objects, lowercased, find the same collections
+        parent_guid = unreal_collections.UnrealGuid(PARENT_GUID.lower())
+        child_guid = unreal_collections.UnrealGuid(CHILD_GUID.lower())
+        self.assertEqual(parent_guid, unreal_collections.UnrealGuid(PARENT_GUID))
+        self.assertEqual(len({parent_guid, unreal_collections.UnrealGuid(PARENT_GUID)}), 1)
+
+        parent = graph.get_parent(child_guid)
+        self.assertIsNotNone(parent)
+        assert parent is not None
+        self.assertEqual(parent.file_system_path, self.static_path)
+        self.assertEqual([child.file_system_path for child in graph.get_children(parent_guid)], [self.dynamic_path])
+        self.assertEqual(graph.get_ancestor_guids(child_guid), (parent_guid,))
+        self.assertEqual(graph.get_descendant_guids(parent_guid), frozenset({child_guid}))
+        self.assertFalse(graph.has_disabled_ancestor(child_guid))
+
+    def test_graph_is_rebuilt_when_a_parent_is_disabled(self) -> None:
+        self.assertEqual(len(unreal_collections.get_enabled_collections(self.collections_dir)), 2)
+        self.static_path.rename(self.static_path.with_name("Static.collection.disabled"))
+        graph = unreal_collections.get_collection_graph(self.collections_dir)
+        self.assertTrue(graph.has_disabled_ancestor(unreal_collections.UnrealGuid(CHILD_GUID)))
+        self.assertEqual(unreal_collections.get_enabled_collections(self.collections_dir), [])
+
+    def test_batch_writes_each_file_once(self) -> None:
+        static_collection = unreal_collections.collection_store.get(self.static_path)
+        dynamic_collection = unreal_collections.collection_store.get(self.dynamic_path)
+        asset_paths = unreal_collections.UnrealAssetPath.list_from_lines(map(str, static_collection.content_lines))
+        static_collection.content_lines = asset_paths
+        with mock.patch.object(
+            unreal_collections.file_io, "write_file_atomically", wraps=unreal_collections.file_io.write_file_atomically,
+        ) as write_file_atomically:
+            with unreal_collections.batch_collection_writes():
+                for asset_name in ("A", "B", "C"):
+                    asset_paths.append(unreal_collections.UnrealAssetPath(f"/Game/Mods/{asset_name}"))
+                    unreal_collections.save_unreal_collection_to_file(static_collection)
+                    with unreal_collections.batch_collection_writes():
+                        unreal_collections.save_unreal_collection_to_file(dynamic_collection)
+                write_file_atomically.assert_not_called()
+        self.assertEqual(
+            sorted(call.args[0] for call in write_file_atomically.call_args_list), [self.dynamic_path, self.static_path],
+        )
+        self.assertTrue(self.static_path.read_text(encoding="utf-8").endswith("/Game/Mods/C.C\n"))
+        self.assertEqual(len(unreal_collections.collection_store.get(self.static_path).content_lines), 5)
+        # the dynamic collection was saved unchanged, so its file was left alone
+        self.assertFalse(
+            unreal_collections.write_file_atomically(self.dynamic_path, DYNAMIC_COLLECTION),
+        )
+
+    def test_failed_batch_writes_nothing(self) -> None:
+        static_collection = unreal_collections.collection_store.get(self.static_path)
+        static_collection.content_lines.clear()
+        with self.assertRaises(RuntimeError), unreal_collections.batch_collection_writes():
+            unreal_collections.save_unreal_collection_to_file(static_collection)
+            raise RuntimeError
+        self.assertEqual(self.static_path.read_bytes(), STATIC_COLLECTION.encode("utf-8"))
+        # the next save outside a batch is written straight away
+        unreal_collections.save_unreal_collection_to_file(static_collection)
+        self.assertEqual(len(unreal_collections.collection_store.get(self.static_path).content_lines), 0)
+
+    @unittest.skipIf(os.name == "nt", "windows only has a read only flag")
+    def test_rewrite_keeps_file_mode(self) -> None:
+        self.static_path.chmod(0o644)
+        self.assertTrue(unreal_collections.write_file_atomically(self.static_path, DYNAMIC_COLLECTION))
+        self.assertEqual(stat.S_IMODE(self.static_path.stat().st_mode), 0o644)
+        new_path = self.collections_dir / "New.collection"
+        self.assertTrue(unreal_collections.write_file_atomically(new_path, STATIC_COLLECTION))
+        self.assertEqual(stat.S_IMODE(new_path.stat().st_mode), unreal_collections.file_io.NEW_FILE_MODE)
+
+
+class TestUnrealAssetPath(unittest.TestCase):
+    def test_normalize_path(self) -> None:
+        normalize_path = unreal_collections.UnrealAssetPath.normalize_path
+        self.assertEqual(normalize_path("/Game/A/B.B"), "/Game/A/B")
+        self.assertEqual(normalize_path("Game\\A\\B.uasset"), "/Game/A/B")
+        self.assertEqual(normalize_path("/Game/A/B/"), "/Game/A/B")
+        self.assertEqual(normalize_path("B"), "/B")
+        self.assertEqual(normalize_path(" /Game/X/Y.Y \n"), "/Game/X/Y")
+
+    def test_equality_and_hashing_ignore_spelling(self) -> None:
+        asset_paths = [
+            unreal_collections.UnrealAssetPath(path)
+            for path in ("/Game/A/B.B", "Game\\A\\B.uasset", "/Game/A/B")
+        ]
+        self.assertEqual(len(set(asset_paths)), 1)
+        self.assertTrue(all(asset_path == asset_paths[0] for asset_path in asset_paths))
+        self.assertEqual(asset_paths[0].normalized_path, "/Game/A/B")
+        self.assertEqual(asset_paths[0].to_asset_reference(), "/Game/A/B.B")
+        self.assertNotEqual(unreal_collections.UnrealAssetPath("B"), asset_paths[0])
+        self.assertEqual(unreal_collections.UnrealAssetPath("B").to_asset_reference(), "/B.B")
+        self.assertNotEqual(asset_paths[0], "/Game/A/B")
+
+    def test_lines_match_single_construction(self) -> None:
+        lines = ["/Game/A/B.B\n", "", "Game\\A\\C.uasset", "B", " /Game/X/Y.Y "]
+        self.assertEqual(
+            unreal_collections.UnrealAssetPath.list_from_lines(lines),
+            [unreal_collections.UnrealAssetPath(line) for line in lines if line.strip()],
+        )
+        self.assertEqual(len(unreal_collections.UnrealAssetPath.set_from_lines([*lines, "/Game/A/B"])), 4)
+        self.assertEqual(unreal_collections.UnrealAssetPath(" /Game/X/Y.Y ").directory, "/Game/X")
+
+    def test_directories_are_interned_and_paths_immutable(self) -> None:
+        first = unreal_collections.UnrealAssetPath("/Game/Shared/Dir/" + "A")
+        second = unreal_collections.UnrealAssetPath("".join(["/Game/Shared/Dir/", "B"]))
+        self.assertIs(first.directory, second.directory)
+        with self.assertRaises(AttributeError):
+            first.name = "C"
+
+
+if __name__ == "__main__":
+    unittest.main()
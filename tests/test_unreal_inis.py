@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from tempo_core import file_io, unreal_inis
+
+SAMPLE_INI = (
+    "; comment\r\n"
+    "[/Script/EngineSettings.GeneralProjectSettings]\r\n"
+    "ProjectID=ABC\r\n"
+    "+Maps=/Game/A\r\n"
+    "+Maps=/Game/B\r\n"
+    "-Maps=/Game/A\r\n"
+    "\r\n"
+    "[/Script/Engine.AssetManagerSettings]\r\n"
+    "+PrimaryAssetTypesToScan=Map\r\n"
+)
+
+SECTION = "/Script/EngineSettings.GeneralProjectSettings"
+
+
+class TestUnrealInis(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ini_path = Path(self.temp_dir.name) / "DefaultGame.ini"
+        self.ini_path.write_bytes(SAMPLE_INI.encode("utf-8"))
+
+    def tearDown(self) -> None:
+        unreal_inis.ini_document_cache.invalidate()
+        self.temp_dir.cleanup()
+
+    def test_round_trip_is_unchanged(self) -> None:
+        document = unreal_inis.get_ini_document(self.ini_path)
+        self.assertEqual(document.serialize(), SAMPLE_INI)
+
+    def test_array_operators(self) -> None:
+        document = unreal_inis.get_ini_document(self.ini_path)
+        self.assertEqual(document.get_values(SECTION, "Maps"), ["/Game/B"])
+        self.assertEqual(document.get_value(SECTION, "ProjectID"), "ABC")
+
+    def test_batched_edits_write_once_and_keep_comments(self) -> None:
+        with unreal_inis.edit_ini_document(self.ini_path) as document:
+            document.add_array_value(SECTION, "Maps", "/Game/C")
+            document.remove_array_value(SECTION, "Maps", "/Game/B")
+            document.set_value(SECTION, "ProjectID", "DEF")
+        text = self.ini_path.read_bytes().decode("utf-8")
+        self.assertTrue(text.startswith("; comment\r\n"))
+        document = unreal_inis.get_ini_document(self.ini_path)
+        self.assertEqual(document.get_values(SECTION, "Maps"), ["/Game/C"])
+        self.assertEqual(document.get_value(SECTION, "ProjectID"), "DEF")
+
+    def test_failed_config_batch_writes_nothing(self) -> None:
+        config_path = Path(self.temp_dir.name) / "PakList.txt"
+        config_path.write_text("A\n", encoding="utf-8")
+        with self.assertRaises(RuntimeError), file_io.batch_config_edits():
+            file_io.add_line_to_config(config_path, "B")
+            raise RuntimeError
+        self.assertEqual(config_path.read_text(encoding="utf-8"), "A\n")
+        with file_io.batch_config_edits():
+            file_io.add_line_to_config(config_path, "B")
+            file_io.add_line_to_config(config_path, "C")
+        self.assertEqual(config_path.read_text(encoding="utf-8"), "A\nB\nC\n")
+
+    def test_meta_data_tags(self) -> None:
+        unreal_inis.add_meta_data_tags_for_asset_registry_to_unreal_ini(self.ini_path, ["A", "B"])
+        unreal_inis.remove_meta_data_tags_for_asset_registry_from_unreal_ini(self.ini_path, ["A"])
+        document = unreal_inis.get_ini_document(self.ini_path)
+        self.assertEqual(
+            document.get_value(unreal_inis.ASSET_MANAGER_SETTINGS_SECTION, "MetaDataTagsForAssetRegistry"),
+            '("B")',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
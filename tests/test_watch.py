@@ -0,0 +1,75 @@
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import watch
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.cooked_dir = self.root / "Cooked" / "Content" / "Mods"
+        self.collections_dir = self.root / "Collections"
+        self.index = watch.ModWatchIndex(
+            file_to_mods={self.root / "Source" / "Config.ini": {"ModA", "ModB"}},
+            tree_to_mods={self.cooked_dir / "ModA": {"ModA"}},
+            asset_base_to_mods={self.cooked_dir / "Shared" / "Item": {"ModB"}},
+            collection_mods={"ModC"},
+            collection_dirs=[self.collections_dir],
+        )
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_changed_paths_map_back_to_their_mods(self) -> None:
+        get_mods_for_path = self.index.get_mods_for_path
+        self.assertEqual(get_mods_for_path(self.root / "Source" / "Config.ini"), {"ModA", "ModB"})
+        self.assertEqual(get_mods_for_path(self.cooked_dir / "ModA" / "Maps" / "New.umap"), {"ModA"})
+        # any extension of an included asset counts, a new .ubulk included
+        self.assertEqual(get_mods_for_path(self.cooked_dir / "Shared" / "Item.ubulk"), {"ModB"})
+        self.assertEqual(get_mods_for_path(self.collections_dir / "Mods.collection"), {"ModC"})
+        self.assertEqual(get_mods_for_path(self.cooked_dir / "Shared" / "Other.uasset"), set())
+
+    def test_watch_roots_include_dirs_not_made_yet(self) -> None:
+        self.assertEqual(
+            self.index.get_watch_roots(),
+            sorted([self.root / "Source", self.cooked_dir / "ModA", self.cooked_dir / "Shared", self.collections_dir]),
+        )
+
+    def test_burst_of_changes_in_a_new_dir_repacks_once(self) -> None:
+        stop_event = threading.Event()
+        repacked: list[set[str]] = []
+
+        def repack_mods(mod_names: set[str], *, use_symlinks: bool) -> None:
+            repacked.append(mod_names)
+            stop_event.set()
+
+        with (
+            mock.patch.object(watch, "build_mod_watch_index", return_value=self.index),
+            mock.patch.object(watch, "repack_mods", side_effect=repack_mods),
+        ):
+            watch_thread = threading.Thread(
+                target=watch.watch_mods,
+                kwargs={"use_symlinks": False, "poll_interval": 0.01, "debounce_seconds": 0.2, "stop_event": stop_event},
+            )
+            watch_thread.start()
+            try:
+                # the cooked dir of the mod is only made once watching has started, like a first cook
+                mod_dir = self.cooked_dir / "ModA"
+                mod_dir.mkdir(parents=True)
+                for index in range(5):
+                    (mod_dir / f"Asset{index}.uasset").write_bytes(b"cooked")
+                    # closer together than the debounce, so the burst ends in one repack
+                    stop_event.wait(0.02)
+                self.assertTrue(stop_event.wait(5.0))
+            finally:
+                stop_event.set()
+                watch_thread.join(5.0)
+        self.assertEqual(repacked, [{"ModA"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
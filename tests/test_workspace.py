@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from tempo_core import cleanup, file_locks, session, settings, workspace
+
+
+class TestWorkspace(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for patcher in (
+            mock.patch.object(workspace, "get_workspaces_root", return_value=self.root),
+            mock.patch.object(workspace, "workspace_information", workspace.WorkspaceInformation(run_id="own")),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        if workspace.workspace_information.lock_file_descriptor is not None:
+            file_locks.release_file_lock(workspace.workspace_information.lock_file_descriptor)
+        cleanup.wait_for_background_cleanup()
+        self.temp_dir.cleanup()
+
+    def make_workspace(self, run_id: str) -> Path:
+        workspace_dir = self.root / f"{workspace.RUN_DIR_PREFIX}{run_id}"
+        (workspace_dir / "staged").mkdir(parents=True)
+        workspace.get_workspace_lock_path(workspace_dir).touch()
+        return workspace_dir
+
+    def test_purge_keeps_live_workspaces(self) -> None:
+        own_workspace_dir = workspace.get_run_workspace_dir()
+        live_workspace_dir = self.make_workspace("live")
+        stale_workspace_dir = self.make_workspace("stale")
+        (self.root / "legacy_mod").mkdir()
+        live_lock = file_locks.acquire_file_lock(workspace.get_workspace_lock_path(live_workspace_dir))
+        assert live_lock is not None
+        try:
+            with mock.patch.object(cleanup, "start_detached_delete", return_value=False):
+                workspace.purge_stale_workspaces()
+            cleanup.wait_for_background_cleanup()
+        finally:
+            file_locks.release_file_lock(live_lock)
+        self.assertEqual(
+            sorted(path.name for path in self.root.iterdir()),
+            sorted([
+                own_workspace_dir.name, f"{own_workspace_dir.name}.lock", live_workspace_dir.name, f"{live_workspace_dir.name}.lock",
+            ]),
+        )
+        self.assertFalse(stale_workspace_dir.exists())
+
+    def test_clearing_a_new_workspace_starts_no_delete(self) -> None:
+        with (
+            mock.patch.object(cleanup, "start_detached_delete", return_value=True) as start_detached_delete,
+            session.use_session(session.TempoSession()),
+        ):
+            workspace.clear_workspace()
+            workspace_dir = workspace.get_session_workspace_dir()
+            self.assertTrue(workspace_dir.is_dir())
+            start_detached_delete.assert_not_called()
+            (workspace_dir / "staged").mkdir()
+            workspace.clear_workspace()
+            start_detached_delete.assert_called_once()
+        self.assertEqual(list(workspace_dir.iterdir()), [])
+
+    def test_sessions_stage_into_separate_dirs(self) -> None:
+        first_session = session.TempoSession(name="first")
+        second_session = session.TempoSession(name="second")
+        staged_paths = []
+        for project_session in (first_session, second_session):
+            with session.use_session(project_session):
+                # both projects have a mod of the same name
+                staged_path = settings.get_temp_directory() / "SharedMod" / "Asset.uasset"
+                staged_path.parent.mkdir(parents=True)
+                staged_path.write_text(project_session.name, encoding="utf-8")
+                staged_paths.append(staged_path)
+        self.assertNotEqual(staged_paths[0], staged_paths[1])
+        self.assertEqual([path.read_text(encoding="utf-8") for path in staged_paths], ["first", "second"])
+        for staged_path in staged_paths:
+            self.assertEqual(staged_path.parents[2], workspace.get_run_workspace_dir())
+
+        with mock.patch.object(cleanup, "start_detached_delete", return_value=True), session.use_session(first_session):
+            workspace.clear_workspace()
+        self.assertFalse(staged_paths[0].exists())
+        self.assertTrue(staged_paths[1].exists())
+
+    def test_nested_file_lock_does_not_wait_on_itself(self) -> None:
+        lock_path = self.root / "shared.lock"
+        with file_locks.file_lock(lock_path), file_locks.file_lock(lock_path, timeout=1):
+            self.assertIsNone(file_locks.acquire_file_lock(lock_path, timeout=0))
+        lock_file_descriptor = file_locks.acquire_file_lock(lock_path, timeout=0)
+        assert lock_file_descriptor is not None
+        file_locks.release_file_lock(lock_file_descriptor)
+
+
+if __name__ == "__main__":
+    unittest.main()